@@ -1,31 +1,25 @@
-import json
 import os
+import sys
 from pathlib import Path
 
-def analyze_scnlocjson(file_path):
-    """分析单个scnlocjson文件"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        total_lines = 0
-        choice_sections = 0
-        total_sections = 0
-
-        sections = data.get('SectionsInScene', [])
-        total_sections = len(sections)
+# 引用上级目录的 amountsy 公共模块
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from amountsy.scene_stats import SceneStatsCache, load_scene_stats
 
-        for section in sections:
-            lines = section.get('LinesInSection', [])
-            total_lines += len(lines)
+# 场景统计缓存（None 表示不使用缓存）
+SCENE_CACHE_FILE = r"D:\Data\PYh\AmountSy\Out\scene_stats_cache.sqlite"
+# 时间戳变化但内容未变的场景仍命中缓存（比对内容哈希；重新检出/解包后时间戳被重置时开启，每次多读一遍变化的文件）
+SCENE_CACHE_USE_HASH = False
 
-            if section.get('IsChoiceSection', False):
-                choice_sections += 1
+def analyze_scnlocjson(file_path, cache=None):
+    """分析单个scnlocjson文件（传入 cache 时未变化的场景直接读取缓存结果）"""
+    try:
+        stats = load_scene_stats(file_path, cache)
 
         return {
-            'total_sections': total_sections,
-            'total_lines': total_lines,
-            'choice_sections': choice_sections,
+            'total_sections': stats['total_sections'],
+            'total_lines': stats['total_lines'],
+            'choice_sections': stats['choice_sections'],
             'success': True
         }
     except Exception as e:
@@ -37,7 +31,7 @@ def analyze_scnlocjson(file_path):
             'error': str(e)
         }
 
-def analyze_quest_folder(quest_path):
+def analyze_quest_folder(quest_path, cache=None):
     """分析任务文件夹"""
     scenes_path = os.path.join(quest_path, 'scenes')
 
@@ -52,7 +46,7 @@ def analyze_quest_folder(quest_path):
     for file in os.listdir(scenes_path):
         if file.endswith('.scnlocjson'):
             file_path = os.path.join(scenes_path, file)
-            stats = analyze_scnlocjson(file_path)
+            stats = analyze_scnlocjson(file_path, cache)
             # 关键改动：跳过versions文件夹（无论是否为目录）
             if file == 'versions':
                 continue
@@ -72,7 +66,7 @@ def analyze_quest_folder(quest_path):
         'total_sections': total_sections
     }
 
-def scan_quest_directory(base_path):
+def scan_quest_directory(base_path, cache=None):
     """扫描任务目录"""
     results = []
 
@@ -83,7 +77,7 @@ def scan_quest_directory(base_path):
         item_path = os.path.join(base_path, item)
 
         if os.path.isdir(item_path) and (item.startswith('q') or item.startswith('sq')or item.startswith('mq')or item.startswith('gym_smoketest')):
-            stats = analyze_quest_folder(item_path)
+            stats = analyze_quest_folder(item_path, cache)
 
             if stats:
                 stats['quest_code'] = item
@@ -105,11 +99,14 @@ def main():
 
     all_results = {}
 
+    cache = SceneStatsCache(SCENE_CACHE_FILE, SCENE_CACHE_USE_HASH) if SCENE_CACHE_FILE else None
     for type_name, path in quest_types:
         if os.path.exists(path):
-            results = scan_quest_directory(path)
+            results = scan_quest_directory(path, cache)
             if results:
                 all_results[type_name] = results
+    if cache is not None:
+        cache.close()
 
     # 打印结果
     print("=" * 100)
@@ -1,60 +1,39 @@
-import json
 import os
+import sys
 from pathlib import Path
-import matplotlib.pyplot as plt
-from matplotlib import font_manager
-import numpy as np
 
-# -------------------------- 图表配置（解决中文显示和样式问题）--------------------------
-try:
-    # Windows系统
-    font = font_manager.FontProperties(fname='C:/Windows/Fonts/simhei.ttf')  # 黑体
-    font_sans = font_manager.FontProperties(fname='C:/Windows/Fonts/simhei.ttf')  # 用于图例的字体
-except:
-    try:
-        # macOS系统
-        font = font_manager.FontProperties(fname='/System/Library/Fonts/PingFang.ttc')  # 苹方
-        font_sans = font_manager.FontProperties(fname='/System/Library/Fonts/PingFang.ttc')
-    except:
-        # Linux系统
-        font = font_manager.FontProperties(fname='/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf')
-        font_sans = font_manager.FontProperties(fname='/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf')
-        print("警告：未找到中文字体，将使用英文显示")
-
-# 图表基础样式
-plt.rcParams['figure.figsize'] = (18, 14)
-plt.rcParams['font.size'] = 10
-plt.rcParams['axes.unicode_minus'] = False
-plt.rcParams['savefig.dpi'] = 300
-plt.rcParams['figure.constrained_layout.use'] = True
-plt.rcParams['axes.grid'] = False
-plt.rcParams['legend.fontsize'] = 10  # 设置默认图例字体大小
-
-
-def analyze_scnlocjson(file_path):
-    """分析单个scnlocjson文件"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        total_lines = 0
-        choice_sections = 0
-        total_sections = 0
-
-        sections = data.get('SectionsInScene', [])
-        total_sections = len(sections)
+# 引用上级目录的 amountsy 公共模块
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from amountsy import plotting
+from amountsy.chart_render import ChartReport, Panel, render_reports
+from amountsy.scene_stats import SceneStatsCache, load_scene_stats
 
-        for section in sections:
-            lines = section.get('LinesInSection', [])
-            total_lines += len(lines)
+# 场景统计缓存（None 表示不使用缓存）
+SCENE_CACHE_FILE = r"D:\Data\PYh\AmountSy\Out\scene_stats_cache.sqlite"
+# 时间戳变化但内容未变的场景仍命中缓存（比对内容哈希；重新检出/解包后时间戳被重置时开启，每次多读一遍变化的文件）
+SCENE_CACHE_USE_HASH = False
 
-            if section.get('IsChoiceSection', False):
-                choice_sections += 1
+# -------------------------- 图表配置（解决中文显示和样式问题）--------------------------
+# matplotlib 在生成图表时才导入（Agg 后端，不弹窗），中文字体由 amountsy.plotting 解析并缓存
+# 各子图由 amountsy.chart_render 在进程池中并行渲染后拼接
+CHART_WORKERS = os.cpu_count() or 1  # 图表渲染进程数（1 表示串行）
+CHART_RC = {
+    'figure.figsize': (18, 15),  # 图表总大小（含总标题，子图按 3×2 网格均分）
+    'figure.constrained_layout.use': True,
+    'axes.grid': False,
+    'legend.fontsize': 10,  # 设置默认图例字体大小
+}
+
+
+def analyze_scnlocjson(file_path, cache=None):
+    """分析单个scnlocjson文件（传入 cache 时未变化的场景直接读取缓存结果）"""
+    try:
+        stats = load_scene_stats(file_path, cache)
 
         return {
-            'total_sections': total_sections,
-            'total_lines': total_lines,
-            'choice_sections': choice_sections,
+            'total_sections': stats['total_sections'],
+            'total_lines': stats['total_lines'],
+            'choice_sections': stats['choice_sections'],
             'success': True
         }
     except Exception as e:
@@ -67,7 +46,7 @@ def analyze_scnlocjson(file_path):
         }
 
 
-def analyze_quest_folder(quest_path):
+def analyze_quest_folder(quest_path, cache=None):
     """分析任务文件夹"""
     scenes_path = os.path.join(quest_path, 'scenes')
 
@@ -82,7 +61,7 @@ def analyze_quest_folder(quest_path):
     for file in os.listdir(scenes_path):
         if file.endswith('.scnlocjson'):
             file_path = os.path.join(scenes_path, file)
-            stats = analyze_scnlocjson(file_path)
+            stats = analyze_scnlocjson(file_path, cache)
 
             if stats['success']:
                 total_lines += stats['total_lines']
@@ -101,7 +80,7 @@ def analyze_quest_folder(quest_path):
     }
 
 
-def scan_quest_directory(base_path):
+def scan_quest_directory(base_path, cache=None):
     """扫描任务目录"""
     results = []
 
@@ -112,7 +91,7 @@ def scan_quest_directory(base_path):
         item_path = os.path.join(base_path, item)
 
         if os.path.isdir(item_path) and (item.startswith('q') or item.startswith('sq') or item.startswith('mq')):
-            stats = analyze_quest_folder(item_path)
+            stats = analyze_quest_folder(item_path, cache)
 
             if stats:
                 stats['quest_code'] = item
@@ -122,8 +101,131 @@ def scan_quest_directory(base_path):
     return results
 
 
-def generate_charts(all_results, output_dir):
-    """生成统计图表并保存到指定目录"""
+# 颜色配置
+TYPE_COLORS = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57']
+CHOICE_COLOR = '#E91E63'
+
+
+def _draw_type_lines(ax, font, type_names, total_lines_list):
+    """图1：各任务类型对话数对比（柱状图）"""
+    bars1 = ax.bar(range(len(type_names)), total_lines_list, color=TYPE_COLORS[:len(type_names)],
+                   alpha=0.8, edgecolor='white', linewidth=1.5)
+    ax.set_title('各任务类型对话总数对比', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('任务类型', fontproperties=font, fontsize=12)
+    ax.set_ylabel('对话总行数', fontproperties=font, fontsize=12)
+    ax.set_xticks(range(len(type_names)))
+    ax.set_xticklabels([name.replace(' (', '\n(') for name in type_names], fontproperties=font, rotation=0)
+    ax.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.5)
+
+    # 添加数值标签
+    for bar, value in zip(bars1, total_lines_list):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2, height + max(total_lines_list) * 0.01,
+                f'{int(value):,}', ha='center', va='bottom', fontproperties=font, fontweight='bold')
+
+
+def _draw_type_choices(ax, font, type_names, total_choices_list):
+    """图2：各任务类型选择数对比（横向柱状图）"""
+    bars2 = ax.barh(range(len(type_names)), total_choices_list, color=CHOICE_COLOR,
+                    alpha=0.8, edgecolor='white', linewidth=1.5)
+    ax.set_title('各任务类型选择数对比', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('选择段数量', fontproperties=font, fontsize=12)
+    ax.set_ylabel('任务类型', fontproperties=font, fontsize=12)
+    ax.set_yticks(range(len(type_names)))
+    ax.set_yticklabels([name.replace(' (', '\n(') for name in type_names], fontproperties=font)
+    ax.grid(axis='x', alpha=0.3, linestyle='--', linewidth=0.5)
+
+    # 添加数值标签
+    for bar, value in zip(bars2, total_choices_list):
+        width = bar.get_width()
+        ax.text(width + max(total_choices_list) * 0.01, bar.get_y() + bar.get_height() / 2,
+                f'{int(value)}', ha='left', va='center', fontproperties=font, fontweight='bold')
+
+
+def _draw_top20_lines(ax, font, top20_names, top20_lines):
+    """图3：Top20任务对话数排名（柱状图）"""
+    # 调整标签显示（缩短过长的任务名称）
+    top20_display_names = [name[:12] + '...' if len(name) > 12 else name for name in top20_names]
+    bars3 = ax.bar(range(len(top20_names)), top20_lines, color='#FF9800', alpha=0.8,
+                   edgecolor='white', linewidth=1.5)
+    ax.set_title('Top20任务对话数排名', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('任务', fontproperties=font, fontsize=12)
+    ax.set_ylabel('对话行数', fontproperties=font, fontsize=12)
+    ax.set_xticks(range(len(top20_names)))
+    ax.set_xticklabels(top20_display_names, fontproperties=font, rotation=45, ha='right')
+    ax.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.5)
+
+    # 添加数值标签（简化显示）
+    for bar, value in zip(bars3, top20_lines):
+        height = bar.get_height()
+        label = f'{value:,}' if value < 1000 else f'{value // 1000}k'
+        ax.text(bar.get_x() + bar.get_width() / 2, height + max(top20_lines) * 0.01,
+                label, ha='center', va='bottom', fontproperties=font, fontweight='bold', fontsize=9)
+
+
+def _draw_type_share(ax, font, type_names, total_lines_list):
+    """图4：各任务类型资源占比（饼图）"""
+    # 过滤数量为0的数据
+    valid_data = [(name, value) for name, value in zip(type_names, total_lines_list) if value > 0]
+    if valid_data:
+        valid_names, valid_values = zip(*valid_data)
+        # 简化标签
+        simple_names = [name.split(' ')[0] for name in valid_names]
+        wedges, texts, autotexts = ax.pie(valid_values, labels=simple_names, colors=TYPE_COLORS[:len(valid_names)],
+                                          autopct='%1.1f%%', startangle=90,
+                                          textprops={'fontproperties': font, 'fontsize': 11})
+        ax.set_title('各任务类型对话数占比', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
+
+        # 美化饼图文字
+        for autotext in autotexts:
+            autotext.set_color('white')
+            autotext.set_fontweight('bold')
+
+
+def _draw_task_scatter(ax, font, type_names, scenes_all, lines_all, task_types):
+    """图5：场景数vs对话数散点图（单个任务）"""
+    from matplotlib.lines import Line2D
+
+    # 为不同类型分配颜色
+    type_color_map = {type_names[i]: TYPE_COLORS[i] for i in range(len(type_names))}
+    scatter_colors = [type_color_map[t] for t in task_types]
+
+    ax.scatter(scenes_all, lines_all, c=scatter_colors, alpha=0.6, s=60, edgecolors='white', linewidth=0.5)
+    ax.set_title('单个任务：场景数 vs 对话数', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('Scene数量', fontproperties=font, fontsize=12)
+    ax.set_ylabel('对话行数', fontproperties=font, fontsize=12)
+    ax.grid(alpha=0.3, linestyle='--', linewidth=0.5)
+
+    # 修复图例：移除Line2D的fontproperties参数，通过rcParams统一设置字体
+    legend_elements = [Line2D([0], [0], marker='o', color='w', markerfacecolor=color,
+                              markersize=8, label=name)
+                       for name, color in type_color_map.items()]
+    ax.legend(handles=legend_elements, loc='upper left')
+
+
+def _draw_type_avg(ax, font, type_names, avg_lines_list):
+    """图6：各任务类型平均对话数对比（柱状图）"""
+    bars6 = ax.bar(range(len(type_names)), avg_lines_list, color='#2196F3', alpha=0.8,
+                   edgecolor='white', linewidth=1.5)
+    ax.set_title('各任务类型平均对话数（per Scene）', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('任务类型', fontproperties=font, fontsize=12)
+    ax.set_ylabel('平均对话行数/Scene', fontproperties=font, fontsize=12)
+    ax.set_xticks(range(len(type_names)))
+    ax.set_xticklabels([name.replace(' (', '\n(') for name in type_names], fontproperties=font, rotation=0)
+    ax.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.5)
+
+    # 添加数值标签
+    for bar, value in zip(bars6, avg_lines_list):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2, height + max(avg_lines_list) * 0.01,
+                f'{value:.1f}', ha='center', va='bottom', fontproperties=font, fontweight='bold')
+
+
+def generate_charts(all_results, output_dir, workers=CHART_WORKERS, force=False):
+    """
+    生成统计图表并保存到指定目录
+    6个子图在进程池中并行渲染后拼成一张图；统计数据与上次出图时相同则跳过（force=True 强制重画）
+    """
     print(f"\n开始生成图表，保存路径：{output_dir}")
 
     # 创建目录（如果不存在）
@@ -167,141 +269,28 @@ def generate_charts(all_results, output_dir):
     top20_tasks = sorted(task_details, key=lambda x: x['lines'], reverse=True)[:20]
     top20_names = [t['name'] for t in top20_tasks]
     top20_lines = [t['lines'] for t in top20_tasks]
-    top20_choices = [t['choices'] for t in top20_tasks]
-
-    # 创建子图（3行2列，共6个子图）
-    fig, axes = plt.subplots(3, 2, figsize=(18, 15))
-    axes = axes.flatten()
-
-    # 颜色配置
-    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57']
-    choice_color = '#E91E63'
-    normal_color = '#3F51B5'
-
-    # -------------------------- 图1：各任务类型对话数对比（柱状图）--------------------------
-    ax1 = axes[0]
-    bars1 = ax1.bar(range(len(type_names)), total_lines_list, color=colors[:len(type_names)],
-                    alpha=0.8, edgecolor='white', linewidth=1.5)
-    ax1.set_title('各任务类型对话总数对比', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
-    ax1.set_xlabel('任务类型', fontproperties=font, fontsize=12)
-    ax1.set_ylabel('对话总行数', fontproperties=font, fontsize=12)
-    ax1.set_xticks(range(len(type_names)))
-    ax1.set_xticklabels([name.replace(' (', '\n(') for name in type_names], fontproperties=font, rotation=0)
-    ax1.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.5)
-
-    # 添加数值标签
-    for bar, value in zip(bars1, total_lines_list):
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width() / 2, height + max(total_lines_list) * 0.01,
-                 f'{int(value):,}', ha='center', va='bottom', fontproperties=font, fontweight='bold')
-
-    # -------------------------- 图2：各任务类型选择数对比（横向柱状图）--------------------------
-    ax2 = axes[1]
-    bars2 = ax2.barh(range(len(type_names)), total_choices_list, color=choice_color,
-                     alpha=0.8, edgecolor='white', linewidth=1.5)
-    ax2.set_title('各任务类型选择数对比', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
-    ax2.set_xlabel('选择段数量', fontproperties=font, fontsize=12)
-    ax2.set_ylabel('任务类型', fontproperties=font, fontsize=12)
-    ax2.set_yticks(range(len(type_names)))
-    ax2.set_yticklabels([name.replace(' (', '\n(') for name in type_names], fontproperties=font)
-    ax2.grid(axis='x', alpha=0.3, linestyle='--', linewidth=0.5)
-
-    # 添加数值标签
-    for bar, value in zip(bars2, total_choices_list):
-        width = bar.get_width()
-        ax2.text(width + max(total_choices_list) * 0.01, bar.get_y() + bar.get_height() / 2,
-                 f'{int(value)}', ha='left', va='center', fontproperties=font, fontweight='bold')
-
-    # -------------------------- 图3：Top20任务对话数排名（柱状图）--------------------------
-    ax3 = axes[2]
-    # 调整标签显示（缩短过长的任务名称）
-    top20_display_names = [name[:12] + '...' if len(name) > 12 else name for name in top20_names]
-    bars3 = ax3.bar(range(len(top20_names)), top20_lines, color='#FF9800', alpha=0.8,
-                    edgecolor='white', linewidth=1.5)
-    ax3.set_title('Top20任务对话数排名', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
-    ax3.set_xlabel('任务', fontproperties=font, fontsize=12)
-    ax3.set_ylabel('对话行数', fontproperties=font, fontsize=12)
-    ax3.set_xticks(range(len(top20_names)))
-    ax3.set_xticklabels(top20_display_names, fontproperties=font, rotation=45, ha='right')
-    ax3.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.5)
-
-    # 添加数值标签（简化显示）
-    for bar, value in zip(bars3, top20_lines):
-        height = bar.get_height()
-        label = f'{value:,}' if value < 1000 else f'{value // 1000}k'
-        ax3.text(bar.get_x() + bar.get_width() / 2, height + max(top20_lines) * 0.01,
-                 label, ha='center', va='bottom', fontproperties=font, fontweight='bold', fontsize=9)
 
-    # -------------------------- 图4：各任务类型资源占比（饼图）--------------------------
-    ax4 = axes[3]
-    # 过滤数量为0的数据
-    valid_data = [(name, value) for name, value in zip(type_names, total_lines_list) if value > 0]
-    if valid_data:
-        valid_names, valid_values = zip(*valid_data)
-        # 简化标签
-        simple_names = [name.split(' ')[0] for name in valid_names]
-        wedges, texts, autotexts = ax4.pie(valid_values, labels=simple_names, colors=colors[:len(valid_names)],
-                                           autopct='%1.1f%%', startangle=90,
-                                           textprops={'fontproperties': font, 'fontsize': 11})
-        ax4.set_title('各任务类型对话数占比', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
-
-        # 美化饼图文字
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
-
-    # -------------------------- 图5：场景数vs对话数散点图（单个任务）--------------------------
-    ax5 = axes[4]
-    # 所有任务的散点图
+    # 所有任务的散点数据（按任务类型着色）
     scenes_all = [t['scenes'] for t in task_details]
     lines_all = [t['lines'] for t in task_details]
-    # 按任务类型着色
     task_types = []
     for type_name, results in all_results.items():
         task_types.extend([type_name] * len(results))
 
-    # 为不同类型分配颜色
-    type_color_map = {type_names[i]: colors[i] for i in range(len(type_names))}
-    scatter_colors = [type_color_map[t] for t in task_types]
-
-    ax5.scatter(scenes_all, lines_all, c=scatter_colors, alpha=0.6, s=60, edgecolors='white', linewidth=0.5)
-    ax5.set_title('单个任务：场景数 vs 对话数', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
-    ax5.set_xlabel('Scene数量', fontproperties=font, fontsize=12)
-    ax5.set_ylabel('对话行数', fontproperties=font, fontsize=12)
-    ax5.grid(alpha=0.3, linestyle='--', linewidth=0.5)
-
-    # 修复图例：移除Line2D的fontproperties参数，通过rcParams统一设置字体
-    legend_elements = [plt.Line2D([0], [0], marker='o', color='w', markerfacecolor=color,
-                                  markersize=8, label=name)
-                       for name, color in type_color_map.items()]
-    ax5.legend(handles=legend_elements, loc='upper left')
-
-    # -------------------------- 图6：各任务类型平均对话数对比（柱状图）--------------------------
-    ax6 = axes[5]
-    bars6 = ax6.bar(range(len(type_names)), avg_lines_list, color='#2196F3', alpha=0.8,
-                    edgecolor='white', linewidth=1.5)
-    ax6.set_title('各任务类型平均对话数（per Scene）', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
-    ax6.set_xlabel('任务类型', fontproperties=font, fontsize=12)
-    ax6.set_ylabel('平均对话行数/Scene', fontproperties=font, fontsize=12)
-    ax6.set_xticks(range(len(type_names)))
-    ax6.set_xticklabels([name.replace(' (', '\n(') for name in type_names], fontproperties=font, rotation=0)
-    ax6.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.5)
-
-    # 添加数值标签
-    for bar, value in zip(bars6, avg_lines_list):
-        height = bar.get_height()
-        ax6.text(bar.get_x() + bar.get_width() / 2, height + max(avg_lines_list) * 0.01,
-                 f'{value:.1f}', ha='center', va='bottom', fontproperties=font, fontweight='bold')
-
-    # 添加总标题
-    fig.suptitle('《赛博朋克2077》任务对话与选择统计分析报告', fontproperties=font, fontsize=18, fontweight='bold',
-                 y=0.98)
-
-    # 保存图表
+    # 子图（3行2列，共6个子图）+ 总标题
     output_path = output_dir / 'quest_analysis_charts.png'
-    plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()
-
+    report = ChartReport(output_path, [
+        Panel(_draw_type_lines, (type_names, total_lines_list)),
+        Panel(_draw_type_choices, (type_names, total_choices_list)),
+        Panel(_draw_top20_lines, (top20_names, top20_lines)),
+        Panel(_draw_type_share, (type_names, total_lines_list)),
+        Panel(_draw_task_scatter, (type_names, scenes_all, lines_all, task_types)),
+        Panel(_draw_type_avg, (type_names, avg_lines_list)),
+    ], cols=2, title='《赛博朋克2077》任务对话与选择统计分析报告', rc=CHART_RC)
+
+    # 渲染并保存图表
+    if not render_reports([report], workers, force):
+        return
     print(f"图表已保存：{output_path}")
     print("图表包含6个子图：")
     print("1. 各任务类型对话总数对比    2. 各任务类型选择数对比")
@@ -322,9 +311,10 @@ def main():
     all_results = {}
 
     print("开始扫描任务目录并统计数据...")
+    cache = SceneStatsCache(SCENE_CACHE_FILE, SCENE_CACHE_USE_HASH) if SCENE_CACHE_FILE else None
     for type_name, path in quest_types:
         if os.path.exists(path):
-            results = scan_quest_directory(path)
+            results = scan_quest_directory(path, cache)
             if results:
                 all_results[type_name] = results
                 print(f"✓ {type_name}：找到 {len(results)} 个任务")
@@ -332,6 +322,9 @@ def main():
                 print(f"✗ {type_name}：未找到有效任务数据")
         else:
             print(f"✗ {type_name}：路径不存在 - {path}")
+    if cache is not None:
+        print(f"场景缓存：命中 {cache.hits} 个，重新解析 {cache.misses} 个")
+        cache.close()
 
     # 打印文字结果
     print("\n" + "=" * 100)
@@ -410,10 +403,7 @@ def main():
 
 if __name__ == '__main__':
     # 检查并安装依赖
-    try:
-        import matplotlib.pyplot as plt
-        import numpy as np
-    except ImportError:
+    if not plotting.matplotlib_installed():
         print("检测到未安装必要依赖，正在自动安装...")
         import subprocess
         import sys
@@ -1,34 +1,25 @@
-import json
 import os
 import sys
 from pathlib import Path
 
-def analyze_scnlocjson(file_path):
-    """分析单个scnlocjson文件"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        total_lines = 0
-        choice_sections = 0
-        total_sections = 0
+# 引用上级目录的 amountsy 公共模块
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from amountsy.scene_stats import SceneStatsCache, load_scene_stats
 
-        sections = data.get('SectionsInScene', [])
-        total_sections = len(sections)
+# 场景统计缓存（None 表示不使用缓存）
+SCENE_CACHE_FILE = r"D:\Data\PYh\AmountSy\Out\scene_stats_cache.sqlite"
+# 时间戳变化但内容未变的场景仍命中缓存（比对内容哈希；重新检出/解包后时间戳被重置时开启，每次多读一遍变化的文件）
+SCENE_CACHE_USE_HASH = False
 
-        for section in sections:
-            # 统计对话行数
-            lines = section.get('LinesInSection', [])
-            total_lines += len(lines)
-
-            # 统计选择section
-            if section.get('IsChoiceSection', False):
-                choice_sections += 1
+def analyze_scnlocjson(file_path, cache=None):
+    """分析单个scnlocjson文件（传入 cache 时未变化的场景直接读取缓存结果）"""
+    try:
+        stats = load_scene_stats(file_path, cache)
 
         return {
-            'total_sections': total_sections,
-            'total_lines': total_lines,
-            'choice_sections': choice_sections,
+            'total_sections': stats['total_sections'],
+            'total_lines': stats['total_lines'],
+            'choice_sections': stats['choice_sections'],
             'success': True
         }
     except Exception as e:
@@ -40,7 +31,7 @@ def analyze_scnlocjson(file_path):
             'error': str(e)
         }
 
-def analyze_quest_folder(quest_path):
+def analyze_quest_folder(quest_path, cache=None):
     """分析任务文件夹下的所有scene"""
     scenes_path = os.path.join(quest_path, 'scenes')
 
@@ -55,7 +46,7 @@ def analyze_quest_folder(quest_path):
             file_path = os.path.join(scenes_path, file)
             scene_name = file.replace('.scnlocjson', '')
 
-            stats = analyze_scnlocjson(file_path)
+            stats = analyze_scnlocjson(file_path, cache)
             stats['scene_name'] = scene_name
             stats['file_name'] = file
 
@@ -75,7 +66,10 @@ def main():
         print(f"错误: 路径不存在 {quest_path}")
         sys.exit(1)
 
-    results = analyze_quest_folder(quest_path)
+    cache = SceneStatsCache(SCENE_CACHE_FILE, SCENE_CACHE_USE_HASH) if SCENE_CACHE_FILE else None
+    results = analyze_quest_folder(quest_path, cache)
+    if cache is not None:
+        cache.close()
 
     if not results:
         print(f"在 {quest_path}/scenes 中没有找到scnlocjson文件")
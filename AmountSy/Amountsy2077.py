@@ -4,9 +4,21 @@ import csv
 from pathlib import Path
 from collections import defaultdict
 
+from amountsy.depot_walker import ExtensionCounter
+from amountsy.depot_index import scan
+from amountsy.instrument import RunReport, report_path
+
 # 配置参数
 BASE_DIR = Path(r"D:\AppSoft\Sy2077\2077\2077\CDPR2077\r6\depot\base\quest")
 CSV_PATH = Path(r"D:\Data\PYh\AmountSy\Out\quest_assets_report.csv")
+# depot 文件索引（增量刷新，重复统计无需重新遍历整棵目录树；设为 None 则每次直接遍历）
+DEPOT_ROOT = r"D:\AppSoft\Sy2077\2077\2077\CDPR2077\r6\depot"
+INDEX_FILE = r"D:\Data\PYh\AmountSy\Out\depot_index.sqlite"
+# 同时在途的目录请求数：depot 在网络盘（SMB/NFS）上时设为 32 左右，列目录 / stat 的往返延迟重叠进行，
+# 使用索引时作为刷新线程数；0 表示逐个目录串行遍历（本地磁盘）
+SCAN_CONCURRENCY = 0
+# 各阶段耗时报告（JSON，每次运行一个文件；None 表示只打印不保存）
+TIMING_REPORT_DIR = r"D:\Data\PYh\AmountSy\Out\timing"
 
 # 核心资产类型分类（与原脚本保持一致）
 ASSET_TYPES = {
@@ -19,10 +31,13 @@ ASSET_TYPES = {
 }
 
 
-def count_assets(path: Path, quest_name: str) -> dict:
-    """统计单个任务目录的资产数量"""
+def count_assets(counter: ExtensionCounter, rel_prefix: tuple, quest_name: str) -> dict:
+    """统计单个任务目录的资产数量（rel_prefix 为任务目录相对 BASE_DIR 的路径分段）"""
     print(f"\n========== {quest_name} ==========")
 
+    # 该任务子树的扩展名计数，来自 BASE_DIR 的单次遍历
+    ext_counts = counter.subtree(rel_prefix)
+
     category_totals = defaultdict(int)
     grand_total = 0
 
@@ -31,8 +46,7 @@ def count_assets(path: Path, quest_name: str) -> dict:
         print(f"\n[{category}]")
 
         for ext in exts:
-            # 递归查找所有符合扩展名的文件
-            file_count = sum(1 for _ in path.rglob(f"*{ext}"))
+            file_count = ext_counts[ext]
             if file_count > 0:
                 print(f"  {ext} : {file_count}")
                 category_count += file_count
@@ -50,16 +64,32 @@ def count_assets(path: Path, quest_name: str) -> dict:
     }
 
 
-def main():
+def main(report_dir=TIMING_REPORT_DIR):
+    # 耗时报告在 with 块结束时写出，中途出错也会保存（报告的 meta 中记录错误）
+    with RunReport('Amountsy2077', report_path(report_dir, 'Amountsy2077')) as report:
+        count_quest_assets(report)
+
+
+def count_quest_assets(report):
+    """main 的完整流程：扫描、逐任务汇总、写 CSV，各阶段计入 report"""
+    report.meta.update(base_dir=str(BASE_DIR), index_file=INDEX_FILE, scan_concurrency=SCAN_CONCURRENCY)
     results = []
 
+    # 整棵 quest 树只遍历一次（或从索引读取），所有扩展名同时计数
+    with report.stage('scan') as stage:
+        counter = ExtensionCounter([ext for exts in ASSET_TYPES.values() for ext in exts])
+        scan(BASE_DIR, [counter], INDEX_FILE, DEPOT_ROOT, SCAN_CONCURRENCY)
+        stage.add(files=sum(counter.subtree().values()))
+
     # 1. 主线任务 - Prologue
     print("\n#################### 主线任务 - Prologue ####################")
     prologue_path = BASE_DIR / "main_quests" / "prologue"
     if prologue_path.exists():
         for dir in prologue_path.iterdir():
             if dir.is_dir():
-                result = count_assets(dir, f"Prologue/{dir.name}")
+                with report.stage('aggregate') as stage:
+                    result = count_assets(counter, ("main_quests", "prologue", dir.name), f"Prologue/{dir.name}")
+                    stage.add(quests=1)
                 results.append(result)
 
     # 2. 主线任务 - Part1
@@ -68,7 +98,9 @@ def main():
     if part1_path.exists():
         for dir in part1_path.iterdir():
             if dir.is_dir():
-                result = count_assets(dir, f"Part1/{dir.name}")
+                with report.stage('aggregate') as stage:
+                    result = count_assets(counter, ("main_quests", "part1", dir.name), f"Part1/{dir.name}")
+                    stage.add(quests=1)
                 results.append(result)
 
     # 3. 主线任务 - Epilogue
@@ -77,7 +109,9 @@ def main():
     if epilogue_path.exists():
         for dir in epilogue_path.iterdir():
             if dir.is_dir():
-                result = count_assets(dir, f"Epilogue/{dir.name}")
+                with report.stage('aggregate') as stage:
+                    result = count_assets(counter, ("main_quests", "epilogue", dir.name), f"Epilogue/{dir.name}")
+                    stage.add(quests=1)
                 results.append(result)
 
     # 4. 支线任务（匹配sq开头的目录）
@@ -86,7 +120,9 @@ def main():
     if side_quests_path.exists():
         for dir in side_quests_path.iterdir():
             if dir.is_dir() and re.match(r"^sq\d+", dir.name):
-                result = count_assets(dir, f"SideQuest/{dir.name}")
+                with report.stage('aggregate') as stage:
+                    result = count_assets(counter, ("side_quests", dir.name), f"SideQuest/{dir.name}")
+                    stage.add(quests=1)
                 results.append(result)
 
     # 5. 次要任务（匹配mq开头的目录）
@@ -95,7 +131,9 @@ def main():
     if minor_quests_path.exists():
         for dir in minor_quests_path.iterdir():
             if dir.is_dir() and re.match(r"^mq\d+", dir.name):
-                result = count_assets(dir, f"MinorQuest/{dir.name}")
+                with report.stage('aggregate') as stage:
+                    result = count_assets(counter, ("minor_quests", dir.name), f"MinorQuest/{dir.name}")
+                    stage.add(quests=1)
                 results.append(result)
 
     # 生成汇总报告
@@ -112,29 +150,33 @@ def main():
     print(f"任务总数: {len(results)}")
 
     # 导出到CSV
-    with open(CSV_PATH, "w", encoding="utf-8", newline="") as f:
-        fieldnames = [
-            "QuestName", "TotalAssets",
-            "TaskSystem", "SceneSystem", "EntitySystem",
-            "WorldBuilding", "AIBehavior", "ConfigSystem"
-        ]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for item in results:
-            writer.writerow({
-                "QuestName": item["Name"],
-                "TotalAssets": item["Total"],
-                "TaskSystem": item["Categories"].get("任务系统", 0),
-                "SceneSystem": item["Categories"].get("场景系统", 0),
-                "EntitySystem": item["Categories"].get("实体系统", 0),
-                "WorldBuilding": item["Categories"].get("世界构建", 0),
-                "AIBehavior": item["Categories"].get("AI行为", 0),
-                "ConfigSystem": item["Categories"].get("配置系统", 0),
-            })
+    with report.stage('csv') as stage:
+        with open(CSV_PATH, "w", encoding="utf-8", newline="") as f:
+            fieldnames = [
+                "QuestName", "TotalAssets",
+                "TaskSystem", "SceneSystem", "EntitySystem",
+                "WorldBuilding", "AIBehavior", "ConfigSystem"
+            ]
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+
+            for item in results:
+                writer.writerow({
+                    "QuestName": item["Name"],
+                    "TotalAssets": item["Total"],
+                    "TaskSystem": item["Categories"].get("任务系统", 0),
+                    "SceneSystem": item["Categories"].get("场景系统", 0),
+                    "EntitySystem": item["Categories"].get("实体系统", 0),
+                    "WorldBuilding": item["Categories"].get("世界构建", 0),
+                    "AIBehavior": item["Categories"].get("AI行为", 0),
+                    "ConfigSystem": item["Categories"].get("配置系统", 0),
+                })
+        stage.add(rows=len(results))
 
     print(f"\n详细报告已导出到: {CSV_PATH}")
 
+    report.count(quests=len(results), assets=total_assets)
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,28 +1,23 @@
 import os
 
+from amountsy.depot_walker import AnimationLister
+from amountsy.depot_index import scan
+
 # 基础目录设置
 BASE_DIR = r"D:\AppSoft\Sy2077\2077\2077\CDPR2077\r6\depot\base\animations"
 OUTPUT_FILE = r"D:\Data\PYh\AmountSy\Out\animation_files统计.txt"
 CSV_FILE = r"D:\Data\PYh\AmountSy\Out\animation_files统计.csv"
+# depot 文件索引（增量刷新，重复统计无需重新遍历整棵目录树；设为 None 则每次直接遍历）
+DEPOT_ROOT = r"D:\AppSoft\Sy2077\2077\2077\CDPR2077\r6\depot"
+INDEX_FILE = r"D:\Data\PYh\AmountSy\Out\depot_index.sqlite"
 
 
 def get_animation_files(base_dir):
     """获取base_dir下所有*.Animation文件的信息"""
-    animation_files = []
-    # 递归遍历所有子目录
-    for root, _, files in os.walk(base_dir):
-        for file in files:
-            if file.lower().endswith('.anims'):
-                # 绝对路径
-                abs_path = os.path.join(root, file)
-                # 相对路径（相对于BASE_DIR）
-                rel_path = os.path.relpath(abs_path, base_dir)
-                animation_files.append({
-                    'filename': file,
-                    'absolute_path': abs_path,
-                    'relative_path': rel_path
-                })
-    return animation_files
+    # 单次 scandir 遍历（或从索引读取），文件名/绝对路径/相对路径由 AnimationLister 收集
+    lister = AnimationLister()
+    scan(base_dir, [lister], INDEX_FILE, DEPOT_ROOT)
+    return lister.files
 
 
 def main():
@@ -3,123 +3,188 @@
 """
 赛博朋克2077核心美术资产统计图表
 - 包含文件格式分布、资产类别统计、核心资源对比等多维度可视化
+- 各格式的文件数和大小从 depot 文件索引汇总（depot 不存在时使用内置的手工统计数据）
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib import font_manager
+import os
+import sys
+import time
 from collections import defaultdict
 from pathlib import Path
 
+# 引用上级目录的 amountsy 公共模块
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from amountsy import plotting
+from amountsy.chart_render import ChartReport, Panel, render_reports
+from amountsy.depot_index import DepotIndex
+
 # -------------------------- 全局配置 --------------------------
-# 设置中文字体（解决中文显示乱码）
-try:
-    font = font_manager.FontProperties(fname='C:/Windows/Fonts/simhei.ttf')  # Windows 黑体
-except:
-    try:
-        font = font_manager.FontProperties(fname='/System/Library/Fonts/PingFang.ttc')  # macOS 苹方
-    except:
-        font = font_manager.FontProperties(fname='/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf')
-        print("警告：未找到中文字体，将使用英文显示")
-
-# 图表基础样式
-plt.rcParams['figure.figsize'] = (20, 16)
-plt.rcParams['font.size'] = 10
-plt.rcParams['axes.unicode_minus'] = False
-plt.rcParams['savefig.dpi'] = 300
-plt.rcParams['figure.constrained_layout.use'] = True
-plt.rcParams['axes.grid'] = False
-
-# -------------------------- 核心数据（从需求中提取） --------------------------
-# 1. 文件格式统计（格式: 数量, 描述, 颜色）
-file_format_data = {
-    '.wem': (178063, '音频', '#1E88E5'),
-    '.xbm': (119098, '纹理', '#FFC107'),
-    '.mesh': (108305, '3D网格', '#4CAF50'),
-    '.mlmask': (26168, '地形遮罩', '#9C27B0'),
-    '.ent': (16068, '实体', '#FF5722'),
-    '.anims': (16023, '动画', '#00BCD4'),
-    '.mlsetup': (13712, '多层地形设置', '#795548'),
-    '.mi': (6268, '材质实例', '#E91E63'),
-    '.app': (2090, '外观', '#607D8B'),
-    '.rig': (1223, '骨骼', '#2196F3'),
-    '.mt': (268, '材质模板', '#8BC34A'),
-    '.w2mesh': (332, 'W2网格', '#CDDC39'),
-    '.bnk': (127, '音频银行', '#FF9800'),
-    '.opuspak': (1442, '音频压缩包', '#F44336'),
+# matplotlib 在生成图表时才导入（Agg 后端，不弹窗），中文字体由 amountsy.plotting 解析并缓存
+# 各子图由 amountsy.chart_render 在进程池中并行渲染后拼接
+CHART_WORKERS = os.cpu_count() or 1  # 图表渲染进程数（1 表示串行）
+CHART_RC = {
+    'figure.figsize': (20, 16),  # 图表总大小（含总标题，子图按 4×2 网格均分）
+    'figure.constrained_layout.use': True,
+    'axes.grid': False,
+}
+
+# -------------------------- 数据来源 --------------------------
+# 各格式的文件数 / 总字节数从 depot 文件索引按扩展名汇总（amountsy.depot_index，SQLite 缓存，
+# 刷新时只重扫有变化的目录，一级子目录由多个线程并行检查）；depot 不存在时使用下方的手工统计数据
+# 索引中存有每个文件的大小：平时只做增量刷新（增删改名的目录重扫，其余目录的文件大小直接沿用索引），
+# 距上次完整刷新超过 FULL_REFRESH_DAYS 天时才逐个 stat 全部文件（full=True），原地修改过的文件大小随之更正
+DEPOT_ROOT = r"D:\AppSoft\Sy2077\2077\2077\CDPR2077\r6\depot"
+INDEX_FILE = r"D:\Data\PYh\AmountSy\Out\depot_index.sqlite"
+SCAN_WORKERS = 8  # 刷新索引的线程数（1 表示串行）
+FULL_REFRESH_DAYS = 7  # 完整刷新的间隔（天；0 表示每次运行都完整刷新）
+
+# 统计的文件格式（格式: 描述, 颜色）
+FORMAT_INFO = {
+    '.wem': ('音频', '#1E88E5'),
+    '.xbm': ('纹理', '#FFC107'),
+    '.mesh': ('3D网格', '#4CAF50'),
+    '.mlmask': ('地形遮罩', '#9C27B0'),
+    '.ent': ('实体', '#FF5722'),
+    '.anims': ('动画', '#00BCD4'),
+    '.mlsetup': ('多层地形设置', '#795548'),
+    '.mi': ('材质实例', '#E91E63'),
+    '.app': ('外观', '#607D8B'),
+    '.rig': ('骨骼', '#2196F3'),
+    '.mt': ('材质模板', '#8BC34A'),
+    '.w2mesh': ('W2网格', '#CDDC39'),
+    '.bnk': ('音频银行', '#FF9800'),
+    '.opuspak': ('音频压缩包', '#F44336'),
 }
 
-# 2. 资产类别统计（按大类汇总）
-asset_category_data = {
-    '音频资源': 178063 + 127 + 1442,  # .wem + .bnk + .opuspak
-    '纹理资源': 119098,  # .xbm
-    '3D模型资源': 108305 + 332,  # .mesh + .w2mesh
-    '地形资源': 26168 + 13712,  # .mlmask + .mlsetup
-    '实体与动画': 16068 + 16023 + 1223,  # .ent + .anims + .rig
-    '材质资源': 6268 + 268,  # .mi + .mt
-    '外观资源': 2090,  # .app
+# depot 不可用时使用的文件数（手工统计结果）
+FALLBACK_FORMAT_COUNTS = {
+    '.wem': 178063, '.xbm': 119098, '.mesh': 108305, '.mlmask': 26168, '.ent': 16068,
+    '.anims': 16023, '.mlsetup': 13712, '.mi': 6268, '.app': 2090, '.rig': 1223,
+    '.mt': 268, '.w2mesh': 332, '.bnk': 127, '.opuspak': 1442,
 }
 
-# 3. 核心资源细分（重点资产类型的详细分布）
-core_asset_data = {
+# 资产大类 -> 包含的格式
+ASSET_CATEGORIES = {
+    '音频资源': ('.wem', '.bnk', '.opuspak'),
+    '纹理资源': ('.xbm',),
+    '3D模型资源': ('.mesh', '.w2mesh'),
+    '地形资源': ('.mlmask', '.mlsetup'),
+    '实体与动画': ('.ent', '.anims', '.rig'),
+    '材质资源': ('.mi', '.mt'),
+    '外观资源': ('.app',),
+}
+
+# 核心资源细分（重点资产类型的详细分布）：大类 -> {细分: 包含的格式}，空元组表示暂无对应格式
+CORE_ASSETS = {
     '视觉资产': {
-        'textures(纹理)': 119098,
-        'materials(材质)': 6268 + 268,
-        'mesh(网格)': 108305 + 332,
+        'textures(纹理)': ('.xbm',),
+        'materials(材质)': ('.mi', '.mt'),
+        'mesh(网格)': ('.mesh', '.w2mesh'),
     },
     '角色与动画': {
-        'characters(角色)': 2090,  # .app 外观文件
-        'animations(动画)': 16023,
-        'rig(骨骼)': 1223,
+        'characters(角色)': ('.app',),  # .app 外观文件
+        'animations(动画)': ('.anims',),
+        'rig(骨骼)': ('.rig',),
     },
     '环境与场景': {
-        'terrain(地形)': 26168 + 13712,
-        'environment(环境)': 0,  # 无具体数量，按比例分配
-        'lighting(光照)': 0,
+        'terrain(地形)': ('.mlmask', '.mlsetup'),
+        'environment(环境)': (),
+        'lighting(光照)': (),
     },
     '音频资源': {
-        'sound(音频)': 178063 + 127 + 1442,
+        'sound(音频)': ('.wem', '.bnk', '.opuspak'),
     },
     '实体与道具': {
-        'entities(实体)': 16068,
-        'items(道具)': 0,
-        'vehicles(载具)': 0,
+        'entities(实体)': ('.ent',),
+        'items(道具)': (),
+        'vehicles(载具)': (),
     }
 }
 
-# 4. 重点文件格式Top10
-top10_formats = dict(sorted(file_format_data.items(), key=lambda x: x[1][0], reverse=True)[:10])
+
+def load_format_stats(depot_root=DEPOT_ROOT, index_file=INDEX_FILE, workers=SCAN_WORKERS,
+                      full_refresh_days=FULL_REFRESH_DAYS):
+    """
+    各格式的 (文件数, 总字节数)
+    增量刷新 depot 索引后直接在索引上按扩展名汇总（距上次完整刷新超过 full_refresh_days 天时改为完整刷新）；
+    depot 不存在时返回手工统计的文件数（字节数为 None）
+    """
+    if not os.path.isdir(depot_root):
+        print(f"⚠️  depot 路径 {depot_root} 不存在，使用内置的手工统计数据")
+        return {ext: (FALLBACK_FORMAT_COUNTS[ext], None) for ext in FORMAT_INFO}
+    with DepotIndex(index_file, depot_root) as index:
+        last_full = index.last_full_refresh
+        full = last_full is None or time.time() - last_full >= full_refresh_days * 86400
+        scanned, reused = index.refresh(workers=workers, full=full)
+        print(f"📇 索引{'完整' if full else '增量'}刷新完成：重扫 {scanned} 个目录，沿用 {reused} 个目录")
+        histogram = index.ext_histogram(extensions=FORMAT_INFO)
+    return {ext: histogram.get(ext, (0, 0)) for ext in FORMAT_INFO}
+
+
+def build_asset_data(format_stats):
+    """由各格式的 (文件数, 总字节数) 生成图表数据"""
+    counts = {ext: count for ext, (count, _) in format_stats.items()}
+    # 1. 文件格式统计（格式: 数量, 描述, 颜色）
+    file_format_data = {ext: (counts[ext], desc, color) for ext, (desc, color) in FORMAT_INFO.items()}
+    # 2. 资产类别统计（按大类汇总）
+    asset_category_data = {category: sum(counts[ext] for ext in exts) for category, exts in ASSET_CATEGORIES.items()}
+    # 3. 核心资源细分
+    core_asset_data = {
+        main_cat: {sub_cat: sum(counts[ext] for ext in exts) for sub_cat, exts in subs.items()}
+        for main_cat, subs in CORE_ASSETS.items()
+    }
+    # 4. 重点文件格式Top10
+    top10_formats = dict(sorted(file_format_data.items(), key=lambda x: x[1][0], reverse=True)[:10])
+    return {
+        'file_format_data': file_format_data,
+        'asset_category_data': asset_category_data,
+        'core_asset_data': core_asset_data,
+        'top10_formats': top10_formats,
+        'format_sizes': {ext: size for ext, (_, size) in format_stats.items()},
+    }
 
 
-# -------------------------- 图表生成函数 --------------------------
-def generate_asset_charts(output_dir):
-    """生成综合统计图表（4行2列，共8个子图）"""
-    fig, axes = plt.subplots(4, 2, figsize=(20, 16))
-    axes = axes.flatten()  # 转为一维数组便于索引
+def _format_size(size):
+    """字节数 -> 便于阅读的大小"""
+    if size is None:
+        return '未知'
+    if size < 1024:
+        return f"{size} B"
+    for unit in ('KB', 'MB'):
+        size /= 1024
+        if size < 1024:
+            return f"{size:,.1f} {unit}"
+    size /= 1024
+    return f"{size:,.1f} GB"
 
-    # -------------------------- 图1：Top10文件格式数量柱状图 --------------------------
-    ax1 = axes[0]
+
+# -------------------------- 图表生成函数 --------------------------
+def _draw_top10_formats(ax, font, top10_formats):
+    """图1：Top10文件格式数量柱状图"""
     formats = list(top10_formats.keys())
     counts = [top10_formats[f][0] for f in formats]
     colors = [top10_formats[f][2] for f in formats]
 
-    bars = ax1.bar(range(len(formats)), counts, color=colors, alpha=0.8, edgecolor='white', linewidth=1.5)
-    ax1.set_title('Top10文件格式数量分布', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
-    ax1.set_xlabel('文件格式', fontproperties=font, fontsize=12)
-    ax1.set_ylabel('文件数量', fontproperties=font, fontsize=12)
-    ax1.set_xticks(range(len(formats)))
-    ax1.set_xticklabels(formats, fontproperties=font)
-    ax1.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.5)
+    bars = ax.bar(range(len(formats)), counts, color=colors, alpha=0.8, edgecolor='white', linewidth=1.5)
+    ax.set_title('Top10文件格式数量分布', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('文件格式', fontproperties=font, fontsize=12)
+    ax.set_ylabel('文件数量', fontproperties=font, fontsize=12)
+    ax.set_xticks(range(len(formats)))
+    ax.set_xticklabels(formats, fontproperties=font)
+    ax.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.5)
 
     # 添加数值标签（简化显示，超过10万显示x万）
     for bar, count in zip(bars, counts):
         height = bar.get_height()
         label = f'{count // 10000}万' if count >= 10000 else f'{count:,}'
-        ax1.text(bar.get_x() + bar.get_width() / 2, height + max(counts) * 0.01,
-                 label, ha='center', va='bottom', fontproperties=font, fontweight='bold')
+        ax.text(bar.get_x() + bar.get_width() / 2, height + max(counts) * 0.01,
+                label, ha='center', va='bottom', fontproperties=font, fontweight='bold')
+
+
+def _draw_category_share(ax, font, asset_category_data):
+    """图2：资产大类占比饼图"""
+    from matplotlib import cm
 
-    # -------------------------- 图2：资产大类占比饼图 --------------------------
-    ax2 = axes[1]
     categories = list(asset_category_data.keys())
     category_counts = list(asset_category_data.values())
     # 过滤数量为0的类别
@@ -130,20 +195,21 @@ def generate_asset_charts(output_dir):
     category_colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57', '#FF9FF3', '#54A0FF']
     while len(category_colors) < len(categories):
         category_colors.append(
-            '#' + ''.join([hex(int(c * 255))[2:].zfill(2) for c in plt.cm.Set3(len(category_colors) / 10)]))
+            '#' + ''.join([hex(int(c * 255))[2:].zfill(2) for c in cm.Set3(len(category_colors) / 10)]))
 
-    wedges, texts, autotexts = ax2.pie(category_counts, labels=categories, colors=category_colors[:len(categories)],
-                                       autopct='%1.1f%%', startangle=90,
-                                       textprops={'fontproperties': font, 'fontsize': 10})
-    ax2.set_title('资产大类占比分布', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
+    wedges, texts, autotexts = ax.pie(category_counts, labels=categories, colors=category_colors[:len(categories)],
+                                      autopct='%1.1f%%', startangle=90,
+                                      textprops={'fontproperties': font, 'fontsize': 10})
+    ax.set_title('资产大类占比分布', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
 
     # 美化饼图文字
     for autotext in autotexts:
         autotext.set_color('white')
         autotext.set_fontweight('bold')
 
-    # -------------------------- 图3：核心资源细分堆叠柱状图 --------------------------
-    ax3 = axes[2]
+
+def _draw_core_assets(ax, font, core_asset_data):
+    """图3：核心资源细分堆叠柱状图"""
     main_categories = list(core_asset_data.keys())
     sub_assets = []
     sub_counts = defaultdict(list)
@@ -164,36 +230,38 @@ def generate_asset_charts(output_dir):
             if count > 0:
                 sub_counts[sub_cat].append(count)
                 sub_colors[sub_cat].append(sub_color_map[sub_cat])
-                ax3.bar(i, count, bottom=bottom[i],
-                        label=sub_cat if sub_cat not in ax3.get_legend_handles_labels()[1] else "",
-                        color=sub_color_map[sub_cat], alpha=0.8, edgecolor='white', linewidth=1)
+                ax.bar(i, count, bottom=bottom[i],
+                       label=sub_cat if sub_cat not in ax.get_legend_handles_labels()[1] else "",
+                       color=sub_color_map[sub_cat], alpha=0.8, edgecolor='white', linewidth=1)
                 bottom[i] += count
 
-    ax3.set_title('核心资源细分分布', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
-    ax3.set_xlabel('资源大类', fontproperties=font, fontsize=12)
-    ax3.set_ylabel('文件数量', fontproperties=font, fontsize=12)
-    ax3.set_xticks(range(len(main_categories)))
-    ax3.set_xticklabels(main_categories, fontproperties=font, rotation=15)
-    ax3.legend(prop=font, fontsize=9, loc='upper right', bbox_to_anchor=(1.3, 1))
-    ax3.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.5)
+    ax.set_title('核心资源细分分布', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('资源大类', fontproperties=font, fontsize=12)
+    ax.set_ylabel('文件数量', fontproperties=font, fontsize=12)
+    ax.set_xticks(range(len(main_categories)))
+    ax.set_xticklabels(main_categories, fontproperties=font, rotation=15)
+    ax.legend(prop=font, fontsize=9, loc='upper right', bbox_to_anchor=(1.3, 1))
+    ax.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.5)
+
 
-    # -------------------------- 图4：文件格式数量对数坐标图（适配极端值） --------------------------
-    ax4 = axes[3]
+def _draw_all_formats_log(ax, font, file_format_data):
+    """图4：文件格式数量对数坐标图（适配极端值）"""
     all_formats = list(file_format_data.keys())
     all_counts = [file_format_data[f][0] for f in all_formats]
     all_colors = [file_format_data[f][2] for f in all_formats]
 
-    bars = ax4.bar(range(len(all_formats)), all_counts, color=all_colors, alpha=0.7, edgecolor='white', linewidth=1)
-    ax4.set_title('所有文件格式数量分布（对数坐标）', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
-    ax4.set_xlabel('文件格式', fontproperties=font, fontsize=12)
-    ax4.set_ylabel('文件数量（对数尺度）', fontproperties=font, fontsize=12)
-    ax4.set_xticks(range(len(all_formats)))
-    ax4.set_xticklabels(all_formats, fontproperties=font, rotation=45)
-    ax4.set_yscale('log')  # 对数坐标，解决数值差异过大问题
-    ax4.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.5)
-
-    # -------------------------- 图5：资产类型数量对比雷达图 --------------------------
-    ax5 = axes[4]
+    ax.bar(range(len(all_formats)), all_counts, color=all_colors, alpha=0.7, edgecolor='white', linewidth=1)
+    ax.set_title('所有文件格式数量分布（对数坐标）', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('文件格式', fontproperties=font, fontsize=12)
+    ax.set_ylabel('文件数量（对数尺度）', fontproperties=font, fontsize=12)
+    ax.set_xticks(range(len(all_formats)))
+    ax.set_xticklabels(all_formats, fontproperties=font, rotation=45)
+    ax.set_yscale('log')  # 对数坐标，解决数值差异过大问题
+    ax.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.5)
+
+
+def _draw_category_radar(ax, font, asset_category_data):
+    """图5：资产类型数量对比雷达图"""
     # 选择6个主要资产类型做雷达图
     radar_categories = ['音频', '纹理', '3D网格', '地形', '实体', '动画']
     radar_counts = [
@@ -205,8 +273,8 @@ def generate_asset_charts(output_dir):
         asset_category_data['实体与动画'] // 3
     ]
 
-    # 归一化数据（雷达图适合展示相对比例）
-    max_count = max(radar_counts)
+    # 归一化数据（雷达图适合展示相对比例；全为0时按1归一，图形收在中心）
+    max_count = max(radar_counts) or 1
     normalized_counts = [cnt / max_count for cnt in radar_counts]
 
     # 绘制雷达图
@@ -215,16 +283,17 @@ def generate_asset_charts(output_dir):
     normalized_counts += normalized_counts[:1]
     radar_categories += radar_categories[:1]
 
-    ax5.plot(angles, normalized_counts, 'o-', linewidth=2, color='#FF6B6B', alpha=0.8)
-    ax5.fill(angles, normalized_counts, alpha=0.3, color='#FF6B6B')
-    ax5.set_xticks(angles[:-1])
-    ax5.set_xticklabels(radar_categories[:-1], fontproperties=font)
-    ax5.set_ylim(0, 1)
-    ax5.set_title('主要资产类型相对比例（雷达图）', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
-    ax5.grid(True, alpha=0.3)
+    ax.plot(angles, normalized_counts, 'o-', linewidth=2, color='#FF6B6B', alpha=0.8)
+    ax.fill(angles, normalized_counts, alpha=0.3, color='#FF6B6B')
+    ax.set_xticks(angles[:-1])
+    ax.set_xticklabels(radar_categories[:-1], fontproperties=font)
+    ax.set_ylim(0, 1)
+    ax.set_title('主要资产类型相对比例（雷达图）', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
+    ax.grid(True, alpha=0.3)
+
 
-    # -------------------------- 图6：文件格式类型分类统计（横向柱状图） --------------------------
-    ax6 = axes[5]
+def _draw_format_groups(ax, font, file_format_data):
+    """图6：文件格式类型分类统计（横向柱状图）"""
     # 按类型分组
     type_groups = defaultdict(int)
     type_colors = {
@@ -258,23 +327,24 @@ def generate_asset_charts(output_dir):
     group_counts = list(type_groups.values())
     colors = [type_colors[g] for g in groups]
 
-    bars = ax6.barh(range(len(groups)), group_counts, color=colors, alpha=0.8, edgecolor='white', linewidth=1)
-    ax6.set_title('文件格式类型分组统计', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
-    ax6.set_xlabel('文件数量', fontproperties=font, fontsize=12)
-    ax6.set_ylabel('文件类型组', fontproperties=font, fontsize=12)
-    ax6.set_yticks(range(len(groups)))
-    ax6.set_yticklabels(groups, fontproperties=font)
-    ax6.grid(axis='x', alpha=0.3, linestyle='--', linewidth=0.5)
+    bars = ax.barh(range(len(groups)), group_counts, color=colors, alpha=0.8, edgecolor='white', linewidth=1)
+    ax.set_title('文件格式类型分组统计', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('文件数量', fontproperties=font, fontsize=12)
+    ax.set_ylabel('文件类型组', fontproperties=font, fontsize=12)
+    ax.set_yticks(range(len(groups)))
+    ax.set_yticklabels(groups, fontproperties=font)
+    ax.grid(axis='x', alpha=0.3, linestyle='--', linewidth=0.5)
 
     # 添加数值标签
     for bar, count in zip(bars, group_counts):
         width = bar.get_width()
         label = f'{count // 10000}万' if count >= 10000 else f'{count:,}'
-        ax6.text(width + max(group_counts) * 0.01, bar.get_y() + bar.get_height() / 2,
-                 label, ha='left', va='center', fontproperties=font, fontweight='bold')
+        ax.text(width + max(group_counts) * 0.01, bar.get_y() + bar.get_height() / 2,
+                label, ha='left', va='center', fontproperties=font, fontweight='bold')
 
-    # -------------------------- 图7：重点文件格式占比（环形图） --------------------------
-    ax7 = axes[6]
+
+def _draw_format_ring(ax, font, file_format_data):
+    """图7：重点文件格式占比（环形图）"""
     # 选择前5个重点格式 + 其他
     top5_formats = dict(sorted(file_format_data.items(), key=lambda x: x[1][0], reverse=True)[:5])
     other_count = sum(file_format_data[f][0] for f in file_format_data if f not in top5_formats)
@@ -284,46 +354,48 @@ def generate_asset_charts(output_dir):
     ring_colors = [top5_formats[f][2] for f in top5_formats.keys()] + ['#BDBDBD']
 
     # 绘制环形图（中间空心）
-    wedges, texts, autotexts = ax7.pie(ring_counts, labels=ring_labels, colors=ring_colors,
-                                       autopct='%1.1f%%', startangle=90,
-                                       textprops={'fontproperties': font, 'fontsize': 9},
-                                       wedgeprops=dict(width=0.4, edgecolor='white', linewidth=2))
-    ax7.set_title('重点文件格式占比（环形图）', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
+    wedges, texts, autotexts = ax.pie(ring_counts, labels=ring_labels, colors=ring_colors,
+                                      autopct='%1.1f%%', startangle=90,
+                                      textprops={'fontproperties': font, 'fontsize': 9},
+                                      wedgeprops=dict(width=0.4, edgecolor='white', linewidth=2))
+    ax.set_title('重点文件格式占比（环形图）', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
 
     # 美化文字
     for autotext in autotexts:
         autotext.set_color('white')
         autotext.set_fontweight('bold')
 
-    # -------------------------- 图8：资产规模汇总统计表 --------------------------
-    ax8 = axes[7]
-    ax8.axis('tight')
-    ax8.axis('off')  # 隐藏坐标轴
 
-    # 表格数据
+def _draw_summary_table(ax, font, asset_category_data):
+    """图8：资产规模汇总统计表"""
+    ax.axis('tight')
+    ax.axis('off')  # 隐藏坐标轴
+
+    # 表格数据（占比的分母为0时按1计，各类均显示0.0%）
+    share_total = sum(asset_category_data.values()) or 1
     table_data = [
         ['资产大类', '文件数量', '占比', '主要格式'],
         ['音频资源', f'{asset_category_data["音频资源"]:,}',
-         f'{asset_category_data["音频资源"] / sum(asset_category_data.values()):.1%}', '.wem, .bnk, .opuspak'],
+         f'{asset_category_data["音频资源"] / share_total:.1%}', '.wem, .bnk, .opuspak'],
         ['纹理资源', f'{asset_category_data["纹理资源"]:,}',
-         f'{asset_category_data["纹理资源"] / sum(asset_category_data.values()):.1%}', '.xbm'],
+         f'{asset_category_data["纹理资源"] / share_total:.1%}', '.xbm'],
         ['3D模型资源', f'{asset_category_data["3D模型资源"]:,}',
-         f'{asset_category_data["3D模型资源"] / sum(asset_category_data.values()):.1%}', '.mesh, .w2mesh'],
+         f'{asset_category_data["3D模型资源"] / share_total:.1%}', '.mesh, .w2mesh'],
         ['地形资源', f'{asset_category_data["地形资源"]:,}',
-         f'{asset_category_data["地形资源"] / sum(asset_category_data.values()):.1%}', '.mlmask, .mlsetup'],
+         f'{asset_category_data["地形资源"] / share_total:.1%}', '.mlmask, .mlsetup'],
         ['实体与动画', f'{asset_category_data["实体与动画"]:,}',
-         f'{asset_category_data["实体与动画"] / sum(asset_category_data.values()):.1%}', '.ent, .anims, .rig'],
+         f'{asset_category_data["实体与动画"] / share_total:.1%}', '.ent, .anims, .rig'],
         ['材质资源', f'{asset_category_data["材质资源"]:,}',
-         f'{asset_category_data["材质资源"] / sum(asset_category_data.values()):.1%}', '.mi, .mt'],
+         f'{asset_category_data["材质资源"] / share_total:.1%}', '.mi, .mt'],
         ['外观资源', f'{asset_category_data["外观资源"]:,}',
-         f'{asset_category_data["外观资源"] / sum(asset_category_data.values()):.1%}', '.app'],
+         f'{asset_category_data["外观资源"] / share_total:.1%}', '.app'],
         ['总计', f'{sum(asset_category_data.values()):,}', '100.0%', '13种格式']
     ]
 
     # 创建表格
-    table = ax8.table(cellText=table_data[1:], colLabels=table_data[0],
-                      cellLoc='center', loc='center',
-                      colWidths=[0.2, 0.2, 0.15, 0.45])
+    table = ax.table(cellText=table_data[1:], colLabels=table_data[0],
+                     cellLoc='center', loc='center',
+                     colWidths=[0.2, 0.2, 0.15, 0.45])
     table.auto_set_font_size(False)
     table.set_fontsize(10)
     table.scale(1, 2)
@@ -340,14 +412,35 @@ def generate_asset_charts(output_dir):
             table[(i, j)].set_text_props(fontproperties=font)
             table[(i, j)].set_height(0.08)
 
-    ax8.set_title('资产规模汇总统计', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
+    ax.set_title('资产规模汇总统计', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
 
-    # -------------------------- 保存图表 --------------------------
-    output_path = output_dir / 'cyberpunk2077_asset_analysis.png'
-    plt.suptitle('赛博朋克2077核心美术资产统计分析报告', fontproperties=font, fontsize=18, fontweight='bold', y=0.98)
-    plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()
 
+def generate_asset_charts(output_dir, data, workers=CHART_WORKERS, force=False):
+    """
+    生成综合统计图表（4行2列，共8个子图），data 为 build_asset_data 的结果
+    8个子图在进程池中并行渲染后拼成一张图；数据与上次出图时相同则跳过（force=True 强制重画）
+    没有统计到任何文件时（如 depot 为空）不生成图表
+    """
+    file_format_data = data['file_format_data']
+    asset_category_data = data['asset_category_data']
+    if not sum(asset_category_data.values()):
+        print("⚠️  未统计到任何资产文件，跳过图表生成")
+        return
+    output_path = output_dir / 'cyberpunk2077_asset_analysis.png'
+    report = ChartReport(output_path, [
+        Panel(_draw_top10_formats, (data['top10_formats'],)),
+        Panel(_draw_category_share, (asset_category_data,)),
+        Panel(_draw_core_assets, (data['core_asset_data'],)),
+        Panel(_draw_all_formats_log, (file_format_data,)),
+        Panel(_draw_category_radar, (asset_category_data,)),
+        Panel(_draw_format_groups, (file_format_data,)),
+        Panel(_draw_format_ring, (file_format_data,)),
+        Panel(_draw_summary_table, (asset_category_data,)),
+    ], cols=2, title='赛博朋克2077核心美术资产统计分析报告', rc=CHART_RC)
+
+    # -------------------------- 渲染并保存图表 --------------------------
+    if not render_reports([report], workers, force):
+        return
     print(f"图表已保存到: {output_path}")
     print(f"图表包含8个子图：")
     print("1. Top10文件格式数量分布  2. 资产大类占比分布")
@@ -362,21 +455,30 @@ def main():
     output_dir = Path(r'D:\Data\PYh\AmountSy\scnScene')
     output_dir.mkdir(exist_ok=True)  # 确保目录存在
 
-    # 生成图表
-    generate_asset_charts(output_dir)
+    # 统计各格式文件数 / 大小并生成图表
+    data = build_asset_data(load_format_stats())
+    file_format_data = data['file_format_data']
+    asset_category_data = data['asset_category_data']
+    format_sizes = data['format_sizes']
+    total_files = sum(asset_category_data.values())
+    if not total_files:
+        print(f"⚠️  depot 中没有统计的文件格式（{', '.join(FORMAT_INFO)}），不生成图表和摘要")
+        return
+    generate_asset_charts(output_dir, data)
 
     # 输出文本统计摘要
     print("\n" + "=" * 80)
     print("赛博朋克2077核心美术资产统计摘要")
     print("=" * 80)
-    total_files = sum(asset_category_data.values())
     print(f"总文件数量：{total_files:,} 个")
+    if None not in format_sizes.values():
+        print(f"总大小：{_format_size(sum(format_sizes.values()))}")
     print(f"文件格式种类：{len(file_format_data)} 种")
     print(f"资产大类：{len(asset_category_data)} 类")
     print("\n文件数量Top3：")
     for i, (fmt, (cnt, desc, _)) in enumerate(sorted(file_format_data.items(), key=lambda x: x[1][0], reverse=True)[:3],
                                               1):
-        print(f"  {i}. {fmt} ({desc})：{cnt:,} 个 ({cnt / total_files:.1%})")
+        print(f"  {i}. {fmt} ({desc})：{cnt:,} 个 ({cnt / total_files:.1%})，{_format_size(format_sizes[fmt])}")
     print("\n资产占比Top3：")
     for i, (cat, cnt) in enumerate(sorted(asset_category_data.items(), key=lambda x: x[1], reverse=True)[:3], 1):
         print(f"  {i}. {cat}：{cnt:,} 个 ({cnt / total_files:.1%})")
@@ -384,12 +486,9 @@ def main():
 
 if __name__ == '__main__':
     # 安装依赖检查
-    try:
-        import matplotlib.pyplot as plt
-    except ImportError:
+    if not plotting.matplotlib_installed():
         print("检测到未安装matplotlib，正在自动安装...")
         import subprocess
-        import sys
 
         subprocess.check_call([sys.executable, "-m", "pip", "install", "matplotlib"])
         print("matplotlib安装完成，重启脚本...")
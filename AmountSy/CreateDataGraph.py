@@ -1,6 +1,7 @@
-import matplotlib.pyplot as plt
 import numpy as np
 
+from amountsy import plotting
+
 # 数据整理（排除小计行，保留有效任务）
 tasks = [
     ("q000", "三个出身序章", 75, "超大型"),
@@ -39,9 +40,8 @@ color_map = {
 }
 bar_colors = [color_map[c] for c in complexity]
 
-# 设置中文字体（避免中文乱码）
-plt.rcParams['font.sans-serif'] = ['SimHei']  # Windows用黑体，Mac用'Arial Unicode MS'
-plt.rcParams['axes.unicode_minus'] = False
+# 设置中文字体（避免中文乱码）；Agg 后端只保存图片，不弹窗
+plt = plotting.pyplot({'font.sans-serif': ['SimHei']})  # Windows用黑体，Mac用'Arial Unicode MS'
 
 # 创建画布和子图
 fig, ax = plt.subplots(figsize=(14, 8))  # 宽14英寸，高8英寸
@@ -97,4 +97,4 @@ plt.tight_layout()
 
 # 导出图片（高清PNG格式）
 plt.savefig("cyberpunk2077_task_scene_bar.png", dpi=300, bbox_inches='tight')
-plt.show()
\ No newline at end of file
+plt.close()
\ No newline at end of file
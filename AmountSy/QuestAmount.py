@@ -3,10 +3,19 @@ import os
 import glob
 import datetime
 
+from amountsy.depot_walker import ExtensionCounter
+from amountsy.depot_index import scan
+
 # 使用原始字符串处理Windows路径，避免转义问题
 QUEST_BASE = r"D:\AppSoft\Sy2077\2077\2077\CDPR2077\r6\depot\base\quest"
 OUTPUT_FILE = r"D:\Data\PYh\AmountSy\Out\quest_statistics.txt"
 CSV_FILE = r"D:\Data\PYh\AmountSy\Out\quest_statistics.csv"
+# depot 文件索引（增量刷新，重复统计无需重新遍历整棵目录树；设为 None 则每次直接遍历）
+DEPOT_ROOT = r"D:\AppSoft\Sy2077\2077\2077\CDPR2077\r6\depot"
+INDEX_FILE = r"D:\Data\PYh\AmountSy\Out\depot_index.sqlite"
+# 同时在途的目录请求数：depot 在网络盘（SMB/NFS）上时设为 32 左右，列目录 / stat 的往返延迟重叠进行，
+# 使用索引时作为刷新线程数；0 表示逐个目录串行遍历（本地磁盘）
+SCAN_CONCURRENCY = 0
 
 # 初始化计数器
 total_questphase = 0
@@ -14,13 +23,14 @@ total_scenesolution = 0
 total_quests = 0
 
 
-def count_quest(quest_dir, quest_name, category, output_file, csv_file):
-    """统计指定任务目录及其所有子文件夹中的文件数量"""
+def count_quest(quest_dir, quest_name, category, output_file, csv_file, counter):
+    """统计指定任务目录及其所有子文件夹中的文件数量（从整棵 quest 树的单次遍历结果中汇总）"""
     global total_questphase, total_scenesolution, total_quests
 
-    # 递归搜索所有子文件夹中的目标文件（**表示所有子目录）
-    questphase_count = len(glob.glob(os.path.join(quest_dir, "**", "*.questphase"), recursive=True))
-    scenesolution_count = len(glob.glob(os.path.join(quest_dir, "**", "*.scenesolution"), recursive=True))
+    # 任务目录相对 QUEST_BASE 的路径分段，对应 counter 中的子树
+    rel_prefix = os.path.relpath(quest_dir, QUEST_BASE).split(os.sep)
+    questphase_count = counter.count(rel_prefix, ".questphase")
+    scenesolution_count = counter.count(rel_prefix, ".scenesolution")
 
     # 写入CSV文件
     with open(csv_file, 'a', encoding='utf-8') as f:
@@ -43,6 +53,10 @@ def main():
     if not os.path.exists(output_dir):
         os.makedirs(output_dir, exist_ok=True)
 
+    # 整棵 quest 树只遍历一次（或从索引读取），各任务的数量从该结果中按子树汇总
+    counter = ExtensionCounter([".questphase", ".scenesolution"])
+    scan(QUEST_BASE, [counter], INDEX_FILE, DEPOT_ROOT, SCAN_CONCURRENCY)
+
     # 初始化输出文件
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
         f.write("任务文件统计报告\n")
@@ -62,7 +76,7 @@ def main():
     for quest_dir in prologue_dirs:
         if os.path.isdir(quest_dir):
             quest_name = os.path.basename(os.path.dirname(quest_dir))
-            count_quest(quest_dir, quest_name, "主线-序章", OUTPUT_FILE, CSV_FILE)
+            count_quest(quest_dir, quest_name, "主线-序章", OUTPUT_FILE, CSV_FILE, counter)
 
     with open(OUTPUT_FILE, 'a', encoding='utf-8') as f:
         f.write("\n")
@@ -76,7 +90,7 @@ def main():
     for quest_dir in part1_dirs:
         if os.path.isdir(quest_dir):
             quest_name = os.path.basename(os.path.dirname(quest_dir))
-            count_quest(quest_dir, quest_name, "主线-第一章", OUTPUT_FILE, CSV_FILE)
+            count_quest(quest_dir, quest_name, "主线-第一章", OUTPUT_FILE, CSV_FILE, counter)
 
     with open(OUTPUT_FILE, 'a', encoding='utf-8') as f:
         f.write("\n")
@@ -92,7 +106,7 @@ def main():
         for quest_dir in epilogue_dirs:
             if os.path.isdir(quest_dir):
                 quest_name = os.path.basename(os.path.dirname(quest_dir))
-                count_quest(quest_dir, quest_name, "主线-结局", OUTPUT_FILE, CSV_FILE)
+                count_quest(quest_dir, quest_name, "主线-结局", OUTPUT_FILE, CSV_FILE, counter)
 
         with open(OUTPUT_FILE, 'a', encoding='utf-8') as f:
             f.write("\n")
@@ -106,7 +120,7 @@ def main():
     for quest_dir in side_dirs:
         if os.path.isdir(quest_dir):
             quest_name = os.path.basename(os.path.dirname(quest_dir))
-            count_quest(quest_dir, quest_name, "支线任务", OUTPUT_FILE, CSV_FILE)
+            count_quest(quest_dir, quest_name, "支线任务", OUTPUT_FILE, CSV_FILE, counter)
 
     with open(OUTPUT_FILE, 'a', encoding='utf-8') as f:
         f.write("\n")
@@ -122,7 +136,7 @@ def main():
         for quest_dir in minor_dirs:
             if os.path.isdir(quest_dir):
                 quest_name = os.path.basename(os.path.dirname(quest_dir))
-                count_quest(quest_dir, quest_name, "次要任务", OUTPUT_FILE, CSV_FILE)
+                count_quest(quest_dir, quest_name, "次要任务", OUTPUT_FILE, CSV_FILE, counter)
 
         with open(OUTPUT_FILE, 'a', encoding='utf-8') as f:
             f.write("\n")
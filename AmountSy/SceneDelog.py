@@ -1,10 +1,10 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import json
 
-# 设置中文字体（避免中文乱码）
-plt.rcParams['font.sans-serif'] = ['SimHei']
-plt.rcParams['axes.unicode_minus'] = False
+from amountsy import plotting
+
+# 设置中文字体（避免中文乱码）；Agg 后端只保存图片，不弹窗
+plt = plotting.pyplot({'font.sans-serif': ['SimHei']})
 
 # 读取JSON数据（请替换为你的文件路径）
 with open(r"D:\Data\PYh\AmountSy\Out\scnlocjson_analysis_detailed.json", 'r', encoding='utf-8') as f:
@@ -49,7 +49,7 @@ lines2, labels2 = ax2.get_legend_handles_labels()
 ax1.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
 plt.tight_layout()
 plt.savefig('任务类型场景数对话量分布.png', dpi=300, bbox_inches='tight')
-plt.show()
+plt.close()
 
 # 2. Top10场景对话量柱状图
 top10_scenes = data['scenes'][:10]
@@ -70,7 +70,7 @@ for i, bar in enumerate(bars):
 
 plt.tight_layout()
 plt.savefig('Top10场景对话量.png', dpi=300, bbox_inches='tight')
-plt.show()
+plt.close()
 
 # 3. 任务类型对话占比饼图
 # 筛选占比>0.5%的类型，其余归为"其他"
@@ -98,4 +98,4 @@ plt.title('各任务类型对话占比', fontsize=14, fontweight='bold')
 plt.axis('equal')  # 保证饼图为正圆形
 plt.tight_layout()
 plt.savefig('任务类型对话占比饼图.png', dpi=300, bbox_inches='tight')
-plt.show()
\ No newline at end of file
+plt.close()
\ No newline at end of file
@@ -1,13 +1,35 @@
 import json
 import os
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from collections import defaultdict
 
+from amountsy.bundle import BundleWalker, open_bundle
+from amountsy.depot_walker import crawl, SceneCollector
+from amountsy.scene_stats import SceneStatsCache, load_scene_stats, scene_stats_from_stream
+
 # Base directory (游戏文件所在目录，可根据实际情况修改)
 base_dir = r"D:\AppSoft\Sy2077\2077\2077\CDPR2077\r6\depot\base\quest"
-
-# Find all .scnlocjson files (递归查找所有目标文件)
-scnlocjson_files = list(Path(base_dir).rglob("*.scnlocjson"))
+# 场景统计缓存（未变化的场景不再重新解析；设为 None 则不使用缓存）
+scene_cache_file = r"D:\Data\PYh\AmountSy\Out\scene_stats_cache.sqlite"
+# 时间戳变化但内容未变的场景仍命中缓存（比对内容哈希；重新检出/解包后时间戳被重置时开启，每次多读一遍变化的文件）
+scene_cache_use_hash = False
+# depot 快照压缩包（zip / tar；设置后直接从包内读取场景，不必先解压，不使用场景缓存）
+scene_bundle = None
+bundle_base_dir = "depot/base/quest"  # 包内的 quest 目录
+
+# Find all .scnlocjson files (单次 scandir 递归查找所有目标文件；压缩包按成员表查找)
+scene_collector = SceneCollector()
+if scene_bundle:
+    bundle = open_bundle(scene_bundle)
+    scan_root = PurePosixPath(bundle_base_dir)
+    crawl(bundle_base_dir, [scene_collector], BundleWalker(bundle))
+    scnlocjson_files = [PurePosixPath(p) for p in scene_collector.files]
+    scene_cache_file = None
+else:
+    bundle = None
+    scan_root = Path(base_dir)
+    crawl(base_dir, [scene_collector])
+    scnlocjson_files = [Path(p) for p in scene_collector.files]
 
 print(f"Found {len(scnlocjson_files)} .scnlocjson files\n")
 print("Processing files...\n")
@@ -19,31 +41,24 @@ total_dialogue_lines = 0
 total_scenes = 0
 
 # Process each file (批量处理文件)
+scene_cache = SceneStatsCache(scene_cache_file, scene_cache_use_hash) if scene_cache_file else None
 for idx, file_path in enumerate(scnlocjson_files):
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        scene_name = data.get("SceneName", "Unknown")
-        scene_path = str(file_path.relative_to(Path(base_dir)))
-        sections = data.get("SectionsInScene", [])
-        num_sections = len(sections)
-
-        # Count total dialogue lines and collect speakers (统计对话行和说话人)
-        total_lines = 0
-        speakers = set()
-
-        for section in sections:
-            lines = section.get("LinesInSection", [])
-            total_lines += len(lines)
-
-            for line in lines:
-                speaker = line.get("Speaker")
-                if speaker and speaker.strip():
-                    speakers.add(speaker)
+        # Count sections, dialogue lines and speakers (统计段数、对话行和说话人，未变化的场景读取缓存)
+        if bundle is not None:
+            with bundle.open(file_path) as f:
+                stats = scene_stats_from_stream(f, bundle.entry(file_path).size)
+        else:
+            stats = load_scene_stats(file_path, scene_cache)
+
+        scene_name = stats["scene_name"] if stats["scene_name"] is not None else "Unknown"
+        scene_path = str(file_path.relative_to(scan_root))
+        num_sections = stats["total_sections"]
+        total_lines = stats["total_lines"]
+        speakers = stats["speakers"]
 
         # Determine quest type from path (从文件路径提取任务类型)
-        parts = file_path.relative_to(Path(base_dir)).parts
+        parts = file_path.relative_to(scan_root).parts
         quest_type = parts[0] if parts else "unknown"
 
         # Store scene data (存储场景数据)
@@ -74,6 +89,12 @@ for idx, file_path in enumerate(scnlocjson_files):
         print(f"Error processing {file_path}: {e}")
         continue
 
+if scene_cache is not None:
+    print(f"\nScene cache: {scene_cache.hits} hits, {scene_cache.misses} re-parsed")
+    scene_cache.close()
+if bundle is not None:
+    bundle.close()
+
 print(f"\nProcessed {total_scenes} files successfully\n")
 
 # Sort scenes by dialogue count (按对话行数降序排序)
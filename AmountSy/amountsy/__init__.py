@@ -0,0 +1,7 @@
+"""
+AmountSy 统计脚本共享的公共模块
+- 各统计脚本（QuestAmount.py、scnSceneJson.py 等）直接从本包导入，避免各自重复实现
+- 可选依赖（未安装时对应功能降级或给出提示，其余功能不受影响）：
+  - ijson：超过 scene_stats.STREAM_THRESHOLD 的场景文件用事件流解析，内存占用与文件大小无关（pip install ijson）
+  - pyarrow：table_export 的 parquet / arrow 输出（pip install pyarrow）
+"""
@@ -0,0 +1,104 @@
+"""
+高延迟挂载（SMB/NFS 网络盘）上的并发目录遍历
+- AsyncDirWalker：剪枝规则和产出接口与 DirWalker 相同（walk(root) 逐个产出 (entry, rel_dir)，可直接交给 crawl / scan），
+  区别在于用 asyncio 同时发出多个目录的 scandir：发现子目录时立即排队列目录，最多 concurrency 个请求同时在途，
+  阻塞的 scandir / stat 在线程池中执行，总耗时取决于带宽而不是单次请求的往返延迟
+- 产出顺序仍与 DirWalker 一致（按深度优先顺序等待各目录的结果），各消费者的结果与本地遍历完全相同
+- stat_files=True 时在列目录的线程中顺带 stat 每个产出的文件（DirEntry 缓存结果），调用方取大小/修改时间不再逐个往返
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from amountsy.depot_walker import DirWalker
+
+CONCURRENCY = 32  # 同时在途的目录请求数（本地磁盘用 DirWalker 即可）
+MAX_BUFFERED_DIRS = 4096  # 已列出（或正在列）、尚未被调用方取走的目录数上限
+
+
+class AsyncDirWalker(DirWalker):
+    """
+    并发列目录的 DirWalker
+    - concurrency：同时在途的 scandir 个数
+    - max_buffered_dirs：领先调用方的目录数上限（背压），调用方处理得慢时暂停列新目录，内存占用有上限
+    - executor：执行阻塞调用的线程池（None 表示每次 walk 新建 concurrency 个线程的线程池）
+    """
+
+    def __init__(self, exclude_dirs=(), max_depth=None, extensions=None, concurrency=CONCURRENCY,
+                 max_buffered_dirs=MAX_BUFFERED_DIRS, executor=None, stat_files=False):
+        super().__init__(exclude_dirs, max_depth, extensions)
+        self.concurrency = max(1, concurrency)
+        self.max_buffered_dirs = max(1, max_buffered_dirs)
+        self.executor = executor
+        self.stat_files = stat_files
+
+    def _list_dir(self, dir_path, rel_dir):
+        listing = super()._list_dir(dir_path, rel_dir)
+        if listing is not None and self.stat_files:
+            for entry in listing[0]:
+                try:
+                    entry.stat()
+                except OSError:
+                    pass
+        return listing
+
+    def walk(self, root):
+        """逐个产出 (entry, rel_dir)，顺序与 DirWalker.walk 相同；提前结束迭代时取消尚未完成的目录请求"""
+        self.pruned = []
+        executor = self.executor or ThreadPoolExecutor(max_workers=self.concurrency)
+        loop = asyncio.new_event_loop()
+        tasks = set()
+        state = {'buffered': 0, 'wanted': None}  # 占用的目录名额、调用方正在等待的目录任务
+
+        async def primitives():
+            return asyncio.Semaphore(self.concurrency), asyncio.Condition()
+
+        semaphore, room = loop.run_until_complete(primitives())
+
+        async def list_dir(dir_path, rel_dir):
+            me = asyncio.current_task()
+            async with room:
+                # 调用方正在等待的目录不受名额限制，保证不会互相等待
+                await room.wait_for(lambda: state['buffered'] < self.max_buffered_dirs or state['wanted'] is me)
+                state['buffered'] += 1
+            async with semaphore:
+                listing = await loop.run_in_executor(executor, self._list_dir, dir_path, rel_dir)
+            # 子目录在列完当前目录时立即排队，不必等调用方走到这里
+            sub_tasks = [schedule(*sub_dir) for sub_dir in listing[1]] if listing is not None else []
+            return listing, sub_tasks
+
+        def schedule(dir_path, rel_dir):
+            task = loop.create_task(list_dir(dir_path, rel_dir))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            return task
+
+        async def take(task):
+            async with room:
+                state['wanted'] = task
+                room.notify_all()
+            return await task
+
+        try:
+            stack = [(schedule(os.fspath(root), ()), ())]
+            while stack:
+                task, rel_dir = stack.pop()
+                # 等待这个目录时，事件循环同时推进其余在途的请求
+                listing, sub_tasks = loop.run_until_complete(take(task))
+                state['buffered'] -= 1
+                if listing is None:
+                    continue
+                files, sub_dirs, pruned = listing
+                self.pruned.extend(pruned)
+                for entry in files:
+                    yield entry, rel_dir
+                stack.extend(reversed([(sub_task, sub_rel) for sub_task, (_, sub_rel) in zip(sub_tasks, sub_dirs)]))
+        finally:
+            for task in list(tasks):
+                task.cancel()
+            if tasks:
+                loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.close()
+            if self.executor is None:
+                executor.shutdown(wait=True)
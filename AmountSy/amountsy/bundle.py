@@ -0,0 +1,189 @@
+"""
+depot 快照压缩包（zip / tar）的只读虚拟文件系统：分析脚本直接读包内文件，不必先解压
+- open_bundle(path)：按内容识别 zip / tar（含 .tar.gz / .tar.bz2 / .tar.xz），返回 ZipBundle / TarBundle
+- 包内路径统一为 '/' 分隔的成员名（去掉开头的 ./ 和 /），目录不单独记录
+- BundleWalker：剪枝规则和产出接口与 DirWalker 相同（walk(root) 产出 (entry, rel_dir)，可直接交给 crawl），
+  entry 为 depot_index.IndexedEntry（name / path / stat()），path 为包内成员名；产出顺序与 DirWalker 一致
+- read_bytes(member) / open(member)：zip 经中央目录定位，随机读取单个成员；未压缩 tar 按成员头记录的偏移随机读取；
+  压缩的 tar 只能顺序解压，乱序读取代价高，CI 打包时建议用 zip 或未压缩 tar
+- BundleReader：amountsy.prefetch.ReadAhead 的包内版本，预读线程从包中读取成员字节，
+  可直接传给 scnSceneJson.analyze_scene_files / questphase.aggregate_files 的 read_ahead 参数
+"""
+
+import abc
+import os
+import tarfile
+import threading
+import time
+import zipfile
+
+from amountsy.depot_index import IndexedEntry
+from amountsy.depot_walker import DirWalker, file_ext
+from amountsy.prefetch import READ_AHEAD_BYTES, READ_AHEAD_DEPTH, READ_WORKERS, ReadAhead
+
+# 读取包内成员时可能出现的错误（成员不存在、CRC 校验失败、包损坏等）
+BUNDLE_ERRORS = (OSError, KeyError, EOFError, zipfile.BadZipFile, tarfile.TarError)
+
+
+def member_name(path):
+    """包内路径 -> 规范的成员名（'/' 分隔，去掉开头的 ./ 和 /）"""
+    name = os.fspath(path).replace('\\', '/')
+    while name.startswith('./'):
+        name = name[2:]
+    return name.strip('/')
+
+
+class Bundle(abc.ABC):
+    """压缩包的公共部分：成员表（成员名 -> IndexedEntry）在打开时一次建好；子类实现 open / close"""
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self.entries = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __contains__(self, member):
+        return member_name(member) in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _add(self, name, size, mtime):
+        name = member_name(name)
+        self.entries[name] = IndexedEntry(name=name.rsplit('/', 1)[-1], path=name, size=size,
+                                          mtime_ns=int(mtime * 1_000_000_000))
+        return name
+
+    def entry(self, member):
+        return self.entries[member_name(member)]
+
+    def read_bytes(self, member):
+        with self.open(member) as f:
+            return f.read()
+
+    @abc.abstractmethod
+    def open(self, member):
+        """返回成员的只读二进制文件对象"""
+
+    @abc.abstractmethod
+    def close(self):
+        """关闭压缩包"""
+
+
+class ZipBundle(Bundle):
+    """zip 包：成员位置来自中央目录，任意成员可直接定位读取（zipfile 内部加锁，可在多个线程中同时读取）"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._zip = zipfile.ZipFile(self.path)
+        self._infos = {}
+        for info in self._zip.infolist():
+            if not info.is_dir():
+                name = self._add(info.filename, info.file_size, time.mktime(info.date_time + (0, 0, -1)))
+                self._infos[name] = info
+
+    def open(self, member):
+        return self._zip.open(self._infos[member_name(member)])
+
+    def read_bytes(self, member):
+        return self._zip.read(self._infos[member_name(member)])
+
+    def close(self):
+        self._zip.close()
+
+
+class TarBundle(Bundle):
+    """tar 包：打开时读一遍成员头建立成员表；tarfile 不是线程安全的，读取时加锁"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._tar = tarfile.open(self.path, 'r:*')
+        self._infos = {}
+        self._lock = threading.Lock()
+        for info in self._tar.getmembers():
+            if info.isfile():
+                name = self._add(info.name, info.size, info.mtime)
+                self._infos[name] = info
+
+    def open(self, member):
+        """返回的文件对象与包共用底层文件，只应在单个线程中顺序读取（多线程读取用 read_bytes）"""
+        info = self._infos[member_name(member)]
+        with self._lock:
+            return self._tar.extractfile(info)
+
+    def read_bytes(self, member):
+        info = self._infos[member_name(member)]
+        with self._lock:
+            return self._tar.extractfile(info).read()
+
+    def close(self):
+        self._tar.close()
+
+
+def open_bundle(path):
+    """按文件内容识别压缩包类型并打开"""
+    if zipfile.is_zipfile(path):
+        return ZipBundle(path)
+    if tarfile.is_tarfile(path):
+        return TarBundle(path)
+    raise ValueError(f"{path} 不是 zip 或 tar 压缩包")
+
+
+class BundleWalker(DirWalker):
+    """
+    在压缩包内按 DirWalker 的规则遍历（exclude_dirs / max_depth / extensions 含义相同）
+    - walk(root)：root 为包内目录（'' 表示整个包），rel_dir 相对 root
+    - pruned：最近一次 walk 中被剪掉的包内目录
+    """
+
+    def __init__(self, bundle, exclude_dirs=(), max_depth=None, extensions=None):
+        super().__init__(exclude_dirs, max_depth, extensions)
+        self.bundle = bundle
+
+    def walk(self, root=''):
+        excluded = self._excluded
+        extensions = self.extensions
+        max_depth = self.max_depth
+        prefix = member_name(root)
+        prefix_parts = prefix.split('/') if prefix else []
+        base = len(prefix_parts)
+
+        pruned = set()
+        items = []
+        for member, entry in self.bundle.entries.items():
+            parts = member.split('/')
+            if parts[:base] != prefix_parts or len(parts) == base:
+                continue
+            rel_dir = tuple(parts[base:-1])
+            # 逐层检查：与 DirWalker 相同，深度超限或目录名命中排除模式时整棵子树都不产出
+            for depth, dir_name in enumerate(rel_dir):
+                if (max_depth is not None and depth >= max_depth) or (excluded is not None and excluded(dir_name)):
+                    pruned.add('/'.join(parts[:base + depth + 1]))
+                    break
+            else:
+                if extensions is None or file_ext(entry.name) in extensions:
+                    items.append((rel_dir, entry.name, entry))
+
+        # 目录路径元组排序后，每个目录的文件恰好排在它的子目录之前（与 DirWalker 按名称排序的深度优先顺序一致）
+        items.sort(key=lambda item: item[:2])
+        self.pruned = sorted(pruned)
+        for rel_dir, _, entry in items:
+            yield entry, rel_dir
+
+
+class BundleReader(ReadAhead):
+    """从压缩包预读成员字节的 ReadAhead（paths 为包内成员名）；包内文件总是整体读入，不按大小跳过"""
+
+    def __init__(self, bundle, workers=READ_WORKERS, depth=READ_AHEAD_DEPTH, memory_budget=READ_AHEAD_BYTES):
+        super().__init__(workers, depth, memory_budget)
+        self.bundle = bundle
+
+    def _read_file(self, path):
+        try:
+            return self.bundle.read_bytes(path), None
+        except BUNDLE_ERRORS as e:
+            return None, e
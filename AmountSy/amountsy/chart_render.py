@@ -0,0 +1,306 @@
+"""
+图表渲染服务（各统计脚本共用）
+- 一张报告图（ChartReport）由若干子图面板（Panel）按网格组成：每个面板单独成图，在进程池中并行栅格化
+  （300 dpi 下文字和图形的光栅化是出图的主要耗时）；整张图的尺寸取脚本 rc 的 figure.figsize，面板按网格均分
+- 子进程把面板像素直接写入主进程创建的临时画布文件（np.memmap）中对应的区域，像素不经 pickle 传回，
+  主进程读出整张画布保存为 PNG
+- 多张报告一次提交时共用同一个进程池；主进程按提交顺序拼接保存，子进程同时继续渲染后面的面板
+- 面板绘制函数签名为 draw(ax, font, *args)：必须是模块级函数，args 可 pickle（在子进程中执行）
+- 输入数据的哈希写在输出图片旁（<图片>.datahash），数据未变化且图片存在时跳过渲染（force=True 强制重画）；
+  哈希包含各绘制函数的字节码和常量，并递归包含它们引用的同模块 / amountsy 内的辅助函数和模块级常量
+  （配色表、图例辅助函数、amountsy.plotting.BASE_RC 等），渲染流程本身的代码同样计入，修改任一处都会重新渲染。
+  第三方库只按名称计入，升级 matplotlib 等之后需要重画时调高 RENDER_VERSION 或传 force=True
+"""
+
+import hashlib
+import math
+import os
+import pickle
+import tempfile
+import types
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from amountsy import plotting
+
+WORKERS = os.cpu_count() or 1  # 渲染进程数（1 表示在当前进程中串行渲染）
+HASH_SUFFIX = '.datahash'
+DEFAULT_PANEL_SIZE = (9, 7)  # rc 中没有 figure.figsize 时每个面板的尺寸（英寸）
+RENDER_VERSION = 1  # 渲染方式版本，计入数据哈希（拼接、字体等公共样式变化时加一，使旧图全部重画）
+
+# draw(ax, font, *args) 在一个 ax 上画出完整的子图
+Panel = namedtuple('Panel', 'draw args')
+
+
+# 作为数据按内容计入哈希的模块级对象类型；其他对象（类、实例等）只计入类型名
+_DATA_TYPES = (str, bytes, int, float, bool, type(None), tuple, list, dict, set, frozenset)
+
+
+def _code_key(code):
+    """函数代码的可 pickle 摘要：字节码、引用的名称和常量（嵌套的 lambda / 推导式递归展开）"""
+    consts = tuple(_code_key(c) if hasattr(c, 'co_code') else repr(c) for c in code.co_consts)
+    return code.co_code, code.co_names, consts
+
+
+def _code_names(code):
+    """函数代码（含嵌套代码）引用的全部全局名 / 属性名"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if hasattr(const, 'co_code'):
+            names |= _code_names(const)
+    return names
+
+
+def _value_key(value):
+    """模块级常量的摘要；集合按排序后的元素计入，与字符串哈希的随机化无关"""
+    if isinstance(value, (set, frozenset)):
+        return sorted(map(repr, value))
+    return repr(value)
+
+
+def _is_tracked(module_name, owner):
+    """owner 模块的函数引用 module_name 模块的内容时，是否递归计入（同模块或 amountsy 包内）"""
+    return module_name == owner or module_name == 'amountsy' or module_name.startswith('amountsy.')
+
+
+def _global_key(value, names, owner, seen):
+    """owner 模块中的函数引用的一个全局对象的摘要；names 为该函数引用的全部名称（用于取模块属性）"""
+    value = getattr(value, '__wrapped__', value)  # lru_cache 等装饰器包装的函数按原函数计入
+    if isinstance(value, types.FunctionType):
+        if not _is_tracked(value.__module__, owner):
+            return f"{value.__module__}.{value.__qualname__}"
+        if id(value) in seen:
+            return value.__qualname__
+        return _function_key(value, seen)
+    if isinstance(value, types.ModuleType):
+        if not _is_tracked(value.__name__, owner) or id(value) in seen:
+            return value.__name__
+        seen.add(id(value))
+        return [(name, _global_key(getattr(value, name), names, value.__name__, seen))
+                for name in sorted(names) if hasattr(value, name)]
+    if isinstance(value, _DATA_TYPES):
+        return _value_key(value)
+    return type(value).__qualname__
+
+
+def _function_key(func, seen=None):
+    """
+    函数的可 pickle 摘要：代码、默认参数，以及它引用的同模块 / amountsy 内的函数和模块级常量（递归展开）
+    """
+    seen = set() if seen is None else seen
+    seen.add(id(func))
+    names = _code_names(func.__code__)
+    env = func.__globals__
+    deps = [(name, _global_key(env[name], names, func.__module__, seen)) for name in sorted(names) if name in env]
+    return func.__module__, func.__qualname__, _code_key(func.__code__), _value_key(func.__defaults__), deps
+
+
+class ChartReport:
+    """
+    一张报告图：panels 按行优先排成 cols 列的网格，title 不为空时在顶部加一条 title_height 英寸高的总标题
+    整张图的尺寸（英寸，含总标题）取 rc['figure.figsize']，各面板均分标题以下的区域；
+    rc 中没有 figure.figsize 时每个面板 DEFAULT_PANEL_SIZE 英寸
+    """
+
+    def __init__(self, output_path, panels, cols=2, title=None, rc=None, dpi=300, title_height=0.8):
+        self.output_path = str(output_path)
+        self.panels = list(panels)
+        self.cols = cols
+        self.title = title
+        self.rc = dict(rc or {})
+        self.dpi = dpi
+        self.title_height = title_height
+
+    @property
+    def hash_path(self):
+        return self.output_path + HASH_SUFFIX
+
+    @property
+    def rows(self):
+        return math.ceil(len(self.panels) / self.cols)
+
+    @property
+    def top(self):
+        """总标题条的高度（英寸），没有总标题时为 0"""
+        return self.title_height if self.title else 0
+
+    @property
+    def figsize(self):
+        if 'figure.figsize' in self.rc:
+            return tuple(self.rc['figure.figsize'])
+        width, height = DEFAULT_PANEL_SIZE
+        return width * self.cols, height * self.rows + self.top
+
+    @property
+    def panel_size(self):
+        width, height = self.figsize
+        return width / self.cols, (height - self.top) / self.rows
+
+    def data_hash(self):
+        """面板绘制函数（含其依赖的辅助函数和常量）、渲染流程、输入数据和版式参数的哈希"""
+        key = (
+            RENDER_VERSION,
+            _pipeline_key(),
+            [(_function_key(panel.draw), panel.args) for panel in self.panels],
+            self.cols, self.title, sorted(self.rc.items()), self.dpi, self.title_height,
+        )
+        return hashlib.sha256(pickle.dumps(key, protocol=4)).hexdigest()
+
+    def is_current(self, digest):
+        """输出图片存在且生成它的数据哈希与 digest 相同"""
+        if not os.path.exists(self.output_path):
+            return False
+        try:
+            with open(self.hash_path, encoding='utf-8') as f:
+                return f.read().strip() == digest
+        except OSError:
+            return False
+
+    def _pixels(self, inches):
+        return int(round(inches * self.dpi))
+
+    @property
+    def canvas_shape(self):
+        """整张图的像素数组形状 (高, 宽, 3)"""
+        panel_width, panel_height = self.panel_size
+        return (self._pixels(self.top) + self.rows * self._pixels(panel_height),
+                self.cols * self._pixels(panel_width), 3)
+
+    def tasks(self):
+        """
+        (绘制函数, 参数, 尺寸, 画布区域) 列表；有总标题时第一项为标题条
+        画布区域为 (y, x, 高, 宽) 像素，各面板的像素直接写入整张图中对应的位置
+        """
+        panel_width, panel_height = self.panel_size
+        width, height = self._pixels(panel_width), self._pixels(panel_height)
+        top = self._pixels(self.top)
+        tasks = []
+        if self.title:
+            tasks.append((_draw_title, (self.title,), (panel_width * self.cols, self.top),
+                          (0, 0, top, width * self.cols)))
+        for i, panel in enumerate(self.panels):
+            row, col = divmod(i, self.cols)
+            tasks.append((panel.draw, panel.args, (panel_width, panel_height),
+                          (top + row * height, col * width, height, width)))
+        return tasks
+
+    def save(self, canvas):
+        """保存拼好的整张图（RGB 数组）"""
+        from matplotlib import image as mpimg
+        os.makedirs(os.path.dirname(os.path.abspath(self.output_path)), exist_ok=True)
+        mpimg.imsave(self.output_path, canvas, dpi=self.dpi)
+
+
+def _draw_title(ax, font, title):
+    ax.axis('off')
+    ax.text(0.5, 0.5, title, ha='center', va='center', transform=ax.transAxes,
+            fontproperties=font, fontsize=18, fontweight='bold')
+
+
+def _rasterize(draw, args, size, rc, dpi):
+    """在当前进程中画出一个面板并栅格化，返回 RGB 像素数组"""
+    with plotting.rc_context(rc) as plt:
+        font = plotting.chinese_font()
+        fig, ax = plt.subplots(figsize=size, dpi=dpi, facecolor='white')
+        try:
+            draw(ax, font, *args)
+            fig.canvas.draw()
+            return np.asarray(fig.canvas.buffer_rgba())[:, :, :3]
+        finally:
+            plt.close(fig)
+
+
+def _paste(canvas, image, region):
+    """把面板像素写入画布的 region (y, x, 高, 宽)，栅格化的尺寸与区域有舍入误差时按区域裁剪"""
+    y, x, height, width = region
+    h, w = min(image.shape[0], height), min(image.shape[1], width)
+    canvas[y:y + h, x:x + w] = image[:h, :w]
+
+
+def _render_panel(draw, args, size, rc, dpi, region, canvas_file, canvas_shape):
+    """
+    子进程中渲染一个面板：像素直接写入主进程创建的画布文件（np.memmap），
+    不把整块像素数组（300 dpi 下每个面板十几 MB）pickle 传回主进程
+    """
+    image = _rasterize(draw, args, size, rc, dpi)
+    canvas = np.memmap(canvas_file, dtype=np.uint8, mode='r+', shape=canvas_shape)
+    try:
+        _paste(canvas, image, region)
+        canvas.flush()
+    finally:
+        del canvas
+
+
+def _blank_canvas_file(shape):
+    """创建一个白色画布的临时文件，供子进程按区域写入"""
+    fd, canvas_file = tempfile.mkstemp(suffix='.canvas')
+    os.close(fd)
+    canvas = np.memmap(canvas_file, dtype=np.uint8, mode='w+', shape=shape)
+    canvas[:] = 255
+    canvas.flush()
+    del canvas
+    return canvas_file
+
+
+def _pipeline_key():
+    """渲染流程（版式、栅格化、标题条、拼接保存）本身的代码摘要"""
+    return [_function_key(func) for func in (ChartReport.tasks, ChartReport.save, _draw_title, _rasterize,
+                                             _paste, _render_panel)]
+
+
+def _save_report(report, digest, canvas):
+    report.save(canvas)
+    with open(report.hash_path, 'w', encoding='utf-8') as f:
+        f.write(digest)
+
+
+def render_reports(reports, workers=WORKERS, force=False):
+    """
+    渲染多张报告图，返回实际重新渲染的报告（数据未变化而跳过的不在其中）
+    所有待渲染面板一次提交到同一个进程池
+    """
+    pending = []
+    for report in reports:
+        digest = report.data_hash()
+        if not force and report.is_current(digest):
+            print(f"⏭️  图表数据未变化，跳过渲染: {report.output_path}")
+            continue
+        pending.append((report, digest))
+    if not pending:
+        return []
+
+    n_tasks = sum(len(report.tasks()) for report, _ in pending)
+    workers = min(workers, n_tasks)
+    if workers <= 1:
+        for report, digest in pending:
+            canvas = np.full(report.canvas_shape, 255, dtype=np.uint8)
+            for draw, draw_args, size, region in report.tasks():
+                _paste(canvas, _rasterize(draw, draw_args, size, report.rc, report.dpi), region)
+            _save_report(report, digest, canvas)
+        return [report for report, _ in pending]
+
+    canvas_files = []
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        # 先全部提交，再按报告顺序收集：主进程保存前一张时，子进程继续渲染后面的面板
+        submitted = []
+        for report, digest in pending:
+            shape = report.canvas_shape
+            canvas_file = _blank_canvas_file(shape)
+            canvas_files.append(canvas_file)
+            jobs = [pool.submit(_render_panel, draw, draw_args, size, report.rc, report.dpi, region,
+                                canvas_file, shape)
+                    for draw, draw_args, size, region in report.tasks()]
+            submitted.append((report, digest, canvas_file, shape, jobs))
+
+        for report, digest, canvas_file, shape, jobs in submitted:
+            for future in jobs:
+                future.result()
+            _save_report(report, digest, np.fromfile(canvas_file, dtype=np.uint8).reshape(shape))
+    finally:
+        pool.shutdown()
+        for canvas_file in canvas_files:
+            os.remove(canvas_file)
+    return [report for report, _ in pending]
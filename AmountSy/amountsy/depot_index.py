@@ -0,0 +1,328 @@
+"""
+depot 文件索引（SQLite 持久化，增量刷新）
+- 记录每个文件的目录、文件名、扩展名、大小、修改时间和所属任务类别（amountsy.quest_paths 的规则，与 scnSceneJson 一致）
+- 刷新时逐目录比较目录 mtime：未变化的目录直接沿用索引，不再 scandir / stat 其中的文件
+  （目录 mtime 只在直接子项增删改名时变化，文件内容原地修改不会触发重扫；
+  需要准确的大小/修改时间时用 refresh(full=True)，未变化目录中的文件逐个重新 stat，有出入的目录重扫；
+  整个 root 完整刷新的时间记录在库中（last_full_refresh），调用方可以只隔一段时间做一次完整刷新）
+- 刷新可按一级子目录分给多个线程并行检查（refresh(workers=...)），数据库写入仍在调用线程
+- scan(concurrency=...)：网络盘上直接遍历时用 AsyncDirWalker 并发列目录，使用索引时作为刷新的线程数
+- replay() 把索引中的文件按 crawl() 相同的接口交给消费者，统计脚本无需区分数据来源
+- ext_histogram() 直接在索引上按扩展名汇总文件数和总字节数，不需要重新遍历目录
+"""
+
+import os
+import sqlite3
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from amountsy.async_walker import AsyncDirWalker
+from amountsy.depot_walker import consumer_extensions, crawl, file_ext
+from amountsy.quest_paths import QuestTaxonomy
+
+# 索引格式版本：表结构或记录内容（例如任务类别规则）变化时加一，旧索引打开时清空重建
+INDEX_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    rel_dir TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime_ns INTEGER
+);
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs(parent);
+CREATE TABLE IF NOT EXISTS files (
+    rel_dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    PRIMARY KEY (rel_dir, name)
+);
+CREATE INDEX IF NOT EXISTS files_ext ON files(ext);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _join(rel_dir, name):
+    return f"{rel_dir}/{name}" if rel_dir else name
+
+
+def _subtree_clause(rel_dir, column='rel_dir'):
+    """rel_dir 子树（含自身）的 WHERE 条件；用范围比较代替 LIKE，避免 '_' 通配问题"""
+    if not rel_dir:
+        return '1', ()
+    # '0' 是 '/' 的下一个字符，[rel_dir + '/', rel_dir + '0') 恰好覆盖所有子目录
+    return f"({column} = ? OR ({column} >= ? AND {column} < ?))", (rel_dir, rel_dir + '/', rel_dir + '0')
+
+
+class IndexedEntry(SimpleNamespace):
+    """索引中的文件记录，提供与 os.DirEntry 相同的 name / path / stat() 用法"""
+
+    def stat(self, follow_symlinks=True):
+        return SimpleNamespace(st_size=self.size, st_mtime_ns=self.mtime_ns)
+
+    def is_dir(self, follow_symlinks=True):
+        return False
+
+
+class DepotIndex:
+    """depot 文件索引，root 为索引覆盖的根目录（通常是 r6\\depot）"""
+
+    def __init__(self, db_path, root):
+        self.root = os.path.abspath(root)
+        db_dir = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+        meta = dict(self.conn.execute("SELECT key, value FROM meta WHERE key IN ('root', 'version')"))
+        if meta.get('root', self.root) != self.root:
+            # 根目录变化后旧索引不可用，清空重建
+            print(f"⚠️  索引根目录由 {meta['root']} 变为 {self.root}，重建索引")
+            self._clear()
+        elif 'root' in meta and meta.get('version') != str(INDEX_VERSION):
+            print(f"⚠️  索引格式版本由 {meta.get('version', 1)} 变为 {INDEX_VERSION}，重建索引")
+            self._clear()
+        self.conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                              [('root', self.root), ('version', str(INDEX_VERSION))])
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def _clear(self):
+        self.conn.execute("DELETE FROM dirs")
+        self.conn.execute("DELETE FROM files")
+        self.conn.execute("DELETE FROM meta WHERE key = 'full_refresh'")
+
+    @property
+    def last_full_refresh(self):
+        """上一次对整个 root 完整刷新（refresh(full=True)）的时间戳（秒），从未完整刷新时为 None"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'full_refresh'").fetchone()
+        return float(row[0]) if row else None
+
+    def _rel(self, base_dir):
+        """绝对路径或 root 内路径 -> 以 '/' 分隔的相对路径（root 本身为 ''）"""
+        if base_dir is None:
+            return ''
+        rel = os.path.relpath(os.path.abspath(base_dir), self.root)
+        if rel == os.curdir:
+            return ''
+        if rel.startswith(os.pardir):
+            raise ValueError(f"{base_dir} 不在索引根目录 {self.root} 下")
+        return rel.replace(os.sep, '/')
+
+    def _abs(self, rel_dir):
+        return os.path.join(self.root, *rel_dir.split('/')) if rel_dir else self.root
+
+    def _drop_dir(self, rel_dir):
+        clause, params = _subtree_clause(rel_dir)
+        self.conn.execute(f"DELETE FROM dirs WHERE {clause}", params)
+        self.conn.execute(f"DELETE FROM files WHERE {clause}", params)
+
+    def _files_unchanged(self, rel_dir, known):
+        """known 中的 (文件名, 大小, mtime_ns) 与磁盘上逐个 stat 的结果一致"""
+        dir_path = self._abs(rel_dir)
+        for name, size, mtime_ns in known:
+            try:
+                st = os.stat(os.path.join(dir_path, name), follow_symlinks=False)
+            except OSError:
+                return False
+            if st.st_size != size or st.st_mtime_ns != mtime_ns:
+                return False
+        return True
+
+    def _walk(self, roots, known_mtime, children, descend=True, known_files=None):
+        """
+        检查 roots 下的目录树，找出需要更新的目录（只读文件系统、不访问数据库，可在线程中并行运行）
+        返回 (重扫目录数, 沿用目录数, 变更列表, 下一层目录)
+        - 变更：('drop', 目录) 或 ('dir', 目录, 父目录, mtime_ns, 文件行, 已删除的子目录)，由 _apply 写入数据库
+        - descend=False 时只检查 roots 本身，子目录放在 下一层目录 中返回（由调用方分发给各线程）
+        - known_files（目录 -> 索引中的 (文件名, 大小, mtime_ns)）不为 None 时，mtime 未变化的目录还要逐个核对文件
+        """
+        scanned = reused = 0
+        changes = []
+        next_dirs = []
+        taxonomy = QuestTaxonomy()  # 每次调用单独一份（可能在多个线程中同时运行）
+        stack = list(reversed(roots))
+        push = stack.extend if descend else next_dirs.extend
+        while stack:
+            rel_dir = stack.pop()
+            try:
+                dir_mtime = os.stat(self._abs(rel_dir)).st_mtime_ns
+            except OSError:
+                changes.append(('drop', rel_dir))
+                continue
+
+            known_children = children.get(rel_dir, ())
+            if known_mtime.get(rel_dir) == dir_mtime and (
+                    known_files is None or self._files_unchanged(rel_dir, known_files.get(rel_dir, ()))):
+                # 目录未变化：沿用索引中的文件，只继续检查子目录
+                reused += 1
+                push(known_children)
+                continue
+
+            scanned += 1
+            rows = []
+            sub_dirs = []
+            try:
+                with os.scandir(self._abs(rel_dir)) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                sub_dirs.append(_join(rel_dir, entry.name))
+                                continue
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        rows.append((rel_dir, entry.name, file_ext(entry.name), st.st_size, st.st_mtime_ns,
+                                     taxonomy.resolve_name(_join(rel_dir, entry.name))))
+            except OSError as e:
+                print(f"⚠️  无法读取目录 {self._abs(rel_dir)}：{e}")
+                continue
+
+            parent = rel_dir.rsplit('/', 1)[0] if '/' in rel_dir else ('' if rel_dir else None)
+            changes.append(('dir', rel_dir, parent, dir_mtime, rows, set(known_children) - set(sub_dirs)))
+            push(reversed(sub_dirs))
+        return scanned, reused, changes, next_dirs
+
+    def _apply(self, changes):
+        for change in changes:
+            if change[0] == 'drop':
+                self._drop_dir(change[1])
+                continue
+            _, rel_dir, parent, dir_mtime, rows, removed = change
+            self.conn.execute("DELETE FROM files WHERE rel_dir = ?", (rel_dir,))
+            self.conn.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)", rows)
+            for gone in removed:
+                self._drop_dir(gone)
+            self.conn.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)", (rel_dir, parent, dir_mtime))
+
+    def refresh(self, base_dir=None, workers=1, full=False):
+        """
+        增量刷新 base_dir 子树（默认整个 root），返回 (重扫目录数, 沿用目录数)
+        workers > 1 时 base_dir 的各个一级子目录分给线程并行检查（stat / scandir 等待磁盘时不占 GIL），
+        数据库只在当前线程写入
+        full=True 时目录 mtime 未变化也逐个 stat 其中的文件，原地修改过的文件所在目录会重扫，
+        索引中的大小和修改时间与磁盘一致（ext_histogram 的字节数等需要准确值时使用）；
+        刷新整个 root 时把开始时间记为 last_full_refresh
+        """
+        started_at = time.time()
+        start = self._rel(base_dir)
+        clause, params = _subtree_clause(start)
+        known_mtime = {}
+        children = defaultdict(list)
+        for rel_dir, parent, mtime_ns in self.conn.execute(
+                f"SELECT rel_dir, parent, mtime_ns FROM dirs WHERE {clause}", params):
+            known_mtime[rel_dir] = mtime_ns
+            children[parent].append(rel_dir)
+        known_files = None
+        if full:
+            known_files = defaultdict(list)
+            for rel_dir, name, size, mtime_ns in self.conn.execute(
+                    f"SELECT rel_dir, name, size, mtime_ns FROM files WHERE {clause}", params):
+                known_files[rel_dir].append((name, size, mtime_ns))
+
+        if workers <= 1:
+            scanned, reused, changes, _ = self._walk([start], known_mtime, children, known_files=known_files)
+            self._apply(changes)
+        else:
+            scanned, reused, changes, top_dirs = self._walk([start], known_mtime, children, descend=False,
+                                                            known_files=known_files)
+            self._apply(changes)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for s, r, changes, _ in pool.map(
+                        lambda d: self._walk([d], known_mtime, children, known_files=known_files), top_dirs):
+                    scanned += s
+                    reused += r
+                    self._apply(changes)
+
+        if full and not start:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('full_refresh', ?)",
+                              (repr(started_at),))
+        self.conn.commit()
+        return scanned, reused
+
+    def _select_files(self, base_dir, extensions, columns):
+        start = self._rel(base_dir)
+        clause, params = _subtree_clause(start)
+        sql = f"SELECT {columns} FROM files WHERE {clause}"
+        if extensions is not None:
+            exts = [e.lower() for e in extensions]
+            sql += f" AND ext IN ({', '.join('?' * len(exts))})"
+            params += tuple(exts)
+        return start, sql, params
+
+    def replay(self, base_dir, consumers):
+        """
+        与 crawl(base_dir, consumers) 等价，但文件来自索引；rel_dir 相对 base_dir
+        回放顺序与 DirWalker 相同（目录按路径分段、文件按名称排序的深度优先顺序）：
+        排序时把 '/' 换成最小的字符，目录的文件排在其子目录之前，子目录排在同名前缀的兄弟目录（如 a-c）之前
+        """
+        by_ext = defaultdict(list)
+        catch_all = []
+        for consumer in consumers:
+            exts = getattr(consumer, 'extensions', None)
+            if exts is None:
+                catch_all.append(consumer)
+            else:
+                for ext in exts:
+                    by_ext[ext.lower()].append(consumer)
+        extensions = None if catch_all else list(by_ext)
+
+        start, sql, params = self._select_files(base_dir, extensions, "rel_dir, name, ext, size, mtime_ns")
+        skip = len(start) + 1 if start else 0
+        for rel_dir, name, ext, size, mtime_ns in self.conn.execute(
+                sql + " ORDER BY replace(rel_dir, '/', char(1)), name", params):
+            sub = rel_dir[skip:]
+            rel_parts = tuple(sub.split('/')) if sub else ()
+            entry = IndexedEntry(name=name, path=os.path.join(self._abs(rel_dir), name),
+                                 size=size, mtime_ns=mtime_ns)
+            for consumer in by_ext.get(ext, ()):
+                consumer.on_file(entry, rel_parts)
+            for consumer in catch_all:
+                consumer.on_file(entry, rel_parts)
+        return consumers
+
+    def ext_histogram(self, base_dir=None, extensions=None):
+        """各扩展名的 (文件数, 总字节数)"""
+        _, sql, params = self._select_files(base_dir, extensions, "ext, COUNT(*), SUM(size)")
+        return {ext: (count, size) for ext, count, size in self.conn.execute(sql + " GROUP BY ext", params)}
+
+    def category_counts(self, base_dir=None, extensions=None):
+        """按任务类别统计各扩展名文件数：{类别: Counter(ext -> 数量)}"""
+        _, sql, params = self._select_files(base_dir, extensions, "category, ext, COUNT(*)")
+        result = defaultdict(Counter)
+        for category, ext, count in self.conn.execute(sql + " GROUP BY category, ext", params):
+            result[category][ext] = count
+        return result
+
+
+def scan(base_dir, consumers, index_file=None, depot_root=None, concurrency=0, full=False):
+    """
+    统计脚本的统一入口：
+    - 未配置 index_file 时直接 crawl 遍历目录；concurrency > 0 时用 AsyncDirWalker 同时列 concurrency 个目录
+      （depot 在 SMB/NFS 等高延迟挂载上时，列目录的往返延迟重叠进行）
+    - 配置了 index_file 时先增量刷新 base_dir 子树（concurrency > 1 时按一级子目录多线程刷新），再从索引回放给消费者；
+      消费者要用文件大小/修改时间时传 full=True（见 DepotIndex.refresh），只按文件名计数时沿用目录 mtime 判断即可
+    """
+    if not index_file:
+        walker = None
+        if concurrency > 0:
+            walker = AsyncDirWalker(extensions=consumer_extensions(consumers), concurrency=concurrency)
+        return crawl(base_dir, consumers, walker)
+    with DepotIndex(index_file, depot_root or base_dir) as index:
+        scanned, reused = index.refresh(base_dir, workers=max(1, concurrency), full=full)
+        print(f"📇 索引刷新完成：重扫 {scanned} 个目录，沿用 {reused} 个目录")
+        return index.replay(base_dir, consumers)
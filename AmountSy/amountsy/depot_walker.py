@@ -0,0 +1,190 @@
+"""
+depot 目录单次遍历工具
+- 用 os.scandir 把目录树只走一遍，每个文件按扩展名分发给所有注册的消费者
+- DirWalker：按目录名模式 / 深度 / 扩展名剪枝的遍历生成器，被排除的目录在进入前就跳过（例如 Versions）
+- 消费者只需实现 on_file(entry, rel_dir)，可选 extensions 属性声明关心的扩展名（None 表示全部）
+- 内置消费者：扩展名计数（ExtensionCounter）、场景文件收集（SceneCollector）、动画文件列表（AnimationLister）
+"""
+
+import fnmatch
+import os
+import re
+from collections import Counter, defaultdict
+
+
+def file_ext(name):
+    """返回小写扩展名（含点号），与 glob/rglob 的 *.ext 匹配口径一致"""
+    return os.path.splitext(name)[1].lower()
+
+
+class DirWalker:
+    """
+    带剪枝规则的目录遍历（生成器，边走边产出，不在内存中保留文件列表）
+    - exclude_dirs：目录名通配模式（fnmatch 语法，不区分大小写），命中的目录整棵子树都不进入
+    - max_depth：最多进入的子目录层数（root 本身为第 0 层，None 表示不限）
+    - extensions：只产出这些扩展名的文件（None 表示全部）
+    - pruned：最近一次 walk 中被剪掉（未进入）的目录路径
+    """
+
+    def __init__(self, exclude_dirs=(), max_depth=None, extensions=None):
+        patterns = [fnmatch.translate(pattern) for pattern in exclude_dirs]
+        # 所有模式合并为一个正则，每个子目录只匹配一次
+        self._excluded = re.compile('|'.join(patterns), re.IGNORECASE).match if patterns else None
+        self.max_depth = max_depth
+        self.extensions = None if extensions is None else frozenset(e.lower() for e in extensions)
+        self.pruned = []
+
+    def _list_dir(self, dir_path, rel_dir):
+        """
+        读完一个目录，返回 (要产出的文件, 要进入的子目录, 剪掉的子目录)；目录无法读取时返回 None
+        先读完当前目录再产出，目录句柄不会在调用方处理文件期间一直打开；文件和子目录按名称排序，
+        产出顺序与文件系统无关（与 DepotIndex.replay、BundleWalker 的顺序一致）
+        """
+        excluded = self._excluded
+        extensions = self.extensions
+        descend = self.max_depth is None or len(rel_dir) < self.max_depth
+        files = []
+        sub_dirs = []
+        pruned = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if descend and (excluded is None or not excluded(entry.name)):
+                                sub_dirs.append((entry.path, rel_dir + (entry.name,)))
+                            else:
+                                pruned.append(entry.path)
+                            continue
+                    except OSError:
+                        continue
+                    if extensions is None or file_ext(entry.name) in extensions:
+                        files.append(entry)
+        except OSError as e:
+            print(f"⚠️  无法读取目录 {dir_path}：{e}")
+            return None
+        files.sort(key=lambda entry: entry.name)
+        sub_dirs.sort(key=lambda sub_dir: sub_dir[1][-1])
+        return files, sub_dirs, pruned
+
+    def walk(self, root):
+        """
+        逐个产出 (entry, rel_dir)，深度优先：先按名称顺序产出当前目录的文件，再按名称顺序深入子目录
+        rel_dir 为文件所在目录相对 root 的路径分段元组（root 本身为 ()）
+        """
+        self.pruned = []
+        stack = [(os.fspath(root), ())]
+        while stack:
+            dir_path, rel_dir = stack.pop()
+            listing = self._list_dir(dir_path, rel_dir)
+            if listing is None:
+                continue
+            files, sub_dirs, pruned = listing
+            self.pruned.extend(pruned)
+            for entry in files:
+                yield entry, rel_dir
+            # 逆序压栈，保证出栈顺序与名称顺序一致
+            stack.extend(reversed(sub_dirs))
+
+
+def consumer_extensions(consumers):
+    """所有消费者关心的扩展名（小写）；有消费全部文件的消费者时返回 None"""
+    extensions = []
+    for consumer in consumers:
+        exts = getattr(consumer, 'extensions', None)
+        if exts is None:
+            return None
+        extensions.extend(ext.lower() for ext in exts)
+    return extensions
+
+
+def crawl(root, consumers, walker=None):
+    """
+    遍历 root 下的整棵目录树（仅一次），把每个文件交给关心它的消费者
+    - 深度优先：先按名称顺序处理当前目录的文件，再按名称顺序深入子目录（与索引回放的顺序相同）
+    - rel_dir 为文件所在目录相对 root 的路径分段元组（root 本身为 ()）
+    - walker 为 DirWalker 时按其规则剪枝（例如不进入 Versions 目录），默认遍历全部
+    - 返回传入的 consumers，便于链式取结果
+    """
+    # 按扩展名预先分组，单个文件只做一次字典查找
+    by_ext = defaultdict(list)
+    catch_all = []
+    for consumer in consumers:
+        exts = getattr(consumer, 'extensions', None)
+        if exts is None:
+            catch_all.append(consumer)
+        else:
+            for ext in exts:
+                by_ext[ext.lower()].append(consumer)
+
+    if walker is None:
+        # 没有消费全部文件的消费者时，扩展名过滤直接在遍历中完成
+        walker = DirWalker(extensions=consumer_extensions(consumers))
+    for entry, rel_dir in walker.walk(root):
+        for consumer in by_ext.get(file_ext(entry.name), ()):
+            consumer.on_file(entry, rel_dir)
+        for consumer in catch_all:
+            consumer.on_file(entry, rel_dir)
+
+    return consumers
+
+
+class ExtensionCounter:
+    """按目录统计各扩展名的文件数量，可汇总任意子树"""
+
+    def __init__(self, extensions=None):
+        self.extensions = None if extensions is None else [e.lower() for e in extensions]
+        self.by_dir = defaultdict(Counter)  # rel_dir -> Counter(ext -> 数量)
+        self._rollup = None
+
+    def on_file(self, entry, rel_dir):
+        self.by_dir[rel_dir][file_ext(entry.name)] += 1
+        self._rollup = None
+
+    def subtree(self, rel_prefix=()):
+        """返回 rel_prefix 子树（含所有子目录）的扩展名计数"""
+        if self._rollup is None:
+            # 一次性把每个目录的计数累加到它的所有祖先，之后每次查询 O(1)
+            rollup = defaultdict(Counter)
+            for rel_dir, counter in self.by_dir.items():
+                for i in range(len(rel_dir) + 1):
+                    rollup[rel_dir[:i]].update(counter)
+            self._rollup = rollup
+        return self._rollup.get(tuple(rel_prefix), Counter())
+
+    def count(self, rel_prefix, ext):
+        """rel_prefix 子树中指定扩展名的文件数"""
+        return self.subtree(rel_prefix)[ext.lower()]
+
+
+class SceneCollector:
+    """收集 .scnlocjson 文件，可按目录名（不区分大小写）排除，例如 Versions"""
+
+    extensions = ['.scnlocjson']
+
+    def __init__(self, exclude_folder=None):
+        self.exclude_folder = exclude_folder.lower() if exclude_folder else None
+        self.files = []
+        self.excluded_count = 0
+
+    def on_file(self, entry, rel_dir):
+        if self.exclude_folder and self.exclude_folder in '/'.join(rel_dir).lower():
+            self.excluded_count += 1
+            return
+        self.files.append(entry.path)
+
+
+class AnimationLister:
+    """列出 .anims 文件（文件名、绝对路径、相对路径）"""
+
+    extensions = ['.anims']
+
+    def __init__(self):
+        self.files = []
+
+    def on_file(self, entry, rel_dir):
+        self.files.append({
+            'filename': entry.name,
+            'absolute_path': entry.path,
+            'relative_path': os.path.join(*rel_dir, entry.name)
+        })
@@ -0,0 +1,226 @@
+"""
+运行耗时统计（各统计脚本共用）
+- RunReport：一次运行的计时报告；report.stage(名称) 为上下文管理器计时器，可嵌套、可重复进入（累计），
+  stage.add(files=..., bytes=..., nodes=...) 记录该阶段处理量，报告中自动换算为每秒处理量
+- 可选（默认关闭）：cProfile 采样整个运行、tracemalloc 记录各阶段 Python 内存分配峰值，
+  通过参数或环境变量 AMOUNTSY_PROFILE=1 / AMOUNTSY_TRACEMALLOC=1 开启
+- NullReport：不计时的占位报告，库函数的 report 参数默认使用它，调用方不必判断是否传入
+- finish() 打印各阶段耗时摘要，并写出 JSON 报告（便于在不同 depot 版本间对比各流程的耗时分布）
+"""
+
+import cProfile
+import datetime
+import json
+import os
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# 报告中列出的 cProfile 热点函数个数
+PROFILE_TOP = 30
+
+
+def _env_flag(name):
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _rates(counters, seconds):
+    """计数 -> 每秒处理量"""
+    if seconds <= 0:
+        return {}
+    return {f"{key}_per_second": round(value / seconds, 3) for key, value in counters.items()}
+
+
+class StageStats:
+    """单个阶段的累计耗时、进入次数、处理量和内存峰值"""
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.calls = 0
+        self.counters = {}
+        self.peak_bytes = None
+
+    def add(self, **counters):
+        """累加处理量（例如 files=1, bytes=大小, nodes=节点数）"""
+        for key, value in counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def to_dict(self):
+        data = {
+            'name': self.name,
+            'seconds': round(self.seconds, 6),
+            'calls': self.calls,
+            'counters': dict(self.counters),
+            'rates': _rates(self.counters, self.seconds),
+        }
+        if self.peak_bytes is not None:
+            data['peak_memory_bytes'] = self.peak_bytes
+        return data
+
+
+class RunReport:
+    """
+    一次运行的计时报告
+        with RunReport('scnSceneJson', report_path) as report:
+            with report.stage('scan') as stage:
+                ...
+                stage.add(files=n)
+    嵌套阶段的名称为 "外层/内层"；退出 with 块时自动 finish()，因异常退出时报告照常写出，meta['error'] 记录异常
+    """
+
+    def __init__(self, name, report_path=None, profile=None, trace_memory=None):
+        self.name = name
+        self.report_path = report_path
+        self.profile = _env_flag('AMOUNTSY_PROFILE') if profile is None else profile
+        self.trace_memory = _env_flag('AMOUNTSY_TRACEMALLOC') if trace_memory is None else trace_memory
+        self.meta = {}  # 额外的运行信息（例如 depot 路径、文件数），原样写入报告
+        self.counters = {}
+        self.stages = {}  # 阶段名 -> StageStats（按首次进入的顺序）
+        self._open = []  # 正在计时的阶段：[(StageStats, 子阶段内存峰值)]
+        self._profiler = None
+        self._tracing = False  # tracemalloc 是否由本报告开启
+        self._started_at = None
+        self._start = None
+        self._finished = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.meta['error'] = f"{exc_type.__name__}: {exc}"
+        self.finish()
+
+    def start(self):
+        self._started_at = datetime.datetime.now()
+        self._start = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        if self.profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def count(self, **counters):
+        """累加整次运行的处理量"""
+        for key, value in counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    @contextmanager
+    def stage(self, name):
+        """阶段计时器：同名阶段多次进入时耗时累加"""
+        if self._open:
+            name = f"{self._open[-1][0].name}/{name}"
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(name)
+        frame = [stats, 0]
+        self._open.append(frame)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds += time.perf_counter() - start
+            stats.calls += 1
+            self._open.pop()
+            if self.trace_memory:
+                # reset_peak 会清掉外层阶段已经达到的峰值，子阶段结束时把峰值交给外层
+                peak = max(tracemalloc.get_traced_memory()[1], frame[1])
+                stats.peak_bytes = max(stats.peak_bytes or 0, peak)
+                if self._open:
+                    self._open[-1][1] = max(self._open[-1][1], peak)
+
+    def _profile_summary(self, profile_file):
+        stats = pstats.Stats(self._profiler)
+        if profile_file:
+            stats.dump_stats(profile_file)
+        top = []
+        for (filename, line, func), (_, nc, tt, ct, _) in sorted(
+                stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP]:
+            top.append({
+                'function': f"{os.path.basename(filename)}:{line}({func})",
+                'calls': nc,
+                'total_seconds': round(tt, 6),
+                'cumulative_seconds': round(ct, 6),
+            })
+        return {'file': profile_file, 'top': top}
+
+    def to_dict(self):
+        wall = (self._finished if self._finished is not None else time.perf_counter()) - self._start
+        data = {
+            'name': self.name,
+            'started_at': self._started_at.isoformat(timespec='seconds'),
+            'wall_seconds': round(wall, 6),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'argv': sys.argv,
+            'meta': self.meta,
+            'counters': dict(self.counters),
+            'rates': _rates(self.counters, wall),
+            'stages': [stats.to_dict() for stats in self.stages.values()],
+        }
+        if self.trace_memory and tracemalloc.is_tracing():
+            data['peak_memory_bytes'] = max(
+                [tracemalloc.get_traced_memory()[1]] + [s.peak_bytes or 0 for s in self.stages.values()])
+        return data
+
+    def finish(self):
+        """结束计时，打印摘要并写出 JSON 报告；返回报告内容"""
+        if self._finished is not None:
+            return None
+        self._finished = time.perf_counter()
+        if self._profiler is not None:
+            self._profiler.disable()
+
+        if self.report_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.report_path)), exist_ok=True)
+        report = self.to_dict()
+        if self._profiler is not None:
+            profile_file = os.path.splitext(self.report_path)[0] + '.prof' if self.report_path else None
+            report['profile'] = self._profile_summary(profile_file)
+        if self._tracing:
+            tracemalloc.stop()
+
+        print("\n" + "=" * 60)
+        print(f"⏱️  {self.name} 耗时统计（总计 {report['wall_seconds']:.2f} 秒）")
+        for stage in report['stages']:
+            rates = "，".join(f"{k.replace('_per_second', '')} {v:,.1f}/秒" for k, v in stage['rates'].items())
+            print(f"   {stage['name']:<30} {stage['seconds']:>9.3f} 秒  {rates}")
+        if self.report_path:
+            with open(self.report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"📄 耗时报告已保存到: {self.report_path}")
+        print("=" * 60)
+        return report
+
+
+class NullReport:
+    """接口与 RunReport 相同但不记录任何内容"""
+
+    def __init__(self):
+        self.meta = {}
+
+    def count(self, **counters):
+        pass
+
+    @contextmanager
+    def stage(self, name):
+        yield StageStats(name)
+
+
+NULL_REPORT = NullReport()
+
+
+def report_path(report_dir, name):
+    """报告文件路径：report_dir/名称_时间戳.json（每次运行一个文件）"""
+    if not report_dir:
+        return None
+    stamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    return os.path.join(report_dir, f"{name}_{stamp}.json")
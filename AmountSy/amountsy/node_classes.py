@@ -0,0 +1,580 @@
+"""
+Quest 节点类名：功能描述与继承层级
+- NODE_CLASS_DESCRIPTION：类名 -> 功能描述（模块级常量，导入时构建一次）
+- NODE_CLASS_HIERARCHY：由显式的父类表（_BASE_PARENTS、_CHILD_CLASSES）得到的父类关系，
+  预先算好每个类名的祖先链、所属管理器和基类，查询都是一次字典查找
+- rollup_class_matrix：阶段 × 节点类名矩阵按管理器 / 基类汇总，只合并已有的非零项，不重新扫描节点
+"""
+
+from amountsy.sparse_counts import Vocabulary
+
+# 节点类名-功能描述映射字典
+NODE_CLASS_DESCRIPTION = {
+    "questNodeDefinition": "所有Quest节点的基类",
+    "questDisableableNodeDefinition": "可禁用的节点基类",
+    "questSignalStoppingNodeDefinition": "可阻断信号传播的节点基类",
+    "questTypedSignalStoppingNodeDefinition": "带类型的信号阻断节点",
+    "questStartEndNodeDefinition": "开始/结束节点基类",
+    "questStartNodeDefinition": "Quest开始节点",
+    "questEndNodeDefinition": "Quest结束节点",
+    "questIONodeDefinition": "输入/输出节点基类",
+    "questInputNodeDefinition": "输入节点",
+    "questOutputNodeDefinition": "输出节点",
+    "questGraphDefinition": "Quest图定义",
+    "questSocketDefinition": "Socket定义",
+    "questCharacterManagerNodeDefinition": "角色管理器主节点",
+    "questCharacterManagerParameters_SetAttitudeGroupForPuppet": "设置AI态度组",
+    "questCharacterManagerParameters_SetGroupsAttitude": "设置组态度",
+    "questCharacterManagerParameters_SetMortality": "设置生死状态",
+    "questCharacterManagerParameters_SetAnimset": "设置动画集",
+    "questCharacterManagerParameters_SetLowGravity": "设置低重力",
+    "questCharacterManagerParameters_EnableBumps": "启用碰撞",
+    "questCharacterManagerParameters_SetStatusEffect": "设置状态效果",
+    "questCharacterManagerParameters_SetReactionPreset": "设置反应预设",
+    "questCharacterManagerParameters_SetGender": "设置性别",
+    "questCharacterManagerParameters_SetAsCrowdObstacle": "设为人群障碍物",
+    "questCharacterManagerParameters_SetProgressionBuild": "设置进度构建",
+    "questCharacterManagerParameters_SetLifePath": "设置人生轨迹",
+    "questCharacterManagerParameters_HealPlayer": "治疗玩家",
+    "questCharacterManagerCombat_ModifyHealth": "修改生命值",
+    "questCharacterManagerCombat_Kill": "杀死角色",
+    "questCharacterManagerCombat_EquipWeapon": "装备武器",
+    "questCharacterManagerCombat_SetWeaponState": "设置武器状态",
+    "questCharacterManagerCombat_SetDeathDirection": "设置死亡方向",
+    "questCharacterManagerCombat_ChangeLevel": "改变等级",
+    "questCharacterManagerCombat_ManageRagdoll": "管理布娃娃系统",
+    "questCharacterManagerCombat_AssignSquad": "分配小队",
+    "questCharacterManagerParameters_SetCombatSpace": "设置战斗空间",
+    "questCharacterManagerVisuals_ChangeEntityAppearance": "改变实体外观",
+    "questCharacterManagerVisuals_PrefetchEntityAppearance": "预加载实体外观",
+    "questCharacterManagerVisuals_GenitalsManager": "生殖器管理",
+    "questCharacterManagerVisuals_BreastSizeController": "胸部大小控制",
+    "questCharacterManagerVisuals_SetBrokenNoseStage": "设置鼻梁破损阶段",
+    "questEntityManagerNodeDefinition": "实体管理器主节点",
+    "questEntityManagerSetAttachment_NodeType": "设置附着",
+    "questEntityManagerSetDestructionState_NodeType": "设置破坏状态",
+    "questEntityManagerManageBinkComponent_NodeType": "管理Bink组件",
+    "questEntityManagerSetMeshAppearance_NodeType": "设置网格外观",
+    "questEntityManagerEnablePlayerTPPRepresentation_NodeType": "启用玩家第三人称表示",
+    "questEntityManagerToggleComponent_NodeType": "切换组件",
+    "questEntityManagerChangeAppearance_NodeType": "改变外观",
+    "questEntityManagerMountPuppet_NodeType": "骑乘Puppet",
+    "questEntityManagerSendAnimationEvent_NodeType": "发送动画事件",
+    "questEntityManagerSetStat_NodeType": "设置属性",
+    "questEntityManagerToggleMirrorsArea_NodeType": "切换镜像区域",
+    "questEntityManagerSetAttachment_ToActor": "附着到角色",
+    "questEntityManagerDestroyCarriedObject": "销毁携带物体",
+    "questEntityManagerSetAttachment_ToNode": "附着到节点",
+    "questEntityManagerSetAttachment_ToWorld": "附着到世界",
+    "questUIManagerNodeDefinition": "UI管理器主节点",
+    "questAddCombatLogMessage_NodeType": "添加战斗日志消息",
+    "questSwitchNameplate_NodeType": "切换名牌",
+    "questAddBraindanceClue_NodeType": "添加脑舞线索",
+    "questDiscoverBraindanceClue_NodeType": "发现脑舞线索",
+    "questDisplayMessageBox_NodeType": "显示消息框",
+    "questProgressBar_NodeType": "进度条",
+    "questProximityProgressBar_NodeType": "接近度进度条",
+    "questShowDialogIndicator_NodeType": "显示对话指示器",
+    "questHUDVideo_NodeType": "HUD视频",
+    "questSetLocationName_NodeType": "设置位置名称",
+    "questWarningMessage_NodeType": "警告消息",
+    "questShowOnscreen_NodeType": "屏幕显示",
+    "questOverrideLoadingScreen_NodeType": "覆盖加载屏幕",
+    "questGlitchLoadingScreen_NodeType": "故障加载屏幕",
+    "questWaitForAnyKeyLoadingScreen_NodeType": "等待任意键加载屏幕",
+    "questSetUIGameContext_NodeType": "设置UI游戏上下文",
+    "questSetHUDEntryForcedVisibility_NodeType": "设置HUD条目强制可见性",
+    "questQuickItemsManager_NodeType": "快速物品管理器",
+    "questVendorPanel_NodeType": "商贩面板",
+    "questOpenBriefing_NodeType": "打开简报",
+    "questEnableBraindanceFinish_NodeType": "启用脑舞完成",
+    "questSwitchToScenario_NodeType": "切换到场景",
+    "questSetBriefingSize_NodeType": "设置简报大小",
+    "questSetBriefingAlignment_NodeType": "设置简报对齐",
+    "questShowNarrativeEvent_NodeType": "显示叙事事件",
+    "questShowCustomTooltip_NodeType": "显示自定义提示",
+    "questTutorial_NodeType": "教程",
+    "questToggleMinimapVisibility_NodeSubType": "切换小地图可见性",
+    "questToggleStealthMappinVisibility_NodeSubType": "切换潜行地图标记可见性",
+    "questShowHighlight_NodeSubType": "显示高亮",
+    "questShowBracket_NodeSubType": "显示括号",
+    "questShowOverlay_NodeSubType": "显示覆盖层",
+    "questShowPopup_NodeSubType": "显示弹出窗口",
+    "questBriefingSequencePlayer_NodeType": "简报序列播放器",
+    "questTriggerIconGeneration_NodeType": "触发图标生成",
+    "questInputHint_NodeType": "输入提示",
+    "questInputHintGroup_NodeType": "输入提示组",
+    "questShowLevelUpNotification_NodeType": "显示升级通知",
+    "questShowCustomQuestNotification_NodeType": "显示自定义任务通知",
+    "questSetMetaQuestProgress_NodeType": "设置元任务进度",
+    "questSetSaveDataLoadingScreen_NodeType": "设置存档数据加载屏幕",
+    "questSetFastTravelBinksGroup_NodeType": "设置快速旅行视频组",
+    "questOpenPhotoMode_NodeType": "打开照片模式",
+    "questShowPointOfNoReturnPrompt_NodeType": "显示不归路提示",
+    "questFinalBoardsVideosFinished_NodeType": "最终板视频完成",
+    "questFinalBoardsEnableSkipCredits_NodeType": "最终板启用跳过制作人员名单",
+    "questFinalBoardsOpenSpeakerScreen_NodeType": "最终板打开扬声器屏幕",
+    "questVehicleNodeDefinition": "车辆管理器主节点",
+    "questAssignCharacter_NodeType": "分配角色",
+    "questRequestVehicleCameraPerspective_NodeType": "请求车辆相机视角",
+    "questMoveOnSpline_NodeType": "在样条上移动",
+    "questToggleCombatForPlayer_NodeType": "切换玩家战斗",
+    "questToggleSwitchSeatsForPlayer_NodeType": "切换玩家座位",
+    "questMoveOnSplineAndKeepDistance_NodeType": "在样条上移动并保持距离",
+    "questMoveOnSplineControlRubberbanding_NodeType": "在样条上移动控制橡皮筋效果",
+    "questStartVehicle_NodeType": "启动车辆",
+    "questStopVehicle_NodeType": "停止车辆",
+    "questFollowObject_NodeType": "跟随物体",
+    "questResetMovement_NodeType": "重置移动",
+    "questSetAutopilot_NodeType": "设置自动驾驶",
+    "questToggleBrokenTire_NodeType": "切换轮胎损坏",
+    "questToggleForceBrake_NodeType": "切换强制制动",
+    "questFlushAutopilot_NodeType": "刷新自动驾驶",
+    "questToggleTankCustomFPPLockOff_NodeType": "切换坦克自定义FPP锁定",
+    "questToggleWeaponEnabled_NodeType": "切换武器启用",
+    "questOverrideSplineSpeed_NodeType": "覆盖样条速度",
+    "questRepair_NodeType": "修理",
+    "questToggleDoor_NodeType": "切换车门",
+    "questSpawnPlayerVehicle_NodeType": "生成玩家车辆",
+    "questTeleport_NodeType": "传送",
+    "questForbiddenTrigger_NodeType": "禁止触发器",
+    "questEnableVehicleSummon_NodeType": "启用车辆召唤",
+    "questEnablePlayerVehicle_NodeType": "启用玩家车辆",
+    "questToggleWindow_NodeType": "切换车窗",
+    "questUnassignAll_NodeType": "取消所有分配",
+    "questForcePhysicsWakeUp_NodeType": "强制物理唤醒",
+    "questSetImmovable_NodeType": "设置不可移动",
+    "questAICommandNodeBase": "AI命令节点基类",
+    "questConfigurableAICommandNode": "可配置AI命令节点",
+    "questSendAICommandNodeDefinition": "发送AI命令",
+    "questCombatNodeDefinition": "战斗节点",
+    "questMovePuppetNodeDefinition": "移动Puppet",
+    "questMiscAICommandNode": "杂项AI命令",
+    "questTeleportPuppetNodeDefinition": "传送Puppet",
+    "questEquipItemNodeDefinition": "装备物品",
+    "questUnequipItemNodeDefinition": "卸下物品",
+    "questUseWorkspotNodeDefinition": "使用工作点",
+    "questRotateToNodeDefinition": "旋转到目标",
+    "questVehicleNodeCommandDefinition": "车辆命令",
+    "questForcedBehaviourNodeDefinition": "强制行为",
+    "questClearForcedBehavioursNodeDefinition": "清除强制行为",
+    "questLookAtDrivenTurnsNode": "注视驱动转向",
+    "questLogicalBaseNodeDefinition": "逻辑节点基类",
+    "questLogicalAndNodeDefinition": "逻辑与节点",
+    "questLogicalXorNodeDefinition": "逻辑异或节点",
+    "questLogicalHubNodeDefinition": "逻辑Hub节点",
+    "questIBaseCondition": "条件基类接口",
+    "questCondition": "条件类",
+    "questTypedCondition": "带类型的条件",
+    "questLogicalCondition": "逻辑条件",
+    "questConditionNodeDefinition": "条件节点",
+    "questPauseConditionNodeDefinition": "暂停条件节点",
+    "questObjectCondition": "对象条件",
+    "questInteraction_ConditionType": "交互条件",
+    "questInventory_ConditionType": "库存条件",
+    "questInspect_ConditionType": "检查条件",
+    "questScan_ConditionType": "扫描条件",
+    "questEntryScanned_ConditionType": "条目扫描条件",
+    "questDevice_ConditionType": "设备条件",
+    "questDestruction_ConditionType": "破坏条件",
+    "questTagged_ConditionType": "标记条件",
+    "questPaymentCondition": "支付条件",
+    "questPaymentBalanced_ConditionType": "平衡支付条件",
+    "questPaymentFixedAmount_ConditionType": "固定金额支付条件",
+    "questStatsCondition": "属性条件",
+    "questStat_ConditionType": "属性条件",
+    "questStreetCredTier_ConditionType": "街头声望等级条件",
+    "questLifePath_ConditionType": "人生轨迹条件",
+    "questBuild_ConditionType": "构建条件",
+    "questCameraFocus_ConditionType": "相机焦点条件",
+    "questVisionMode_ConditionType": "视觉模式条件",
+    "questPlatform_ConditionType": "平台条件",
+    "questInputAction_ConditionType": "输入动作条件",
+    "questInputController_ConditionType": "输入控制器条件",
+    "questPhone_ConditionType": "电话条件",
+    "questPhonePickUp_ConditionType": "电话接听条件",
+    "questPrereq_ConditionType": "前置条件",
+    "questWeather_ConditionType": "天气条件",
+    "questRadio_ConditionType": "电台条件",
+    "questRadioTrack_ConditionType": "电台曲目条件",
+    "questPlaylistTrackChanged_ConditionType": "播放列表曲目变更条件",
+    "questLanguage_ConditionType": "语言条件",
+    "questGOGReward_ConditionType": "GOG奖励条件",
+    "questSaveLock_ConditionType": "存档锁定条件",
+    "questTimeCondition": "时间条件",
+    "questRealtimeDelay_ConditionType": "实时延迟条件",
+    "questGameTimeDelay_ConditionType": "游戏时间延迟条件",
+    "questTimePeriod_ConditionType": "时间段条件",
+    "questEnvironmentManagerNodeDefinition": "环境管理器主节点",
+    "questPlayEnv_NodeType": "播放环境",
+    "questPlayEnv_OverrideGlobalLight": "覆盖全局光照",
+    "questPlayEnv_ForceRelitEnvProbe": "强制重新照明环境探针",
+    "questPlayEnv_SetWeather": "设置天气",
+    "questGameManagerNodeDefinition": "游戏管理器主节点",
+    "questTimeDilation_World": "世界时间膨胀",
+    "questTimeDilation_Player": "玩家时间膨胀",
+    "questTimeDilation_Entity": "实体时间膨胀",
+    "questContentTokenManager_NodeType": "内容令牌管理器",
+    "questGameplayRestrictions_NodeType": "游戏限制",
+    "questSetTimer_NodeType": "设置计时器",
+    "questRumble_NodeType": "震动",
+    "questEventManagerNodeDefinition": "事件管理器节点",
+    "questFXManagerNodeDefinition": "特效管理器主节点",
+    "questPlayFX_NodeType": "播放特效",
+    "questPreloadFX_NodeType": "预加载特效",
+    "questRenderFxManagerNodeDefinition": "渲染特效管理器主节点",
+    "questSetFadeInOut_NodeType": "设置淡入淡出",
+    "questSetDebugView_NodeType": "设置调试视图",
+    "questSetCyberspacePostFX_NodeType": "设置赛博空间后处理",
+    "questSetRenderLayer_NodeType": "设置渲染层",
+    "questItemManagerNodeDefinition": "物品管理器主节点",
+    "questAddRemoveItem_NodeType": "添加/移除物品",
+    "questDropItemFromSlot_NodeType": "从槽位丢弃物品",
+    "questSetItemTags_NodeType": "设置物品标签",
+    "questTransferItem_NodeType": "转移物品",
+    "questUseWeapon_NodeType": "使用武器",
+    "questInjectLoot_NodeType": "注入战利品",
+    "questInteractiveObjectManagerNodeDefinition": "交互对象管理器主节点",
+    "questSetInteractionState_NodeType": "设置交互状态",
+    "questHackingManager_NodeType": "黑客管理器",
+    "questDeviceManager_NodeType": "设备管理器",
+    "questTriggerManagerNodeDefinition": "触发器管理器主节点",
+    "questSetTriggerState_NodeType": "设置触发器状态",
+    "questJournalNodeDefinition": "日志节点主节点",
+    "questJournalEntry_NodeType": "日志条目",
+    "questJournalQuestEntry_NodeType": "任务日志条目",
+    "questJournalTrackQuest_NodeType": "追踪任务",
+    "questPhoneManagerNodeDefinition": "电话管理器主节点",
+    "questAddRemoveContact_NodeType": "添加/移除联系人",
+    "questSetPhoneStatus_NodeType": "设置电话状态",
+    "questCallContact_NodeType": "呼叫联系人",
+    "questSendMessage_NodeType": "发送消息",
+    "questSceneManagerNodeDefinition": "场景管理器主节点",
+    "questSetTier_NodeType": "设置Tier等级",
+    "questPlayerLookAt_NodeType": "玩家注视",
+    "questNPCLookAt_NodeType": "NPC注视",
+    "questSetFOV_NodeType": "设置视野",
+    "questAudioNodeDefinition": "音频节点主节点",
+    "questAudioCharacterManagerNodeDefinition": "角色音频管理器",
+    "questAudioMixNodeType": "音频混合",
+    "questAudioSwitchNodeType": "音频开关",
+    "questBehaviourManagerNodeDefinition": "行为管理器主节点",
+    "questJumpWorkspotAnim_NodeType": "跳转工作点动画",
+    "questStopWorkspot_NodeType": "停止工作点",
+    "questFactsDBManagerNodeDefinition": "事实数据库管理器主节点",
+    "questSetVar_NodeType": "设置变量",
+    "questMapPinManagerNodeDefinition": "地图标记管理器",
+    "questRewardManagerNodeDefinition": "奖励管理器主节点",
+    "questGiveReward_NodeType": "给予奖励",
+    "questSpawnManagerNodeDefinition": "生成管理器主节点",
+    "questTimeManagerNodeDefinition": "时间管理器主节点",
+    "questVisionModesManagerNodeDefinition": "视觉模式管理器主节点",
+    "questVoicesetManagerNodeDefinition": "语音集管理器主节点",
+    "questRecordingNodeDefinition": "录制节点主节点",
+    "questFlowControlNodeDefinition": "流程控制节点",
+    "questSwitchNodeDefinition": "开关节点",
+    "questRandomizerNodeDefinition": "随机器节点",
+    "questCheckpointNodeDefinition": "检查点节点",
+    "questEmbeddedGraphNodeDefinition": "嵌入式图节点",
+    "questPhaseNodeDefinition": "阶段节点",
+    "questDeletionMarkerNodeDefinition": "删除标记节点",
+    "questMultiplayerAIDirectorNodeDefinition": "多人游戏AI导演节点",
+    "questMultiplayerChoiceTokenNodeDefinition": "多人游戏选择令牌节点",
+    "questMultiplayerJunctionDialogNodeDefinition": "多人游戏交汇对话节点",
+    "questMultiplayerTeleportPuppetNodeDefinition": "多人游戏传送Puppet节点",
+    "questBaseObjectNodeDefinition": "基础对象节点",
+    "questCutControlNodeDefinition": "剪辑控制节点",
+    "questMinigameNodeDefinition": "小游戏节点",
+    "questPlaceholderNodeDefinition": "占位符节点",
+    "questPuppeteerNodeDefinition": "操纵者节点",
+    "questPuppetAIManagerNodeDefinition": "Puppet AI管理器节点",
+    "questPopulactionControllerNodeDefinition": "人口控制器节点",
+    "questInstancedCrowdControlNodeDefinition": "实例化人群控制节点",
+    "questTransformAnimatorNodeDefinition": "变换动画器节点",
+    "questTeleportVehicleNodeDefinition": "传送车辆节点",
+    "questWorkspotParamNodeDefinition": "工作点参数节点"
+}
+
+
+# 基类、管理器主节点等分组起点的父类（None 表示根）
+_BASE_PARENTS = {
+    "questNodeDefinition": None,
+    "questDisableableNodeDefinition": "questNodeDefinition",
+    "questSignalStoppingNodeDefinition": "questDisableableNodeDefinition",
+    "questTypedSignalStoppingNodeDefinition": "questSignalStoppingNodeDefinition",
+    "questStartEndNodeDefinition": "questDisableableNodeDefinition",
+    "questIONodeDefinition": "questNodeDefinition",
+    "questGraphDefinition": None,
+    "questSocketDefinition": None,
+    "questCharacterManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questEntityManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questUIManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questVehicleNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questAICommandNodeBase": "questSignalStoppingNodeDefinition",
+    "questLogicalBaseNodeDefinition": "questDisableableNodeDefinition",
+    "questIBaseCondition": None,
+    "questCondition": "questIBaseCondition",
+    "questTypedCondition": "questCondition",
+    "questLogicalCondition": "questCondition",
+    "questConditionNodeDefinition": "questDisableableNodeDefinition",
+    "questObjectCondition": "questTypedCondition",
+    "questPaymentCondition": "questTypedCondition",
+    "questStatsCondition": "questTypedCondition",
+    "questTimeCondition": "questTypedCondition",
+    "questEnvironmentManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questGameManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questEventManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questFXManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questRenderFxManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questItemManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questInteractiveObjectManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questTriggerManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questJournalNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questPhoneManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questSceneManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questAudioNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questBehaviourManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questFactsDBManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questMapPinManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questRewardManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questSpawnManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questTimeManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questVisionModesManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questVoicesetManagerNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+    "questRecordingNodeDefinition": "questTypedSignalStoppingNodeDefinition",
+}
+
+# 子类分组：parent -> 直接子类（显式列出，与描述表中类名的书写顺序无关）
+_CHILD_CLASSES = {
+    "questStartEndNodeDefinition": (
+        "questStartNodeDefinition", "questEndNodeDefinition",
+    ),
+    "questIONodeDefinition": (
+        "questInputNodeDefinition", "questOutputNodeDefinition",
+    ),
+    "questCharacterManagerNodeDefinition": (
+        "questCharacterManagerParameters_SetAttitudeGroupForPuppet",
+        "questCharacterManagerParameters_SetGroupsAttitude", "questCharacterManagerParameters_SetMortality",
+        "questCharacterManagerParameters_SetAnimset", "questCharacterManagerParameters_SetLowGravity",
+        "questCharacterManagerParameters_EnableBumps", "questCharacterManagerParameters_SetStatusEffect",
+        "questCharacterManagerParameters_SetReactionPreset", "questCharacterManagerParameters_SetGender",
+        "questCharacterManagerParameters_SetAsCrowdObstacle", "questCharacterManagerParameters_SetProgressionBuild",
+        "questCharacterManagerParameters_SetLifePath", "questCharacterManagerParameters_HealPlayer",
+        "questCharacterManagerCombat_ModifyHealth", "questCharacterManagerCombat_Kill",
+        "questCharacterManagerCombat_EquipWeapon", "questCharacterManagerCombat_SetWeaponState",
+        "questCharacterManagerCombat_SetDeathDirection", "questCharacterManagerCombat_ChangeLevel",
+        "questCharacterManagerCombat_ManageRagdoll", "questCharacterManagerCombat_AssignSquad",
+        "questCharacterManagerParameters_SetCombatSpace", "questCharacterManagerVisuals_ChangeEntityAppearance",
+        "questCharacterManagerVisuals_PrefetchEntityAppearance", "questCharacterManagerVisuals_GenitalsManager",
+        "questCharacterManagerVisuals_BreastSizeController", "questCharacterManagerVisuals_SetBrokenNoseStage",
+    ),
+    "questEntityManagerNodeDefinition": (
+        "questEntityManagerSetAttachment_NodeType", "questEntityManagerSetDestructionState_NodeType",
+        "questEntityManagerManageBinkComponent_NodeType", "questEntityManagerSetMeshAppearance_NodeType",
+        "questEntityManagerEnablePlayerTPPRepresentation_NodeType", "questEntityManagerToggleComponent_NodeType",
+        "questEntityManagerChangeAppearance_NodeType", "questEntityManagerMountPuppet_NodeType",
+        "questEntityManagerSendAnimationEvent_NodeType", "questEntityManagerSetStat_NodeType",
+        "questEntityManagerToggleMirrorsArea_NodeType", "questEntityManagerSetAttachment_ToActor",
+        "questEntityManagerDestroyCarriedObject", "questEntityManagerSetAttachment_ToNode",
+        "questEntityManagerSetAttachment_ToWorld",
+    ),
+    "questUIManagerNodeDefinition": (
+        "questAddCombatLogMessage_NodeType", "questSwitchNameplate_NodeType", "questAddBraindanceClue_NodeType",
+        "questDiscoverBraindanceClue_NodeType", "questDisplayMessageBox_NodeType", "questProgressBar_NodeType",
+        "questProximityProgressBar_NodeType", "questShowDialogIndicator_NodeType", "questHUDVideo_NodeType",
+        "questSetLocationName_NodeType", "questWarningMessage_NodeType", "questShowOnscreen_NodeType",
+        "questOverrideLoadingScreen_NodeType", "questGlitchLoadingScreen_NodeType",
+        "questWaitForAnyKeyLoadingScreen_NodeType", "questSetUIGameContext_NodeType",
+        "questSetHUDEntryForcedVisibility_NodeType", "questQuickItemsManager_NodeType", "questVendorPanel_NodeType",
+        "questOpenBriefing_NodeType", "questEnableBraindanceFinish_NodeType", "questSwitchToScenario_NodeType",
+        "questSetBriefingSize_NodeType", "questSetBriefingAlignment_NodeType", "questShowNarrativeEvent_NodeType",
+        "questShowCustomTooltip_NodeType", "questTutorial_NodeType", "questToggleMinimapVisibility_NodeSubType",
+        "questToggleStealthMappinVisibility_NodeSubType", "questShowHighlight_NodeSubType",
+        "questShowBracket_NodeSubType", "questShowOverlay_NodeSubType", "questShowPopup_NodeSubType",
+        "questBriefingSequencePlayer_NodeType", "questTriggerIconGeneration_NodeType", "questInputHint_NodeType",
+        "questInputHintGroup_NodeType", "questShowLevelUpNotification_NodeType",
+        "questShowCustomQuestNotification_NodeType", "questSetMetaQuestProgress_NodeType",
+        "questSetSaveDataLoadingScreen_NodeType", "questSetFastTravelBinksGroup_NodeType",
+        "questOpenPhotoMode_NodeType", "questShowPointOfNoReturnPrompt_NodeType",
+        "questFinalBoardsVideosFinished_NodeType", "questFinalBoardsEnableSkipCredits_NodeType",
+        "questFinalBoardsOpenSpeakerScreen_NodeType",
+    ),
+    "questVehicleNodeDefinition": (
+        "questAssignCharacter_NodeType", "questRequestVehicleCameraPerspective_NodeType",
+        "questMoveOnSpline_NodeType", "questToggleCombatForPlayer_NodeType",
+        "questToggleSwitchSeatsForPlayer_NodeType", "questMoveOnSplineAndKeepDistance_NodeType",
+        "questMoveOnSplineControlRubberbanding_NodeType", "questStartVehicle_NodeType", "questStopVehicle_NodeType",
+        "questFollowObject_NodeType", "questResetMovement_NodeType", "questSetAutopilot_NodeType",
+        "questToggleBrokenTire_NodeType", "questToggleForceBrake_NodeType", "questFlushAutopilot_NodeType",
+        "questToggleTankCustomFPPLockOff_NodeType", "questToggleWeaponEnabled_NodeType",
+        "questOverrideSplineSpeed_NodeType", "questRepair_NodeType", "questToggleDoor_NodeType",
+        "questSpawnPlayerVehicle_NodeType", "questTeleport_NodeType", "questForbiddenTrigger_NodeType",
+        "questEnableVehicleSummon_NodeType", "questEnablePlayerVehicle_NodeType", "questToggleWindow_NodeType",
+        "questUnassignAll_NodeType", "questForcePhysicsWakeUp_NodeType", "questSetImmovable_NodeType",
+    ),
+    "questAICommandNodeBase": (
+        "questConfigurableAICommandNode", "questSendAICommandNodeDefinition", "questCombatNodeDefinition",
+        "questMovePuppetNodeDefinition", "questMiscAICommandNode", "questTeleportPuppetNodeDefinition",
+        "questEquipItemNodeDefinition", "questUnequipItemNodeDefinition", "questUseWorkspotNodeDefinition",
+        "questRotateToNodeDefinition", "questVehicleNodeCommandDefinition", "questForcedBehaviourNodeDefinition",
+        "questClearForcedBehavioursNodeDefinition", "questLookAtDrivenTurnsNode",
+    ),
+    "questLogicalBaseNodeDefinition": (
+        "questLogicalAndNodeDefinition", "questLogicalXorNodeDefinition", "questLogicalHubNodeDefinition",
+    ),
+    "questConditionNodeDefinition": (
+        "questPauseConditionNodeDefinition",
+    ),
+    "questObjectCondition": (
+        "questInteraction_ConditionType", "questInventory_ConditionType", "questInspect_ConditionType",
+        "questScan_ConditionType", "questEntryScanned_ConditionType", "questDevice_ConditionType",
+        "questDestruction_ConditionType", "questTagged_ConditionType",
+    ),
+    "questPaymentCondition": (
+        "questPaymentBalanced_ConditionType", "questPaymentFixedAmount_ConditionType",
+    ),
+    "questStatsCondition": (
+        "questStat_ConditionType", "questStreetCredTier_ConditionType", "questLifePath_ConditionType",
+        "questBuild_ConditionType",
+    ),
+    # 其余系统条件没有单独的分组类，直接归到带类型的条件
+    "questTypedCondition": (
+        "questCameraFocus_ConditionType", "questVisionMode_ConditionType", "questPlatform_ConditionType",
+        "questInputAction_ConditionType", "questInputController_ConditionType", "questPhone_ConditionType",
+        "questPhonePickUp_ConditionType", "questPrereq_ConditionType", "questWeather_ConditionType",
+        "questRadio_ConditionType", "questRadioTrack_ConditionType", "questPlaylistTrackChanged_ConditionType",
+        "questLanguage_ConditionType", "questGOGReward_ConditionType", "questSaveLock_ConditionType",
+    ),
+    "questTimeCondition": (
+        "questRealtimeDelay_ConditionType", "questGameTimeDelay_ConditionType", "questTimePeriod_ConditionType",
+    ),
+    "questEnvironmentManagerNodeDefinition": (
+        "questPlayEnv_NodeType", "questPlayEnv_OverrideGlobalLight", "questPlayEnv_ForceRelitEnvProbe",
+        "questPlayEnv_SetWeather",
+    ),
+    "questGameManagerNodeDefinition": (
+        "questTimeDilation_World", "questTimeDilation_Player", "questTimeDilation_Entity",
+        "questContentTokenManager_NodeType", "questGameplayRestrictions_NodeType", "questSetTimer_NodeType",
+        "questRumble_NodeType",
+    ),
+    "questFXManagerNodeDefinition": (
+        "questPlayFX_NodeType", "questPreloadFX_NodeType",
+    ),
+    "questRenderFxManagerNodeDefinition": (
+        "questSetFadeInOut_NodeType", "questSetDebugView_NodeType", "questSetCyberspacePostFX_NodeType",
+        "questSetRenderLayer_NodeType",
+    ),
+    "questItemManagerNodeDefinition": (
+        "questAddRemoveItem_NodeType", "questDropItemFromSlot_NodeType", "questSetItemTags_NodeType",
+        "questTransferItem_NodeType", "questUseWeapon_NodeType", "questInjectLoot_NodeType",
+    ),
+    "questInteractiveObjectManagerNodeDefinition": (
+        "questSetInteractionState_NodeType", "questHackingManager_NodeType", "questDeviceManager_NodeType",
+    ),
+    "questTriggerManagerNodeDefinition": (
+        "questSetTriggerState_NodeType",
+    ),
+    "questJournalNodeDefinition": (
+        "questJournalEntry_NodeType", "questJournalQuestEntry_NodeType", "questJournalTrackQuest_NodeType",
+    ),
+    "questPhoneManagerNodeDefinition": (
+        "questAddRemoveContact_NodeType", "questSetPhoneStatus_NodeType", "questCallContact_NodeType",
+        "questSendMessage_NodeType",
+    ),
+    "questSceneManagerNodeDefinition": (
+        "questSetTier_NodeType", "questPlayerLookAt_NodeType", "questNPCLookAt_NodeType", "questSetFOV_NodeType",
+    ),
+    "questAudioNodeDefinition": (
+        "questAudioCharacterManagerNodeDefinition", "questAudioMixNodeType", "questAudioSwitchNodeType",
+    ),
+    "questBehaviourManagerNodeDefinition": (
+        "questJumpWorkspotAnim_NodeType", "questStopWorkspot_NodeType",
+    ),
+    "questFactsDBManagerNodeDefinition": (
+        "questSetVar_NodeType",
+    ),
+    "questRewardManagerNodeDefinition": (
+        "questGiveReward_NodeType",
+    ),
+}
+
+# 只起继承作用的抽象基类：按管理器汇总时跳过，取祖先链上第一个不在这里的类
+ABSTRACT_NODE_CLASSES = frozenset((
+    "questNodeDefinition",
+    "questDisableableNodeDefinition",
+    "questSignalStoppingNodeDefinition",
+    "questTypedSignalStoppingNodeDefinition",
+    "questIBaseCondition",
+))
+
+# 汇总粒度：class（原类名）、manager（管理器主节点 / 条件类等功能分组）、base（继承链的根）
+ROLLUP_LEVELS = ("class", "manager", "base")
+
+
+def _node_class_parents():
+    """类名 -> 父类；描述表中其余 *NodeDefinition 归到 questNodeDefinition，非节点类为根"""
+    parents = dict(_BASE_PARENTS)
+    for parent, children in _CHILD_CLASSES.items():
+        for name in children:
+            parents.setdefault(name, parent)
+    for name in NODE_CLASS_DESCRIPTION:
+        if name not in parents:
+            parents[name] = "questNodeDefinition" if name.endswith("NodeDefinition") else None
+    return parents
+
+
+class NodeClassHierarchy:
+    """
+    节点类名继承层级（parents 为 类名 -> 父类）
+    祖先链、管理器、基类在构造时一次算好；不在层级中的类名（描述表未收录）自成一类
+    """
+
+    def __init__(self, parents):
+        self.parents = parents
+        self._ancestors = {}
+        self._rollup = {level: {} for level in ROLLUP_LEVELS}
+        for name in parents:
+            chain = []
+            parent = parents[name]
+            while parent is not None:
+                chain.append(parent)
+                parent = parents.get(parent)
+            chain = tuple(chain)
+            self._ancestors[name] = chain
+            lineage = (name,) + chain  # 自身 -> 根
+            self._rollup["class"][name] = name
+            self._rollup["base"][name] = lineage[-1]
+            self._rollup["manager"][name] = next(
+                (c for c in reversed(lineage) if c not in ABSTRACT_NODE_CLASSES), name)
+
+    def __contains__(self, name):
+        return name in self.parents
+
+    def parent(self, name):
+        return self.parents.get(name)
+
+    def ancestors(self, name):
+        """祖先链（父类在前、根在最后），未收录的类名返回空元组"""
+        return self._ancestors.get(name, ())
+
+    def is_a(self, name, ancestor):
+        return name == ancestor or ancestor in self._ancestors.get(name, ())
+
+    def rollup(self, name, level="manager"):
+        """类名在指定粒度下的汇总类名"""
+        if level not in self._rollup:
+            raise ValueError(f"不支持的汇总粒度：{level}（可选：{', '.join(ROLLUP_LEVELS)}）")
+        return self._rollup[level].get(name, name)
+
+
+NODE_CLASS_HIERARCHY = NodeClassHierarchy(_node_class_parents())
+
+
+def rollup_class_matrix(matrix, level="manager", hierarchy=NODE_CLASS_HIERARCHY):
+    """
+    阶段 × 节点类名矩阵按 level 汇总列，返回共用行编号的新矩阵
+    新列按汇总类名首次出现的顺序编号
+    """
+    groups = Vocabulary()
+    col_map = [groups.id(hierarchy.rollup(name, level)) for name in matrix.cols.keys]
+    return matrix.map_cols(col_map, groups)
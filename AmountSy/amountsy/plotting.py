@@ -0,0 +1,76 @@
+"""
+图表公共配置（各统计脚本共用）
+- pyplot(rc)：首次调用时才导入 matplotlib，并固定使用 Agg 后端（只保存图片，不弹窗、不依赖图形界面），
+  只输出 CSV 的运行完全不导入 matplotlib；样式写入全局 rcParams，只适合只画一张图的独立脚本
+- rc_context(rc)：with 块内临时应用样式，退出时恢复 rcParams；共用渲染流程（amountsy.chart_render）使用，
+  同一进程中先后渲染的多张报告样式互不影响
+- chinese_font()：按 Windows 黑体 / macOS 苹方的顺序取第一个存在的字体文件（都没有时退回 DejaVu），
+  解析结果缓存，同一进程内只查找一次
+- matplotlib_installed()：不导入 matplotlib，只检查是否已安装（脚本启动时的依赖检查用）
+"""
+
+import importlib.util
+import os
+from contextlib import contextmanager
+from functools import lru_cache
+
+# 批量出图使用的后端（非交互式，savefig 只写文件）
+BACKEND = 'Agg'
+
+# 中文字体候选（按顺序取第一个存在的文件）
+FONT_CANDIDATES = (
+    'C:/Windows/Fonts/simhei.ttf',  # Windows 黑体
+    '/System/Library/Fonts/PingFang.ttc',  # macOS 苹方
+)
+# 没有中文字体时使用的字体（Linux）
+FALLBACK_FONT = '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'
+
+# 各脚本共同的基础样式，脚本传入的 rc 覆盖这里的同名项
+BASE_RC = {
+    'font.size': 10,
+    'axes.unicode_minus': False,  # 解决负号显示问题
+    'savefig.dpi': 300,
+}
+
+
+def matplotlib_installed():
+    return importlib.util.find_spec('matplotlib') is not None
+
+
+@lru_cache(maxsize=None)
+def _pyplot():
+    import matplotlib
+    matplotlib.use(BACKEND, force=True)
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def pyplot(rc=None):
+    """返回 matplotlib.pyplot（Agg 后端），并应用 BASE_RC 和 rc 中的样式"""
+    plt = _pyplot()
+    plt.rcParams.update(BASE_RC)
+    if rc:
+        plt.rcParams.update(rc)
+    return plt
+
+
+@contextmanager
+def rc_context(rc=None):
+    """with 块内临时应用 BASE_RC 和 rc 中的样式，返回 matplotlib.pyplot（Agg 后端）；退出时恢复原来的 rcParams"""
+    plt = _pyplot()
+    with plt.rc_context({**BASE_RC, **(rc or {})}):
+        yield plt
+
+
+@lru_cache(maxsize=None)
+def chinese_font(candidates=FONT_CANDIDATES):
+    """中文字体的 FontProperties；候选字体都不存在时用 FALLBACK_FONT，再不存在用 matplotlib 默认字体"""
+    _pyplot()
+    from matplotlib import font_manager
+    for fname in candidates:
+        if os.path.exists(fname):
+            return font_manager.FontProperties(fname=fname)
+    print("警告：未找到中文字体，将使用英文显示")
+    if os.path.exists(FALLBACK_FONT):
+        return font_manager.FontProperties(fname=FALLBACK_FONT)
+    return font_manager.FontProperties()
@@ -0,0 +1,180 @@
+"""
+文件预读流水线（depot 在慢速/网络存储上时，让磁盘等待和 JSON 解析重叠进行，而不是串行相加）
+- ReadAhead：读取线程按输入顺序预先读入后面文件的原始字节，消费方按输入顺序逐个取用；
+  预读有上限（最多领先 depth 个文件、缓冲字节数不超过 memory_budget），消费方跟不上时读取线程等待（背压）
+- 超过 max_file_size 的文件不预读（字节为 None），由解析方自行流式读取
+- map_prefetched：在预读结果上执行解析函数，workers > 1 时分批交给进程池，结果顺序与输入一致；
+  已交给进程池、尚未解析完的批次字节仍计入 memory_budget
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+READ_WORKERS = 4  # 读取线程数（读取时释放 GIL，线程足够；慢速存储可适当调大）
+READ_AHEAD_DEPTH = 64  # 最多领先消费方的文件数
+READ_AHEAD_BYTES = 256 * 1024 * 1024  # 已读入、尚未用完的字节数上限（约数：正在读的文件不计入）
+
+
+class _Pipeline:
+    """一次 read() 的共享状态：读取线程和消费方通过同一个条件变量同步"""
+
+    def __init__(self, paths):
+        self.paths = paths
+        self.cond = threading.Condition()
+        self.next_read = 0  # 下一个待领取的文件序号
+        self.next_yield = 0  # 消费方下一个要取的文件序号
+        self.buffered = 0  # 已读入、尚未取用（hold 时为尚未 release）的字节数
+        self.done = {}  # 序号 -> (原始字节, 异常)
+        self.closed = False
+
+
+class ReadAhead:
+    """
+    按输入顺序预读文件
+        reader = ReadAhead(workers=8, depth=32)
+        for path, raw, error in reader.read(paths):
+            ...
+    error 为读取时的 OSError（此时 raw 为 None）；read() 结束后 stall_seconds 为消费方等待读取的总时间，
+    peak_bytes 为缓冲字节数峰值，可据此调整 workers / depth / memory_budget
+    """
+
+    def __init__(self, workers=READ_WORKERS, depth=READ_AHEAD_DEPTH, memory_budget=READ_AHEAD_BYTES,
+                 max_file_size=None):
+        self.workers = max(1, workers)
+        self.depth = max(1, depth)
+        self.memory_budget = memory_budget
+        self.max_file_size = max_file_size
+        self.stall_seconds = 0.0
+        self.peak_bytes = 0
+        self._state = None
+
+    def _may_read(self, state, index):
+        """消费方正等着的文件总是可以读，其余文件受领先数和缓冲字节数限制"""
+        if index == state.next_yield:
+            return True
+        return index < state.next_yield + self.depth and state.buffered < self.memory_budget
+
+    def _read_file(self, path):
+        try:
+            if self.max_file_size is not None and os.path.getsize(path) > self.max_file_size:
+                return None, None
+            with open(path, 'rb') as f:
+                return f.read(), None
+        except OSError as e:
+            return None, e
+
+    def _reader(self, state):
+        cond = state.cond
+        while True:
+            with cond:
+                if state.closed or state.next_read >= len(state.paths):
+                    return
+                index = state.next_read
+                state.next_read += 1
+                while not state.closed and not self._may_read(state, index):
+                    cond.wait()
+                if state.closed:
+                    return
+            raw, error = self._read_file(state.paths[index])
+            with cond:
+                state.done[index] = (raw, error)
+                if raw is not None:
+                    state.buffered += len(raw)
+                    self.peak_bytes = max(self.peak_bytes, state.buffered)
+                cond.notify_all()
+
+    @property
+    def buffered_bytes(self):
+        """当前计入缓冲的字节数"""
+        return self._state.buffered if self._state is not None else 0
+
+    def release(self, nbytes):
+        """read(hold=True) 时归还已用完的字节数，读取线程可以继续预读"""
+        state = self._state
+        with state.cond:
+            state.buffered -= nbytes
+            state.cond.notify_all()
+
+    def read(self, paths, hold=False):
+        """
+        按 paths 的顺序产出 (路径, 原始字节, 异常)；提前结束迭代时读取线程随即退出
+        hold=True 时产出的字节仍计入缓冲，直到调用方用完后 release(len(原始字节))（数据交给其他进程解析时使用）
+        """
+        state = _Pipeline(list(paths))
+        self._state = state
+        self.stall_seconds = 0.0
+        self.peak_bytes = 0
+        if not state.paths:
+            return
+        threads = [threading.Thread(target=self._reader, args=(state,), daemon=True)
+                   for _ in range(min(self.workers, len(state.paths)))]
+        for thread in threads:
+            thread.start()
+        cond = state.cond
+        try:
+            for index, path in enumerate(state.paths):
+                with cond:
+                    if index not in state.done:
+                        start = time.perf_counter()
+                        while index not in state.done:
+                            cond.wait()
+                        self.stall_seconds += time.perf_counter() - start
+                    raw, error = state.done.pop(index)
+                    if raw is not None and not hold:
+                        state.buffered -= len(raw)
+                    state.next_yield = index + 1
+                    cond.notify_all()
+                yield path, raw, error
+        finally:
+            with cond:
+                state.closed = True
+                cond.notify_all()
+            for thread in threads:
+                thread.join()
+
+
+def _parse_batch(parse, batch):
+    return [parse(*item) for item in batch]
+
+
+def map_prefetched(parse, paths, reader, workers=1, chunksize=16):
+    """
+    对 reader 预读的每个文件执行 parse(路径, 原始字节, 异常)，按输入顺序产出结果
+    - workers <= 1：在当前线程解析，读取线程同时预读后面的文件
+    - workers > 1：每 chunksize 个文件一批交给进程池（parse 须为模块级函数），
+      最多 2 * workers 批在处理中，超出时不再从 reader 取数据，预读随之停下；
+      每批的字节在该批解析完成前一直计入 reader 的 memory_budget，超出预算时先等最早的批次完成再取新数据
+    """
+    if workers <= 1:
+        for item in reader.read(paths):
+            yield parse(*item)
+        return
+
+    items = reader.read(paths, hold=True)
+
+    def submit(batch):
+        nbytes = sum(len(raw) for _, raw, _ in batch if raw is not None)
+        future = executor.submit(_parse_batch, parse, batch)
+        future.add_done_callback(lambda _: reader.release(nbytes))
+        return future
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        batch = []
+        for item in items:
+            batch.append(item)
+            while pending and reader.buffered_bytes >= reader.memory_budget:
+                yield from pending.popleft().result()
+            if len(batch) < chunksize:
+                continue
+            pending.append(submit(batch))
+            batch = []
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        if batch:
+            pending.append(submit(batch))
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,161 @@
+"""
+任务路径分类
+- PrefixClassifier：前缀列表一次性编译成按字典树展开的锚定正则，一次 match 即返回命中的标签，
+  各前缀的公共部分只比较一次，耗时与路径长度有关、与前缀个数无关
+- QUEST_PHASE_CLASSIFIER：questphase 阶段路径 -> main / side / minor（JsonData 的指定路径过滤）
+- quest_path_category：场景文件路径 -> 任务类别（scnSceneJson.get_quest_category 的规则），/ 和 \\ 都视为分隔符
+- QuestTaxonomy：同一套规则，结果按父目录缓存并编码为连续的类别 ID，
+  同一目录下的文件只在第一次时计算类别，之后每个文件只需一次字典查找
+"""
+
+import os
+import re
+
+# 任务目录 -> 任务类型
+QUEST_TYPES = {
+    'main_quests': 'main',
+    'side_quests': 'side',
+    'minor_quests': 'minor',
+}
+
+
+def _trie_pattern(node):
+    """字典树 -> 正则；前缀在某个节点结束时放一个空命名组作为标记，子分支排在前面保证最长前缀优先"""
+    alternatives = [re.escape(ch) + _trie_pattern(child) for ch, child in node.items() if ch is not None]
+    if None in node:
+        alternatives.append(f'(?P<p{node[None]}>)')
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return '(?:' + '|'.join(alternatives) + ')'
+
+
+class PrefixClassifier:
+    """按前缀给路径分类：prefixes 为 {前缀: 标签}，多个前缀命中时取最长的"""
+
+    def __init__(self, prefixes):
+        self.labels = []
+        trie = {}
+        for prefix, label in prefixes.items():
+            node = trie
+            for ch in prefix:
+                node = node.setdefault(ch, {})
+            node[None] = len(self.labels)
+            self.labels.append(label)
+        self._match = re.compile(_trie_pattern(trie)).match if trie else None
+
+    def classify(self, path):
+        """返回命中前缀的标签，没有命中返回 None"""
+        if self._match is None:
+            return None
+        m = self._match(path)
+        return self.labels[int(m.lastgroup[1:])] if m else None
+
+
+# questphase 阶段路径（depot 相对路径，反斜杠分隔）
+QUEST_PHASE_CLASSIFIER = PrefixClassifier({
+    r"base\quest\main_quests": 'main',
+    r"base\quest\side_quests": 'side',
+    r"base\quest\minor_quests": 'minor',
+})
+
+UNKNOWN_CATEGORY = 'unknown'
+QUEST_CATEGORY_DEPTH = 3  # 任务类别最多由 quest 目录之后的前三段路径决定
+
+# 路径分隔符（兼容 / 和 \，与运行平台无关）
+_SEPARATORS = re.compile(r'[\\/]')
+
+
+def _split_path(path):
+    """路径 -> 非空的路径分段列表（正斜杠和反斜杠都视为分隔符）"""
+    return [part for part in _SEPARATORS.split(os.fspath(path)) if part]
+
+
+def _quest_segments(parts):
+    """第一个 quest 目录之后的最多 QUEST_CATEGORY_DEPTH 段；路径中没有 quest 目录时返回 None"""
+    try:
+        quest_idx = parts.index('quest')
+    except ValueError:
+        return None
+    return parts[quest_idx + 1:quest_idx + 1 + QUEST_CATEGORY_DEPTH]
+
+
+def _category_of(segments):
+    """
+    任务类别规则（唯一实现，quest_path_category 和 QuestTaxonomy 共用）：segments 为 quest 之后的最多三段
+    - main_quests：按 qxxx 级别统计（如 main_quests/part1/q105），第三段不是 qxxx 的归为 unknown
+    - side_quests/minor_quests 等：保持原层级（如 side_quests/sq027），遇到 scenes 目录或文件（含后缀）停止，最多两层
+    """
+    if segments is None or not segments:
+        return UNKNOWN_CATEGORY
+    level1 = segments[0]
+    if level1 == 'main_quests':
+        if len(segments) == 3:
+            return '/'.join(segments) if segments[2].startswith('q') else UNKNOWN_CATEGORY
+        return '/'.join(segments) if len(segments) == 2 else UNKNOWN_CATEGORY
+
+    task_parts = []
+    for part in segments[:2]:
+        if part == 'scenes' or '.' in part:
+            break
+        task_parts.append(part)
+    return '/'.join(task_parts) if task_parts else level1
+
+
+def quest_path_category(file_path):
+    """
+    根据文件路径确定quest类别（规则见 _category_of）
+    - main_quests：按 qxxx 级别统计（如 main_quests/part1/q105）
+    - side_quests/minor_quests：保持原层级（如 side_quests/sq027，过滤scenes目录）
+    - 不在 quest 目录下返回 'unknown'
+    """
+    return _category_of(_quest_segments(_split_path(file_path)))
+
+
+class QuestTaxonomy:
+    """
+    任务分类解析器：文件路径 -> 类别 ID（从 0 开始按首次出现顺序编号，category(id) 取回类别名）
+    规则与 quest_path_category 相同（同一个 _category_of），结果按父目录缓存：
+    父目录已包含 quest 之后的三段（或不在 quest 目录下）时类别与文件名无关，同一目录下的文件只切分一次路径；
+    目录层数不足时类别可能取到文件名，逐个文件计算
+    """
+
+    def __init__(self):
+        self.categories = []  # 类别 ID -> 类别名
+        self._ids = {}  # 类别名 -> 类别 ID
+        self._by_dir = {}  # 父目录 -> 类别 ID（None 表示与文件名有关）
+
+    def __len__(self):
+        return len(self.categories)
+
+    def _intern(self, category):
+        idx = self._ids.get(category)
+        if idx is None:
+            idx = self._ids[category] = len(self.categories)
+            self.categories.append(category)
+        return idx
+
+    def resolve(self, file_path):
+        """文件路径 -> 类别 ID"""
+        file_path = os.fspath(file_path)
+        # 父目录取到最后一个分隔符（/ 或 \\）为止，不依赖 os.path.dirname 的平台规则
+        dir_path = file_path[:max(file_path.rfind('/'), file_path.rfind('\\'), 0)]
+        try:
+            idx = self._by_dir[dir_path]
+        except KeyError:
+            segments = _quest_segments(_split_path(dir_path))
+            if segments is None or len(segments) == QUEST_CATEGORY_DEPTH:
+                idx = self._intern(_category_of(segments))
+            else:
+                idx = None
+            self._by_dir[dir_path] = idx
+        if idx is None:
+            return self._intern(quest_path_category(file_path))
+        return idx
+
+    def category(self, category_id):
+        """类别 ID -> 类别名"""
+        return self.categories[category_id]
+
+    def resolve_name(self, file_path):
+        """文件路径 -> 类别名"""
+        return self.categories[self.resolve(file_path)]
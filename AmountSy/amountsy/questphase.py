@@ -0,0 +1,476 @@
+"""
+questphase 节点导出文件（quest_all_nodes*.txt）的统计，JsonData / JsonData2 / jsonData3 共用的唯一实现
+- 读取：ingest_file 解析并统计单个文件，得到 PhaseAggregate
+- 聚合：PhaseAggregate 为一个或多个文件的聚合结果（阶段-类名矩阵、指定路径阶段-节点名矩阵、节点名频次、节点所在阶段），
+  全部以整数编号存储，可 pickle；merge 按文件顺序合并，满足结合律，重复出现的阶段以后面的文件为准；
+  aggregate_files 逐个或用进程池并行处理多个文件，按输入顺序合并
+- 导出：各工作表的构建函数（只依赖聚合结果）和 export_compact_tables（完整流程：读取、聚合、写出全部工作表）
+"""
+
+import json
+import os
+import pickle
+import tempfile
+from array import array
+from collections import Counter, deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from amountsy.instrument import NULL_REPORT
+from amountsy.node_classes import NODE_CLASS_DESCRIPTION, rollup_class_matrix
+from amountsy.quest_paths import QUEST_PHASE_CLASSIFIER, QUEST_TYPES
+from amountsy.sparse_counts import FrequencyCounter, SparseCountMatrix, Vocabulary
+from amountsy.table_export import open_table_writer
+
+# 阶段汇总行的列（PhaseAggregate.rows 中每行的前 6 项，第 7 项为是否指定路径）
+PHASE_ROW_COLUMNS = ("阶段路径", "节点ID集合", "节点名称集合", "节点类名集合", "节点路径集合", "节点数")
+
+# 传入 on_rows 时每统计这么多个阶段交出一次汇总行（大文件的汇总行不在内存中整体保留）
+ROW_FLUSH_PHASES = 1000
+
+# 出现次数达到该值的节点名称为高频节点
+HIGH_FREQ_THRESHOLD = 10
+
+# 高频节点表的两种布局：phases（列出包含该节点的阶段，JsonData / jsonData3）、
+# quest_types（按 main/side/minor 分别计数，JsonData2）
+HIGH_FREQ_LAYOUTS = ("phases", "quest_types")
+
+# 节点类名矩阵的汇总粒度 -> 工作表名中的名称
+CLASS_ROLLUP_SHEETS = {
+    "manager": "管理器",
+    "base": "基类",
+}
+
+
+class PhaseAggregate:
+    """
+    questphase 聚合结果（阶段路径、节点名称、节点类名都编码为整数编号）
+    on_rows(rows)：每 ROW_FLUSH_PHASES 个阶段及每个文件结束时接收已统计阶段的汇总行；不传时汇总行留在 rows 中
+    """
+
+    def __init__(self, on_rows=None):
+        self.phases = Vocabulary()  # 所有阶段路径
+        self.names = Vocabulary()  # 指定路径下的节点名称（编号按首次出现顺序）
+        self.classes = Vocabulary()  # 所有读取到的节点类名
+        self.class_matrix = SparseCountMatrix(self.phases, self.classes)  # 所有阶段-节点类名次数
+        self.name_matrix = SparseCountMatrix(self.phases, self.names)  # 指定路径-节点名称次数
+        self.name_freq = FrequencyCounter(self.names)  # 节点名称 -> 指定路径下出现次数
+        self.name_phases = []  # 节点名称编号 -> 包含该节点的指定路径阶段编号（array('I')，可能重复）
+        self.rows = []  # 尚未取走的阶段汇总行：PHASE_ROW_COLUMNS 各项 + 是否指定路径
+        self.on_rows = on_rows
+
+    def add_phase(self, phase, nodes):
+        """统计一个阶段：节点只遍历一次，同时得到类名统计、节点名称统计和汇总行"""
+        # 指定路径（main/side/minor quests）：前缀预编译，一次匹配
+        is_target = QUEST_PHASE_CLASSIFIER.classify(phase) is not None
+        phase_id = self.phases.id(phase)
+        class_id = self.classes.id
+        name_id = self.names.id
+        class_counter = Counter()  # 当前phase的类名统计（类名编号 -> 次数）
+        phase_counter = Counter()  # 当前phase的节点名称统计（名称编号 -> 次数，仅指定路径）
+        ids, names, classes, paths = [], [], [], []
+        for node in nodes:
+            raw_name = str(node.get("name", ""))
+            raw_class = str(node.get("class", ""))
+            ids.append(str(node.get("id", "")))
+            names.append(raw_name)
+            classes.append(raw_class)
+            paths.append(str(node.get("path", "")))
+
+            node_class = raw_class.strip()  # 节点类名（去空）
+            if node_class:
+                class_counter[class_id(node_class)] += 1
+
+            if is_target:
+                node_name = raw_name.strip()
+                if node_name:
+                    phase_counter[name_id(node_name)] += 1
+
+        self.class_matrix.set_row_ids(phase_id, class_counter)
+        if is_target:
+            self.name_matrix.set_row_ids(phase_id, phase_counter)
+            self._add_name_counts(phase_counter, phase_id)
+
+        self.rows.append((phase, " | ".join(ids), " | ".join(names), " | ".join(classes), " | ".join(paths),
+                          len(nodes), is_target))
+        if self.on_rows is not None and len(self.rows) >= ROW_FLUSH_PHASES:
+            self.flush_rows()
+
+    def _add_name_counts(self, counts, phase_id):
+        self.name_freq.add_ids(counts)
+        for _ in range(len(self.names) - len(self.name_phases)):
+            self.name_phases.append(array('I'))
+        for name_idx in counts:
+            self.name_phases[name_idx].append(phase_id)
+
+    def add_file(self, json_file):
+        """解析并统计一个导出文件（每个文件只解析一次）"""
+        # 读取JSON（兼容中文和特殊字符）
+        with open(json_file, 'r', encoding='utf-8-sig') as f:
+            data = json.load(f)
+        return self.add_data(data)
+
+    def add_bytes(self, raw):
+        """统计一个已读入内存的导出文件（amountsy.prefetch 预读的原始字节）"""
+        return self.add_data(json.loads(raw.decode('utf-8-sig')))
+
+    def add_data(self, data):
+        """统计已解析的导出文件内容"""
+        for phase, nodes in data.get("questphases", {}).items():
+            self.add_phase(phase, nodes)
+        self.flush_rows()
+        return self
+
+    def take_rows(self):
+        """取走已统计阶段的汇总行（按处理顺序），调用方写出后即可释放"""
+        rows, self.rows = self.rows, []
+        return rows
+
+    def flush_rows(self):
+        """把尚未取走的汇总行交给 on_rows（未设置 on_rows 时不做任何事）"""
+        if self.on_rows is not None and self.rows:
+            self.on_rows(self.take_rows())
+
+    def merge(self, other):
+        """
+        把 other（之后处理的文件）合并进来：
+        矩阵中 other 的阶段行覆盖同名阶段，节点名称次数累加，节点所在阶段取并集，汇总行接在后面
+        """
+        phase_map = [self.phases.id(k) for k in other.phases.keys]
+        class_map = [self.classes.id(k) for k in other.classes.keys]
+        name_map = [self.names.id(k) for k in other.names.keys]
+
+        for row_id, cols, counts in other.class_matrix.iter_rows():
+            self.class_matrix.set_row_ids(phase_map[row_id], {class_map[c]: n for c, n in zip(cols, counts)})
+        for row_id, cols, counts in other.name_matrix.iter_rows():
+            self.name_matrix.set_row_ids(phase_map[row_id], {name_map[c]: n for c, n in zip(cols, counts)})
+
+        self.name_freq.add_ids({name_map[i]: n for i, n in enumerate(other.name_freq.counts)})
+        for _ in range(len(self.names) - len(self.name_phases)):
+            self.name_phases.append(array('I'))
+        for i, phase_ids in enumerate(other.name_phases):
+            self.name_phases[name_map[i]].extend(phase_map[p] for p in phase_ids)
+
+        self.rows.extend(other.rows)
+        return self
+
+    def phases_of(self, name_idx):
+        """节点所在的指定路径阶段（去重、按路径排序）"""
+        phase_keys = self.phases.keys
+        return sorted(phase_keys[p] for p in set(self.name_phases[name_idx]))
+
+
+def read_export(json_file, raw=None):
+    """
+    解析一个导出文件（raw 为预读的原始字节，None 时从文件读取）
+    文件读取失败或不是合法的 JSON 时打印错误并返回 None，调用方跳过该文件，不中断整批处理
+    """
+    try:
+        if raw is not None:
+            return json.loads(raw.decode('utf-8-sig'))
+        # 读取JSON（兼容中文和特殊字符）
+        with open(json_file, 'r', encoding='utf-8-sig') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"❌ 读取 {json_file} 失败：{str(e)}，跳过该文件")
+        return None
+
+
+def _ingest_or_skip(aggregate, json_file, raw=None):
+    """统计一个导出文件；读取或解析失败的文件跳过（见 read_export）"""
+    data = read_export(json_file, raw)
+    return aggregate if data is None else aggregate.add_data(data)
+
+
+def ingest_file(json_file, spool_rows=False):
+    """
+    单个文件 -> 部分聚合（供进程池调用）；读取或解析失败时打印错误，返回空的部分聚合
+    spool_rows=True 时汇总行每 ROW_FLUSH_PHASES 个阶段追加写入一次临时文件，不随部分聚合整体回传，
+    返回 (部分聚合, 临时文件路径)，由 _spooled_rows 逐块读回
+    """
+    if not spool_rows:
+        return _ingest_or_skip(PhaseAggregate(), json_file)
+    fd, spool_path = tempfile.mkstemp(prefix="questphase_rows_", suffix=".pickle")
+    try:
+        with os.fdopen(fd, 'wb') as spool:
+            partial = PhaseAggregate(on_rows=lambda rows: pickle.dump(rows, spool, pickle.HIGHEST_PROTOCOL))
+            _ingest_or_skip(partial, json_file)
+            partial.on_rows = None
+    except BaseException:
+        os.remove(spool_path)
+        raise
+    return partial, spool_path
+
+
+def _spooled_rows(spool_path):
+    """按写入顺序逐块读回 ingest_file 写出的汇总行，读完删除临时文件"""
+    try:
+        with open(spool_path, 'rb') as spool:
+            while True:
+                try:
+                    yield pickle.load(spool)
+                except EOFError:
+                    return
+    finally:
+        os.remove(spool_path)
+
+
+def _parallel_ingest(json_files, workers, spool_rows=False):
+    """进程池按输入顺序产出 ingest_file 的结果；最多 workers 个文件同时在处理或等待合并，内存占用有上限"""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        files = iter(json_files)
+        for json_file in islice(files, workers):
+            pending.append(executor.submit(ingest_file, json_file, spool_rows))
+        while pending:
+            result = pending.popleft().result()
+            for json_file in islice(files, 1):
+                pending.append(executor.submit(ingest_file, json_file, spool_rows))
+            yield result
+
+
+def _prefetched_partials(total, json_files, read_ahead):
+    """串行统计，读取线程同时预读后面的文件"""
+    for json_file, raw, error in read_ahead.read(json_files):
+        if error is not None:
+            print(f"❌ 读取 {json_file} 失败：{str(error)}，跳过该文件")
+            continue
+        yield _ingest_or_skip(total, json_file, raw)
+
+
+def aggregate_files(json_files, workers=1, on_rows=None, read_ahead=None):
+    """
+    统计多个导出文件，返回合并后的 PhaseAggregate
+    - workers > 1 时每个文件在独立进程中解析和统计，主进程按输入顺序合并，结果与串行完全一致
+    - 串行时可传入 read_ahead（amountsy.prefetch.ReadAhead）：解析当前文件的同时预读后面的文件
+    - 读取失败或不是合法 JSON 的文件打印错误后跳过，其余文件照常统计
+    - on_rows(rows)：按处理顺序分块接收阶段汇总行（用于逐行写出），每块最多 ROW_FLUSH_PHASES 行，
+      单个文件的汇总行也不会整体留在内存中（并行时子进程经临时文件分块交回）；不传时汇总行保留在结果的 rows 中
+    """
+    total = PhaseAggregate(on_rows=on_rows)
+    workers = min(workers, len(json_files))
+    if workers <= 1 and read_ahead is not None:
+        partials = _prefetched_partials(total, json_files, read_ahead)
+    elif workers <= 1:
+        partials = (_ingest_or_skip(total, json_file) for json_file in json_files)
+    else:
+        print(f"使用 {workers} 个进程并行处理 {len(json_files)} 个文件")
+        partials = _parallel_ingest(json_files, workers, spool_rows=on_rows is not None)
+
+    for partial in partials:
+        if partial is total:
+            continue  # 串行时汇总行已在统计过程中交给 on_rows
+        if on_rows is not None:
+            partial, spool_path = partial
+            for rows in _spooled_rows(spool_path):
+                on_rows(rows)
+        total.merge(partial)
+    total.on_rows = None
+    return total
+
+
+# ---------------------------------------------------------------- 导出：各工作表的构建
+
+
+def node_count_rows(aggregate):
+    """指定路径节点统计：按次数降序（次数相同按首次出现顺序）的排名行"""
+    for idx, (name, cnt) in enumerate(aggregate.name_freq.most_common()):
+        yield {"排名": idx + 1, "节点名称": name, "出现次数": cnt}
+
+
+def high_freq_table(aggregate, layout="phases", threshold=HIGH_FREQ_THRESHOLD):
+    """高频节点路径分布（layout 见 HIGH_FREQ_LAYOUTS）"""
+    name_keys = aggregate.names.keys
+    name_freq = aggregate.name_freq
+    high_freq_ids = name_freq.ids_at_least(threshold)
+    name_header = f"高频节点名称（出现≥{threshold}次）"
+    data = []
+    if layout == "phases":
+        for name_idx in high_freq_ids:
+            phases = aggregate.phases_of(name_idx)
+            data.append({
+                name_header: name_keys[name_idx],
+                "出现次数": name_freq[name_idx],
+                "包含该节点的指定路径阶段": "\n".join(phases),
+                "涉及阶段数": len(phases)
+            })
+    elif layout == "quest_types":
+        # 按节点名称排序，只给出各任务类型的阶段数（避免 Excel 单元格 32767 字符的上限截断阶段列表）
+        for name_idx in sorted(high_freq_ids, key=name_keys.__getitem__):
+            phase_types = [QUEST_PHASE_CLASSIFIER.classify(p) for p in aggregate.phases_of(name_idx)]
+            row = {
+                name_header: name_keys[name_idx],
+                "总出现次数": name_freq[name_idx],
+                "涉及阶段总数": len(phase_types),
+            }
+            for quest_dir, quest_type in QUEST_TYPES.items():
+                row[f"{quest_dir}阶段数"] = phase_types.count(quest_type)
+            data.append(row)
+    else:
+        raise ValueError(f"不支持的高频节点表布局：{layout}（可选：{', '.join(HIGH_FREQ_LAYOUTS)}）")
+    return pd.DataFrame(data)
+
+
+def _class_header(node_class):
+    """类名 + 功能描述（Excel 中换行显示）"""
+    return f"{node_class}\n（{NODE_CLASS_DESCRIPTION.get(node_class, '无描述')}）"
+
+
+def _dense_chunks(matrix, row_keys, col_keys, row_header, col_header=None):
+    """矩阵分块展开；给定 col_header 时列名改为 col_header(列键)"""
+    col_keys = list(col_keys)
+    chunks = matrix.iter_dense_chunks(row_keys, col_keys, row_header)
+    if col_header is None:
+        return chunks
+    columns = [row_header] + [col_header(k) for k in col_keys]
+    return (df.set_axis(columns, axis=1) for df in chunks)
+
+
+def name_matrix_chunks(aggregate, threshold=HIGH_FREQ_THRESHOLD):
+    """指定路径-高频节点次数矩阵（行按阶段路径排序，列为高频节点，按首次出现顺序）"""
+    high_freq_nodes = [aggregate.names.keys[i] for i in aggregate.name_freq.ids_at_least(threshold)]
+    return _dense_chunks(aggregate.name_matrix, sorted(aggregate.name_matrix.row_keys()), high_freq_nodes,
+                         "指定路径（main/side/minor quests）")
+
+
+def class_matrix_chunks(aggregate, level="class", describe=False):
+    """
+    所有阶段-节点类名次数矩阵（行、列都按名称排序）
+    level 为 manager / base 时按节点类名层级汇总列；describe=True 时列名附带功能描述
+    """
+    matrix = aggregate.class_matrix
+    if level != "class":
+        matrix = rollup_class_matrix(matrix, level)
+    return _dense_chunks(matrix, sorted(aggregate.class_matrix.row_keys()), sorted(matrix.cols.keys),
+                         "所有阶段路径", _class_header if describe else None)
+
+
+def class_description_table(aggregate):
+    """节点类名-功能描述映射：先列出所有有描述的类名，再列出读取到但没有描述的类名"""
+    data = [{"节点类名": c, "功能描述": NODE_CLASS_DESCRIPTION[c]} for c in sorted(NODE_CLASS_DESCRIPTION)]
+    data.extend({"节点类名": c, "功能描述": "无匹配描述"}
+                for c in sorted(aggregate.classes.keys) if c not in NODE_CLASS_DESCRIPTION)
+    return pd.DataFrame(data)
+
+
+# ---------------------------------------------------------------- 导出：完整流程
+
+
+def export_compact_tables(json_files, output_path, output_format="excel", workers=1,
+                          high_freq_layout="phases", class_descriptions=False, class_rollups=(), report=NULL_REPORT,
+                          read_ahead=None):
+    """
+    读取、聚合多个导出文件并写出全部工作表，返回聚合结果
+    - output_format：excel（所有工作表写入 output_path）/ excel_stream（只写模式，内存恒定，超过行数上限自动分表）/
+      parquet / arrow（写入与 output_path 同名的目录，每个表一个文件，字符串列字典编码）
+    - workers > 1 且有多个输入文件时，各文件在独立进程中统计后按输入顺序合并，结果与串行完全一致
+    - read_ahead：串行统计时预读后面的输入文件（amountsy.prefetch.ReadAhead，见 aggregate_files）
+    - high_freq_layout：高频节点表的布局（见 HIGH_FREQ_LAYOUTS）
+    - class_descriptions：类名矩阵的列名附带功能描述，并追加一张节点类名-功能描述映射表
+    - class_rollups：额外输出按节点类名层级汇总的阶段矩阵（"manager" 管理器 / "base" 基类），接在最后
+    - report：amountsy.instrument.RunReport，记录 aggregate（文件数、字节数、阶段数、节点数）和 export 两个阶段的耗时
+    阶段汇总两张表在处理过程中逐行写出，不在内存中保留；读取失败的输入文件跳过，保存失败时打印错误并返回 None
+    """
+    # 按工作表顺序打开所有表
+    try:
+        writer = open_table_writer(output_format, output_path)
+    except OSError as e:
+        print(f"❌ 保存 {output_path} 失败：{str(e)}")
+        return None
+    # 出错时（包括统计过程中抛出异常）也关闭所有表，释放文件句柄
+    with writer:
+        all_phase_sheet = writer.open_stream("所有阶段汇总")  # 所有阶段数据
+        node_count_sheet = writer.open_stream("指定路径节点统计")
+        target_phase_sheet = writer.open_stream("指定路径阶段汇总")  # 指定路径的阶段数据
+        high_freq_sheet = writer.open_stream("高频节点路径分布")
+        matrix_sheet = writer.open_stream("指定路径-高频节点次数矩阵")
+        class_matrix_sheet = writer.open_stream("所有阶段-节点类名次数矩阵")
+        class_desc_sheet = writer.open_stream("节点类名-功能描述映射") if class_descriptions else None
+        rollup_sheets = {level: writer.open_stream(f"所有阶段-节点{CLASS_ROLLUP_SHEETS[level]}次数矩阵")
+                         for level in class_rollups}
+
+        def write_phase_rows(rows, stage):
+            # 阶段数据整理（指定路径阶段复用同一行）
+            stage.add(phases=len(rows), nodes=sum(row[5] for row in rows))
+            for row in rows:
+                phase_row = dict(zip(PHASE_ROW_COLUMNS, row))
+                all_phase_sheet.append(phase_row)
+                if row[-1]:
+                    target_phase_sheet.append(phase_row)
+
+        existing_files = []
+        for json_file in json_files:
+            if not Path(json_file).exists():
+                print(f"⚠️  {json_file} 不存在，跳过")
+                continue
+            existing_files.append(json_file)
+
+        # 单遍处理：每个文件只解析一次，每个阶段的节点只遍历一次，所有工作表的数据都在这一遍里收集
+        with report.stage('aggregate') as stage:
+            aggregate = aggregate_files(existing_files, workers, on_rows=lambda rows: write_phase_rows(rows, stage),
+                                        read_ahead=read_ahead)
+            stage.add(files=len(existing_files), bytes=sum(os.path.getsize(f) for f in existing_files))
+        name_keys = aggregate.names.keys
+        class_keys = aggregate.classes.keys
+        name_freq = aggregate.name_freq
+
+        # 打印统计结果：Top 10 用堆提取（按次数降序，次数相同按首次出现顺序）
+        described = sum(1 for c in class_keys if c in NODE_CLASS_DESCRIPTION)
+        print("=" * 60)
+        print("🔍 指定路径（main/side/minor quests）下节点名称出现次数（按次数降序）：")
+        for idx, (name, cnt) in enumerate(name_freq.most_common(10), 1):
+            print(f"  {idx:2d}. {name:<15} → {cnt}次")
+        if len(name_freq) > 10:
+            print(f"  ... 共 {len(name_freq)} 个不同节点")
+        print("=" * 60)
+        print(f"📊 总计：{len(name_freq)} 个不同节点，共 {name_freq.total} 个节点实例（仅指定路径）")
+        print(f"📊 所有节点类名总计：{len(class_keys)} 个不同类名（其中{described}个有功能描述）")
+        print("=" * 60)
+
+        # 写入其余各表并保存（矩阵稀疏存储，写入时再分块展开）
+        high_freq_ids = name_freq.ids_at_least(HIGH_FREQ_THRESHOLD)
+        class_matrix_phases = len(aggregate.class_matrix)
+        with report.stage('export'):
+            try:
+                node_count_sheet.extend(node_count_rows(aggregate))
+                high_freq_sheet.write_chunks(high_freq_table(aggregate, high_freq_layout))
+                matrix_sheet.write_chunks(name_matrix_chunks(aggregate))
+                class_matrix_sheet.write_chunks(class_matrix_chunks(aggregate, describe=class_descriptions))
+                if class_desc_sheet is not None:
+                    class_desc_sheet.write_chunks(class_description_table(aggregate))
+                for level, sheet in rollup_sheets.items():
+                    sheet.write_chunks(class_matrix_chunks(aggregate, level, describe=class_descriptions))
+                writer.close()
+            except Exception as e:
+                print(f"❌ 保存 {writer.location} 失败：{str(e)}")
+                return None
+
+    # 打印结果提示
+    sheets = [
+        f"所有阶段汇总（{all_phase_sheet.rows} 行）",
+        f"指定路径节点统计（{node_count_sheet.rows} 行）",
+        f"指定路径阶段汇总（{target_phase_sheet.rows} 行）",
+        f"高频节点路径分布（{high_freq_sheet.rows} 行）",
+        f"指定路径-高频节点次数矩阵（{matrix_sheet.rows} 行 × {len(high_freq_ids)} 列）",
+        f"所有阶段-节点类名次数矩阵（{class_matrix_phases} 行阶段 × {len(class_keys)} 列类名）",
+    ]
+    if class_desc_sheet is not None:
+        sheets.append(f"节点类名-功能描述映射（{class_desc_sheet.rows} 行）")
+    for level in class_rollups:
+        label = CLASS_ROLLUP_SHEETS[level]
+        sheets.append(f"所有阶段-节点{label}次数矩阵（{class_matrix_phases} 行阶段 × {label}汇总）")
+    print("=" * 50)
+    print(f"✅ {len(sheets)} 个表格生成完成！→ {writer.location}")
+    for sheet_no, sheet in enumerate(sheets, 1):
+        print(f"   📑 工作表{sheet_no}：{sheet}")
+    high_freq_nodes = [name_keys[i] for i in high_freq_ids]
+    if high_freq_nodes:
+        print(f"🔍 高频节点列表：{', '.join(high_freq_nodes[:5])}{'...' if len(high_freq_nodes) > 5 else ''}")
+    else:
+        print(f"🔍 暂无指定路径下出现次数≥{HIGH_FREQ_THRESHOLD}次的高频节点")
+    print(f"🔍 所有节点类名列表：{', '.join(class_keys[:5])}{'...' if len(class_keys) > 5 else ''}")
+    print("=" * 50)
+    return aggregate
@@ -0,0 +1,236 @@
+"""
+.scnlocjson 场景统计与结果缓存
+- extract_scene_stats：各分析脚本共用的单场景统计（场景名、段数、选择段数、对话行数、说话人）
+  json.loads 解码后只遍历统计需要的字段；超过 STREAM_THRESHOLD 的文件在安装了 ijson（可选依赖，pip install ijson）时走事件流解析
+- scene_stats_from_prefetched：amountsy.prefetch 预读的字节 -> 统计（超大文件不预读，仍走事件流解析）
+- scene_stats_from_stream：已打开的文件对象 -> 统计（压缩包内的成员不落盘直接解析）
+- SceneStatsCache：以 路径 + mtime + 文件大小 为键的持久化缓存（SQLite），可选内容哈希校验；
+  库中记录 EXTRACTOR_VERSION，统计逻辑变化后旧结果整体作废
+  只有变化过的场景才会重新解析，补丁通常只改动少量场景，重复生成报告几乎没有解析开销
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+
+try:
+    import ijson  # 可选依赖：超大场景文件使用事件流解析（pip install ijson）
+except ImportError:
+    ijson = None
+
+# 超过该大小的场景文件在安装了 ijson 时改用事件流解析，不再整体读入内存
+STREAM_THRESHOLD = 32 * 1024 * 1024
+# 预读场景文件时的单文件上限：会走事件流解析的文件不整体读入
+PREFETCH_MAX_SIZE = STREAM_THRESHOLD if ijson is not None else None
+
+# 统计逻辑版本：提取规则或结果字段变化时加 1，已有缓存中的旧结果会被整体丢弃
+EXTRACTOR_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS scene_stats (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    digest TEXT,
+    stats TEXT NOT NULL
+);
+"""
+
+
+def scene_stats_from_bytes(raw):
+    """
+    从 .scnlocjson 原始字节计算统计结果
+    json.loads 整体解码后只遍历统计需要的字段；字段类型不符（例如 Speaker 不是字符串）时按缺失处理
+    """
+    root = json.loads(raw)
+    if not isinstance(root, dict):
+        root = {}
+    sections = root.get('SectionsInScene')
+    if not isinstance(sections, list):
+        sections = []
+
+    choice_sections = 0
+    total_lines = 0
+    speakers = set()
+    for section in sections:
+        if not isinstance(section, dict):
+            continue
+        if section.get('IsChoiceSection'):
+            choice_sections += 1
+        lines = section.get('LinesInSection')
+        if not isinstance(lines, list):
+            continue
+        total_lines += len(lines)
+        for line in lines:
+            if isinstance(line, dict):
+                speaker = line.get('Speaker')
+                if isinstance(speaker, str) and speaker.strip():
+                    speakers.add(speaker)
+
+    return {
+        'scene_name': root.get('SceneName'),
+        'total_sections': len(sections),
+        'choice_sections': choice_sections,
+        'total_lines': total_lines,
+        'speakers': sorted(speakers)
+    }
+
+
+_VALUE_EVENTS = frozenset(('start_map', 'start_array', 'string', 'number', 'boolean', 'null'))
+
+
+def _stream_scene_stats(f):
+    """基于 ijson 事件流的统计，内存占用与文件大小无关（用于超大场景文件）"""
+    scene_name = None
+    total_sections = choice_sections = total_lines = 0
+    speakers = set()
+    for prefix, event, value in ijson.parse(f):
+        if event not in _VALUE_EVENTS:
+            continue
+        if prefix == 'SectionsInScene.item':
+            total_sections += 1
+        elif prefix == 'SectionsInScene.item.LinesInSection.item':
+            total_lines += 1
+        elif prefix == 'SectionsInScene.item.LinesInSection.item.Speaker':
+            if event == 'string' and value.strip():
+                speakers.add(value)
+        elif prefix == 'SectionsInScene.item.IsChoiceSection':
+            if value:
+                choice_sections += 1
+        elif prefix == 'SceneName':
+            scene_name = value
+
+    return {
+        'scene_name': scene_name,
+        'total_sections': total_sections,
+        'choice_sections': choice_sections,
+        'total_lines': total_lines,
+        'speakers': sorted(speakers)
+    }
+
+
+_warned_no_ijson = False
+
+
+def scene_stats_from_stream(f, size):
+    """从已打开的二进制文件对象（例如 amountsy.bundle 的包内成员）计算统计结果，size 超过 STREAM_THRESHOLD 时走事件流解析"""
+    global _warned_no_ijson
+    if size > STREAM_THRESHOLD:
+        if ijson is not None:
+            return _stream_scene_stats(f)
+        if not _warned_no_ijson:
+            _warned_no_ijson = True
+            print(f"⚠️  场景文件超过 {STREAM_THRESHOLD >> 20} MB，未安装 ijson，将整体读入内存解析（pip install ijson）")
+    return scene_stats_from_bytes(f.read())
+
+
+def extract_scene_stats(file_path):
+    """解析单个 .scnlocjson 文件，返回统计字典（解析失败时抛出异常）"""
+    with open(file_path, 'rb') as f:
+        return scene_stats_from_stream(f, os.fstat(f.fileno()).st_size)
+
+
+def scene_stats_from_prefetched(file_path, raw):
+    """预读得到的原始字节 -> 统计结果；raw 为 None（超过 PREFETCH_MAX_SIZE 未预读）时按 extract_scene_stats 读取"""
+    if raw is None:
+        return extract_scene_stats(file_path)
+    return scene_stats_from_bytes(raw)
+
+
+def file_digest(file_path):
+    """文件内容哈希（blake2b-128）"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class SceneStatsCache:
+    """
+    场景统计缓存
+    - 路径、mtime、大小都一致时直接命中
+    - use_hash=True 时，mtime/大小变化（例如重新检出、解包后时间戳被重置）会再比对内容哈希，内容未变仍算命中
+    - 库中记录的 EXTRACTOR_VERSION 与当前不同（含旧库没有记录）时清空全部条目
+    """
+
+    def __init__(self, db_path, use_hash=False):
+        db_dir = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'extractor_version'").fetchone()
+        if row is None or row[0] != str(EXTRACTOR_VERSION):
+            dropped = self.conn.execute("DELETE FROM scene_stats").rowcount
+            if dropped:
+                print(f"⚠️  场景统计逻辑版本由 {row[0] if row else 1} 变为 {EXTRACTOR_VERSION}，丢弃 {dropped} 条旧缓存")
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('extractor_version', ?)",
+                              (str(EXTRACTOR_VERSION),))
+            self.conn.commit()
+        self.use_hash = use_hash
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def get(self, file_path):
+        """返回缓存的统计结果，未命中（含文件已不存在、无法访问）返回 None"""
+        key = os.path.abspath(file_path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            self.misses += 1
+            return None
+        row = self.conn.execute(
+            "SELECT mtime_ns, size, digest, stats FROM scene_stats WHERE path = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        mtime_ns, size, digest, stats = row
+        if mtime_ns == st.st_mtime_ns and size == st.st_size:
+            self.hits += 1
+            return json.loads(stats)
+
+        if self.use_hash and digest and digest == file_digest(key):
+            # 内容未变，只更新时间戳，下次直接命中
+            self.conn.execute("UPDATE scene_stats SET mtime_ns = ?, size = ? WHERE path = ?",
+                              (st.st_mtime_ns, st.st_size, key))
+            self.hits += 1
+            return json.loads(stats)
+
+        self.misses += 1
+        return None
+
+    def put(self, file_path, stats):
+        """写入一个场景的统计结果"""
+        key = os.path.abspath(file_path)
+        st = os.stat(key)
+        digest = file_digest(key) if self.use_hash else None
+        self.conn.execute("INSERT OR REPLACE INTO scene_stats VALUES (?, ?, ?, ?, ?)",
+                          (key, st.st_mtime_ns, st.st_size, digest, json.dumps(stats, ensure_ascii=False)))
+
+
+def load_scene_stats(file_path, cache=None):
+    """带缓存的 extract_scene_stats：命中则直接返回，否则解析并写入缓存"""
+    if cache is not None:
+        stats = cache.get(file_path)
+        if stats is not None:
+            return stats
+    stats = extract_scene_stats(file_path)
+    if cache is not None:
+        cache.put(file_path, stats)
+    return stats
@@ -0,0 +1,245 @@
+"""
+稀疏计数矩阵（阶段 × 节点类名、阶段 × 节点名称等）
+- 行键、列键分别编码为连续整数（Vocabulary，可在多个矩阵间共用），计数按行以 CSR 形式存进整数数组，0 不占空间
+- 同一行重复写入时以最后一次为准，与原先 dict[phase] = Counter 的覆盖语义一致；
+  被覆盖的旧数据超过数组的一半时整体压缩一次，数组长度不超过存活非零项的两倍
+- FrequencyCounter：按编号原地累加的频次表，Top-N 用堆提取，完整排名只在导出时算一次
+- map_cols：按列映射合并（例如节点类名汇总到管理器/基类），只处理非零项
+- 只在导出时按块展开为稠密 DataFrame（交给 table_export 逐块写出），峰值内存只与块大小有关，与阶段总数无关
+"""
+
+import heapq
+from array import array
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+# 导出时每块展开的行数
+CHUNK_ROWS = 2000
+
+
+class Vocabulary:
+    """键 <-> 连续整数编号的双向映射，编号按首次出现顺序分配"""
+
+    def __init__(self):
+        self.ids = {}
+        self.keys = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.ids
+
+    def id(self, key):
+        """返回 key 的编号，首次出现时分配新编号"""
+        idx = self.ids.get(key)
+        if idx is None:
+            idx = self.ids[key] = len(self.keys)
+            self.keys.append(key)
+        return idx
+
+    def get(self, key, default=None):
+        return self.ids.get(key, default)
+
+
+class FrequencyCounter:
+    """
+    键的出现次数（键由 Vocabulary 编号，计数存在 array('I') 中原地累加）
+    排序规则与 sorted(Counter.items(), key=次数, reverse=True) 一致：次数降序，次数相同按首次出现顺序
+    """
+
+    def __init__(self, vocab=None):
+        self.vocab = vocab if vocab is not None else Vocabulary()
+        self.counts = array('I')
+
+    def __len__(self):
+        """出现过的不同键个数"""
+        return len(self.counts)
+
+    def __getitem__(self, key_id):
+        return self.counts[key_id]
+
+    @property
+    def total(self):
+        """所有键的出现次数之和"""
+        return sum(self.counts)
+
+    def add(self, key, count=1):
+        self.add_ids({self.vocab.id(key): count})
+
+    def add_ids(self, counts):
+        """累加一批计数（counts 为 编号 -> 次数）"""
+        missing = len(self.vocab) - len(self.counts)
+        if missing > 0:
+            self.counts.extend([0] * missing)
+        for key_id, count in counts.items():
+            self.counts[key_id] += count
+
+    def items(self):
+        """(键, 次数)，按编号顺序"""
+        return zip(self.vocab.keys, self.counts)
+
+    def ids_at_least(self, threshold):
+        """次数 >= threshold 的编号（按编号顺序）"""
+        return [key_id for key_id, count in enumerate(self.counts) if count >= threshold]
+
+    def most_common(self, n=None):
+        """
+        按次数降序的 (键, 次数)
+        - 给定 n 时用堆只取前 n 个，不对全部键排序
+        - 不给 n 时返回完整排名
+        """
+        if n is None:
+            return sorted(self.items(), key=itemgetter(1), reverse=True)
+        # heapq.nlargest 与 sorted(..., reverse=True)[:n] 结果一致（次数相同保持原顺序）
+        return heapq.nlargest(n, self.items(), key=itemgetter(1))
+
+
+class SparseCountMatrix:
+    """
+    行键 × 列键的整数计数矩阵（CSR 行存储）
+    rows / cols 可传入外部 Vocabulary，与其他矩阵或统计共用同一套编号（未写入的行不算在矩阵内）
+    """
+
+    def __init__(self, rows=None, cols=None):
+        self.rows = rows if rows is not None else Vocabulary()
+        self.cols = cols if cols is not None else Vocabulary()
+        self._row_start = array('q')  # 行编号 -> 在 _indices/_data 中的起始位置，-1 表示该行未写入
+        self._row_len = array('q')  # 行编号 -> 非零项个数
+        self._indices = array('l')  # 列编号
+        self._data = array('q')  # 计数
+        self._n_rows = 0
+        self._dead = 0  # 被覆盖的旧行在 _indices/_data 中残留的项数
+
+    def __len__(self):
+        """已写入的行数"""
+        return self._n_rows
+
+    @property
+    def nnz(self):
+        """非零项个数（不含被覆盖掉的旧行）"""
+        return sum(self._row_len)
+
+    def row_keys(self):
+        """已写入的行键（按编号顺序）"""
+        keys = self.rows.keys
+        return [keys[row_id] for row_id, start in enumerate(self._row_start) if start >= 0]
+
+    def set_row(self, row_key, counts):
+        """写入一行计数（counts 为 列键 -> 次数 的映射），该行已存在时整体覆盖"""
+        col_id = self.cols.id
+        self.set_row_ids(self.rows.id(row_key), {col_id(k): v for k, v in counts.items()})
+
+    def set_row_ids(self, row_id, counts):
+        """同 set_row，但行、列都已是编号（counts 为 列编号 -> 次数）"""
+        start = len(self._indices)
+        for col_id, count in counts.items():
+            if count:
+                self._indices.append(col_id)
+                self._data.append(count)
+
+        missing = row_id + 1 - len(self._row_start)
+        if missing > 0:
+            self._row_start.extend([-1] * missing)
+            self._row_len.extend([0] * missing)
+        if self._row_start[row_id] < 0:
+            self._n_rows += 1
+        else:
+            self._dead += self._row_len[row_id]
+        self._row_start[row_id] = start
+        self._row_len[row_id] = len(self._indices) - start
+        if self._dead * 2 > len(self._indices):
+            self._compact()
+
+    def _compact(self):
+        """丢弃被覆盖的旧行数据：存活的行按行编号顺序重新排进新数组"""
+        indices = array(self._indices.typecode)
+        data = array(self._data.typecode)
+        for row_id, start in enumerate(self._row_start):
+            if start >= 0:
+                end = start + self._row_len[row_id]
+                self._row_start[row_id] = len(indices)
+                indices.extend(self._indices[start:end])
+                data.extend(self._data[start:end])
+        self._indices = indices
+        self._data = data
+        self._dead = 0
+
+    def iter_rows(self):
+        """按行编号遍历已写入的行：(行编号, 列编号列表, 计数列表)"""
+        for row_id, start in enumerate(self._row_start):
+            if start >= 0:
+                end = start + self._row_len[row_id]
+                yield row_id, self._indices[start:end], self._data[start:end]
+
+    def map_cols(self, col_map, cols):
+        """
+        列合并：col_map[旧列编号] 为新列编号（在 cols 中），映射到同一新列的计数相加
+        返回共用同一行 Vocabulary 的新矩阵，只遍历已存的非零项，不需要重新统计原始数据
+        """
+        merged = SparseCountMatrix(self.rows, cols)
+        for row_id, col_ids, counts in self.iter_rows():
+            row_counts = {}
+            for col_id, count in zip(col_ids, counts):
+                new_id = col_map[col_id]
+                row_counts[new_id] = row_counts.get(new_id, 0) + count
+            merged.set_row_ids(row_id, row_counts)
+        return merged
+
+    def row(self, row_key):
+        """返回一行的 {列键: 次数}（不存在的行返回空字典）"""
+        row_id = self.rows.get(row_key)
+        if row_id is None or row_id >= len(self._row_start) or self._row_start[row_id] < 0:
+            return {}
+        start = self._row_start[row_id]
+        end = start + self._row_len[row_id]
+        col_keys = self.cols.keys
+        return {col_keys[c]: v for c, v in zip(self._indices[start:end], self._data[start:end])}
+
+    def to_csr(self, row_keys=None):
+        """按 row_keys 顺序（默认按行编号）导出 (indptr, indices, data) 三个 numpy 数组"""
+        if row_keys is None:
+            row_ids = [row_id for row_id, start in enumerate(self._row_start) if start >= 0]
+        else:
+            row_ids = [self.rows.ids[k] for k in row_keys]
+        indices = np.frombuffer(self._indices, dtype=np.dtype(f'i{self._indices.itemsize}'))
+        data = np.frombuffer(self._data, dtype=np.int64)
+        indptr = np.zeros(len(row_ids) + 1, dtype=np.int64)
+        parts_idx, parts_data = [], []
+        for i, row_id in enumerate(row_ids):
+            start = self._row_start[row_id]
+            end = start + self._row_len[row_id]
+            indptr[i + 1] = indptr[i] + (end - start)
+            parts_idx.append(indices[start:end])
+            parts_data.append(data[start:end])
+        if not parts_idx:
+            return indptr, np.zeros(0, dtype=indices.dtype), np.zeros(0, dtype=np.int64)
+        return indptr, np.concatenate(parts_idx), np.concatenate(parts_data)
+
+    def iter_dense_chunks(self, row_keys, col_keys, row_header, chunk_rows=CHUNK_ROWS):
+        """
+        按块展开为稠密 DataFrame：第一列为 row_header（行键），其余列按 col_keys 顺序
+        col_keys 中没出现过的列全为 0；不在 col_keys 中的列直接丢弃（例如只导出高频节点）
+        """
+        col_keys = list(col_keys)
+        col_pos = np.full(len(self.cols) + 1, -1, dtype=np.int64)
+        for pos, col_key in enumerate(col_keys):
+            col_id = self.cols.get(col_key)
+            if col_id is not None:
+                col_pos[col_id] = pos
+
+        row_keys = list(row_keys)
+        for chunk_start in range(0, len(row_keys), chunk_rows):
+            chunk_keys = row_keys[chunk_start:chunk_start + chunk_rows]
+            indptr, indices, data = self.to_csr(chunk_keys)
+            block = np.zeros((len(chunk_keys), len(col_keys)), dtype=np.int64)
+            rows = np.repeat(np.arange(len(chunk_keys)), np.diff(indptr))
+            cols = col_pos[indices]
+            keep = cols >= 0
+            block[rows[keep], cols[keep]] = data[keep]
+
+            df = pd.DataFrame(block, columns=col_keys)
+            df.insert(0, row_header, chunk_keys, allow_duplicates=True)
+            yield df
@@ -0,0 +1,182 @@
+"""
+合成 depot（用于基准测试，不依赖真实游戏目录）
+- generate_depot：按给定数量生成与真实 depot 结构一致的目录树，同一 seed 每次生成的内容完全相同
+  base/quest/main_quests/{prologue,part1,epilogue}/q*、side_quests/sq*、minor_quests/mq*，
+  每个任务下有 phases/*.questphase、*.scenesolution 占位文件和 scenes/*.scnlocjson（另有 scenes/Versions 旧版本）；
+  base/animations 下为多层 .anims 目录树；depot 外另生成 quest_all_nodes*.txt 节点导出文件
+- 场景的段数、选择段数、对话行数按 scene_analysis_detailed_final.csv 中真实场景的分布抽样（文件不存在时用内置样本）
+- 命令行（在 AmountSy 目录下）：python -m amountsy.synthetic_depot [目标目录]
+"""
+
+import csv
+import json
+import os
+import random
+import sys
+from pathlib import Path
+
+from amountsy.node_classes import NODE_CLASS_DESCRIPTION
+
+# 真实场景统计（scnSceneJson 的输出），用作段数/对话行数的抽样分布
+SCENE_PROFILE_CSV = Path(__file__).resolve().parent.parent / 'scnScene' / 'scene_analysis_detailed_final.csv'
+
+# 找不到统计文件时使用的样本：(选择段数, 总段数, 对话行数)，取自上述统计的分位数
+FALLBACK_SCENE_PROFILE = (
+    (0, 0, 0), (1, 11, 23), (2, 17, 35), (4, 28, 56), (6, 40, 80),
+    (9, 57, 110), (12, 75, 150), (20, 120, 260), (35, 200, 420),
+)
+
+# 默认规模：每类任务个数、每个任务的文件数等
+DEFAULT_COUNTS = {
+    'main_quests': 12,  # 平均分到 prologue / part1 / epilogue
+    'side_quests': 20,
+    'minor_quests': 20,
+    'scenes_per_quest': 6,
+    'versions_per_quest': 1,  # scenes/Versions 下的旧版本场景（统计时应被排除）
+    'phases_per_quest': 4,
+    'solutions_per_quest': 3,
+    'anim_dirs': 30,
+    'anims_per_dir': 8,
+    'exports': 2,  # quest_all_nodes*.txt 个数
+    'open_world_phases': 40,  # 每个导出文件中不在指定路径下的阶段数
+}
+
+MAIN_QUEST_PARTS = ('prologue', 'part1', 'epilogue')
+SPEAKERS = tuple(f"npc_{i:02d}" for i in range(40)) + ('V', 'Johnny', 'Judy', 'Panam', 'Takemura')
+NODE_NAMES = tuple(f"node_{i:03d}" for i in range(300))
+
+
+def load_scene_profile(csv_path=SCENE_PROFILE_CSV):
+    """读取真实场景的 (选择段数, 总段数, 对话行数) 样本"""
+    try:
+        with open(csv_path, encoding='utf-8-sig', newline='') as f:
+            profile = [(int(row['choice_sections']), int(row['total_sections']), int(row['total_lines']))
+                       for row in csv.DictReader(f)]
+    except (OSError, KeyError, ValueError):
+        return FALLBACK_SCENE_PROFILE
+    return tuple(profile) or FALLBACK_SCENE_PROFILE
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+
+
+def _scene_document(rng, scene_name, choice_sections, total_sections, total_lines):
+    """按给定的段数、对话行数生成一个 .scnlocjson 文档"""
+    choice_ids = set(rng.sample(range(total_sections), choice_sections)) if total_sections else set()
+    lines_per_section = [0] * total_sections
+    for idx in (rng.choices(range(total_sections), k=total_lines) if total_sections else ()):
+        lines_per_section[idx] += 1
+
+    sections = []
+    cast = rng.sample(SPEAKERS, rng.randint(1, 6))
+    for idx, n_lines in enumerate(lines_per_section):
+        sections.append({
+            'SectionName': f"section_{idx}",
+            'IsChoiceSection': idx in choice_ids,
+            'LinesInSection': [{
+                'Speaker': rng.choice(cast) if rng.random() > 0.05 else '',
+                'LineId': rng.getrandbits(48),
+                'Text': f"{scene_name} line {idx}.{n}",
+            } for n in range(n_lines)],
+        })
+    return {'SceneName': scene_name, 'SectionsInScene': sections}
+
+
+def _quest_dirs(counts):
+    """(任务目录相对 quest 的路径分段, 任务代号)"""
+    dirs = []
+    for i in range(counts['main_quests']):
+        part = MAIN_QUEST_PARTS[i % len(MAIN_QUEST_PARTS)]
+        dirs.append((('main_quests', part, f"q{100 + i:03d}"), f"q{100 + i:03d}"))
+    for i in range(counts['side_quests']):
+        dirs.append((('side_quests', f"sq{i:03d}"), f"sq{i:03d}"))
+    for i in range(counts['minor_quests']):
+        dirs.append((('minor_quests', f"mq{i:03d}"), f"mq{i:03d}"))
+    return dirs
+
+
+def _phase_nodes(rng, n_nodes, class_names, class_weights):
+    return [{
+        'id': rng.randint(0, 9999),
+        'name': rng.choice(NODE_NAMES[:rng.randint(20, len(NODE_NAMES))]),
+        'class': rng.choices(class_names, class_weights)[0],
+        'path': f"{rng.randint(0, 99)}/{rng.randint(0, 99)}",
+    } for _ in range(n_nodes)]
+
+
+def generate_depot(root, seed=0, scene_profile=None, **counts):
+    """
+    在 root 下生成合成 depot，counts 覆盖 DEFAULT_COUNTS 中的数量
+    返回 dict：depot / quest / animations 目录，scene_files（不含 Versions）、exports 文件列表
+    """
+    unknown = set(counts) - set(DEFAULT_COUNTS)
+    if unknown:
+        raise ValueError(f"未知的数量参数：{', '.join(sorted(unknown))}")
+    counts = {**DEFAULT_COUNTS, **counts}
+    profile = scene_profile if scene_profile is not None else load_scene_profile()
+    rng = random.Random(seed)
+
+    root = Path(root)
+    depot = root / 'depot'
+    quest_base = depot / 'base' / 'quest'
+    anim_base = depot / 'base' / 'animations'
+    scene_files = []
+    phase_keys = []  # questphase 导出中的阶段路径（depot 相对路径，反斜杠分隔）
+
+    for rel_parts, quest_name in _quest_dirs(counts):
+        quest_dir = quest_base.joinpath(*rel_parts)
+        for i in range(counts['phases_per_quest']):
+            phase_file = quest_dir / 'phases' / f"{quest_name}_{i:02d}.questphase"
+            _write(phase_file, '{}')
+            phase_keys.append('\\'.join(('base', 'quest') + rel_parts + ('phases', phase_file.name)))
+        for i in range(counts['solutions_per_quest']):
+            _write(quest_dir / f"{quest_name}_{i:02d}.scenesolution", '{}')
+        for i in range(counts['scenes_per_quest'] + counts['versions_per_quest']):
+            scene_name = f"{quest_name}_{i:02d}_scene"
+            doc = _scene_document(rng, scene_name, *rng.choice(profile))
+            if i < counts['scenes_per_quest']:
+                scene_file = quest_dir / 'scenes' / f"{scene_name}.scnlocjson"
+                scene_files.append(scene_file)
+            else:
+                scene_file = quest_dir / 'scenes' / 'Versions' / f"{scene_name}_old.scnlocjson"
+            _write(scene_file, json.dumps(doc, ensure_ascii=False))
+
+    # 动画：2~4 层目录，每个叶子目录若干 .anims
+    for i in range(counts['anim_dirs']):
+        depth = rng.randint(2, 4)
+        anim_dir = anim_base.joinpath(*(f"group{rng.randint(0, 5)}_{level}" for level in range(depth - 1)),
+                                      f"set{i:03d}")
+        for j in range(counts['anims_per_dir']):
+            _write(anim_dir / f"anim_{i:03d}_{j:02d}.anims", '')
+
+    # questphase 节点导出：类名频次呈长尾分布（少数类名占大多数节点）
+    class_names = list(NODE_CLASS_DESCRIPTION)
+    class_weights = [1.0 / (rank + 1) for rank in range(len(class_names))]
+    exports = []
+    for i in range(counts['exports']):
+        phases = {}
+        for phase in rng.sample(phase_keys, len(phase_keys) * 2 // 3):
+            phases[phase] = _phase_nodes(rng, rng.randint(0, 60), class_names, class_weights)
+        for j in range(counts['open_world_phases']):
+            phases[f"base\\open_world\\ow_{i}_{j:03d}.questphase"] = _phase_nodes(
+                rng, rng.randint(0, 30), class_names, class_weights)
+        export_file = root / f"quest_all_nodes{i + 1}.txt"
+        _write(export_file, json.dumps({'questphases': phases}, ensure_ascii=False))
+        exports.append(export_file)
+
+    return {
+        'depot': depot,
+        'quest': quest_base,
+        'animations': anim_base,
+        'scene_files': scene_files,
+        'exports': exports,
+    }
+
+
+if __name__ == '__main__':
+    target = sys.argv[1] if len(sys.argv) > 1 else 'synthetic_depot'
+    info = generate_depot(target)
+    print(f"✅ 合成 depot 已生成：{os.path.abspath(info['depot'])}")
+    print(f"   场景文件 {len(info['scene_files'])} 个，节点导出 {len(info['exports'])} 个")
@@ -0,0 +1,321 @@
+"""
+统计表格输出后端
+- ExcelTableWriter：所有表写进同一个 .xlsx（pandas + openpyxl），每张表一个工作表，与原先 pd.ExcelWriter 的输出一致
+- StreamingExcelTableWriter：openpyxl 只写模式，行随处理进度直接落盘，内存占用与表大小无关；
+  单个工作表超过 Excel 行数上限时自动续写到 "表名_2"、"表名_3" …
+- ParquetTableWriter / ArrowTableWriter：每张表一个 .parquet / .arrow 文件，字符串列做字典编码
+  （阶段路径、类名等重复字符串只存一份），下游 notebook 可直接内存映射读取，也没有 Excel 的行列上限
+- write_table 接受单个 DataFrame，或 DataFrame 分块迭代器（例如 SparseCountMatrix.iter_dense_chunks），分块逐个写出
+- open_stream 返回可逐行 append 的表，攒够一块就写出，调用方不必先把整张表留在内存里
+- open_table_writer(output_format, output_path) 按格式名创建后端
+"""
+
+import abc
+import os
+
+import pandas as pd
+from openpyxl import Workbook
+
+from amountsy.sparse_counts import Vocabulary
+
+try:
+    import pyarrow as pa  # 可选依赖：仅 parquet / arrow 输出需要
+    import pyarrow.compute as pc
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+OUTPUT_FORMATS = ('excel', 'excel_stream', 'parquet', 'arrow')
+
+# open_stream 每攒够多少行写出一块
+STREAM_CHUNK_ROWS = 10000
+
+# Excel 单个工作表的行数上限（含表头）、工作表名长度上限
+EXCEL_MAX_ROWS = 1048576
+EXCEL_MAX_SHEET_NAME = 31
+
+
+def _iter_chunks(table):
+    if isinstance(table, pd.DataFrame):
+        yield table
+    else:
+        yield from table
+
+
+class TableStream:
+    """逐行追加的表：行（字典）攒够 chunk_rows 个后转成一个 DataFrame 分块交给后端写出"""
+
+    def __init__(self, sink, chunk_rows=STREAM_CHUNK_ROWS):
+        self.sink = sink
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self._pending = []
+        self._closed = False
+
+    def append(self, row):
+        self._pending.append(row)
+        self.rows += 1
+        if len(self._pending) >= self.chunk_rows:
+            self.flush()
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def write_chunks(self, table):
+        """直接写入 DataFrame 或 DataFrame 分块迭代器（接在已追加的行之后）"""
+        self.flush()
+        for df in _iter_chunks(table):
+            self.sink.write(df)
+            self.rows += len(df)
+
+    def flush(self):
+        if self._pending:
+            self.sink.write(pd.DataFrame(self._pending))
+            self._pending = []
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self.flush()
+            self.sink.close()
+
+
+class _TableWriter(abc.ABC):
+    """输出后端基类：子类实现 _open_sink(name)，返回带 write(df) / close() 的写入端"""
+
+    def __init__(self, location):
+        self.location = location
+        self._streams = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @abc.abstractmethod
+    def _open_sink(self, name):
+        """打开一张表的写入端"""
+
+    def open_stream(self, name, chunk_rows=STREAM_CHUNK_ROWS):
+        """打开一张逐行追加的表；表的先后顺序与打开顺序一致，后端关闭时自动收尾"""
+        stream = TableStream(self._open_sink(name), chunk_rows)
+        self._streams.append(stream)
+        return stream
+
+    def write_table(self, name, table):
+        """写入一张完整的表，返回数据行数"""
+        stream = self.open_stream(name)
+        try:
+            stream.write_chunks(table)
+        finally:
+            stream.close()
+        return stream.rows
+
+    def close(self):
+        """关闭所有表并保存；重复调用（例如保存失败后 with 块退出时再次关闭）不再重复执行"""
+        streams, self._streams = self._streams, []
+        for stream in streams:
+            stream.close()
+
+
+class _PandasSheetSink:
+    def __init__(self, writer, name):
+        self.writer = writer
+        self.name = name
+        self.rows = 0
+        self.started = False
+        # 打开时就建好工作表，工作表顺序与打开顺序一致
+        writer.book.create_sheet(name)
+
+    def write(self, df):
+        # 后续分块接在上一块之后、不重复表头
+        df.to_excel(self.writer, sheet_name=self.name, index=False,
+                    startrow=self.rows + 1 if self.started else 0, header=not self.started)
+        self.rows += len(df)
+        self.started = True
+
+    def close(self):
+        pass
+
+
+class ExcelTableWriter(_TableWriter):
+    """写入单个 Excel 工作簿，表名即工作表名（整本工作簿在内存中，保存时一次写出）"""
+
+    def __init__(self, output_path):
+        super().__init__(output_path)
+        self.writer = pd.ExcelWriter(output_path, engine='openpyxl')
+
+    def _open_sink(self, name):
+        return _PandasSheetSink(self.writer, name)
+
+    def close(self):
+        super().close()
+        writer, self.writer = self.writer, None
+        if writer is not None:
+            writer.close()
+
+
+class _WriteOnlySheetSink:
+    def __init__(self, book, name):
+        self.book = book
+        self.name = name
+        self.part = 1
+        self.header = None
+        self.sheet_rows = 0
+        self.sheet = book.create_sheet(name)
+
+    def _next_sheet(self):
+        """当前工作表写满，在它后面新建续表并重写表头"""
+        self.part += 1
+        suffix = f"_{self.part}"
+        title = self.name[:EXCEL_MAX_SHEET_NAME - len(suffix)] + suffix
+        self.sheet = self.book.create_sheet(title, self.book.index(self.sheet) + 1)
+        self.sheet.append(self.header)
+        self.sheet_rows = 1
+
+    def write(self, df):
+        if self.header is None:
+            self.header = [str(c) for c in df.columns]
+            self.sheet.append(self.header)
+            self.sheet_rows = 1
+        for row in df.itertuples(index=False, name=None):
+            if self.sheet_rows >= EXCEL_MAX_ROWS:
+                self._next_sheet()
+            self.sheet.append([None if pd.isna(v) else v for v in row])
+            self.sheet_rows += 1
+
+    def close(self):
+        pass
+
+
+class StreamingExcelTableWriter(_TableWriter):
+    """openpyxl 只写模式：每个工作表的行直接写入临时文件，保存时再打包成 .xlsx，内存占用恒定"""
+
+    def __init__(self, output_path):
+        super().__init__(output_path)
+        self.book = Workbook(write_only=True)
+
+    def _open_sink(self, name):
+        return _WriteOnlySheetSink(self.book, name)
+
+    def close(self):
+        super().close()
+        book, self.book = self.book, None
+        if book is not None:
+            book.save(self.location)
+
+
+class _DictionaryEncoder:
+    """
+    逐块对重复度高的字符串列做字典编码
+    - 是否编码由第一块决定（不同值不超过一半才编码），之后各块保持一致，schema 不变
+    - 字典只追加不改动，后一块的字典总是前一块的扩展（Arrow IPC 文件只接受增量字典，不接受替换）
+    """
+
+    def __init__(self):
+        self.vocabs = None  # 列名 -> Vocabulary，只包含需要编码的列
+
+    def encode(self, table):
+        if self.vocabs is None:
+            self.vocabs = {}
+            for name, column in zip(table.column_names, table.columns):
+                if ((pa.types.is_string(column.type) or pa.types.is_large_string(column.type))
+                        and pc.count_distinct(column).as_py() * 2 <= len(column)):
+                    self.vocabs[name] = Vocabulary()
+
+        columns = []
+        for name, column in zip(table.column_names, table.columns):
+            if name in self.vocabs:
+                column = self._encode_column(self.vocabs[name], column)
+            columns.append(column)
+        # 不保留 pandas 元数据：字典列读回 pandas 时本来就是 category
+        return pa.Table.from_arrays(columns, names=table.column_names)
+
+    @staticmethod
+    def _encode_column(vocab, column):
+        encoded = column.combine_chunks().dictionary_encode()
+        # 本块字典编号 -> 全局字典编号
+        local_to_global = pa.array([vocab.id(v) for v in encoded.dictionary.to_pylist()], type=pa.int32())
+        indices = pc.take(local_to_global, encoded.indices)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(vocab.keys, type=pa.string()))
+
+
+class _ColumnarSink:
+    def __init__(self, path, opener):
+        self.path = path
+        self.opener = opener
+        self.encoder = _DictionaryEncoder()
+        self.file = None
+        self.schema = None
+
+    def write(self, df):
+        chunk = self.encoder.encode(pa.Table.from_pandas(df, preserve_index=False))
+        if self.file is None:
+            self.schema = chunk.schema
+            self.file = self.opener(self.path, self.schema)
+        elif not chunk.schema.equals(self.schema):
+            chunk = chunk.cast(self.schema)
+        self.file.write_table(chunk)
+
+    def close(self):
+        if self.file is None:
+            self.file = self.opener(self.path, pa.schema([]))
+        self.file.close()
+
+
+class _ColumnarTableWriter(_TableWriter):
+    """每张表写成 output_dir 下的一个文件，文件名为 表名 + suffix，每个分块直接追加到文件"""
+
+    suffix = None
+
+    def __init__(self, output_dir):
+        if pa is None:
+            raise ImportError("parquet / arrow 输出需要安装 pyarrow（pip install pyarrow）")
+        os.makedirs(output_dir, exist_ok=True)
+        super().__init__(output_dir)
+
+    @abc.abstractmethod
+    def _open_file(self, path, schema):
+        """按 schema 创建 path 处的列式文件写入器（带 write_table / close）"""
+
+    def _open_sink(self, name):
+        return _ColumnarSink(os.path.join(self.location, name + self.suffix), self._open_file)
+
+
+class ParquetTableWriter(_ColumnarTableWriter):
+    """每张表一个 .parquet 文件，每个分块一个 row group"""
+
+    suffix = '.parquet'
+
+    def _open_file(self, path, schema):
+        return pq.ParquetWriter(path, schema)
+
+
+class ArrowTableWriter(_ColumnarTableWriter):
+    """每张表一个 Arrow IPC 文件（.arrow，不压缩，可 pa.memory_map 后零拷贝读取）"""
+
+    suffix = '.arrow'
+
+    def _open_file(self, path, schema):
+        return pa_ipc.new_file(path, schema, options=pa_ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+
+
+def open_table_writer(output_format, output_path):
+    """
+    按格式创建输出后端
+    - excel / excel_stream：写入 output_path（.xlsx）
+    - parquet / arrow：写入与 output_path 同名（去掉扩展名）的目录，每张表一个文件
+    """
+    if output_format == 'excel':
+        return ExcelTableWriter(output_path)
+    if output_format == 'excel_stream':
+        return StreamingExcelTableWriter(output_path)
+    output_dir = os.path.splitext(output_path)[0]
+    if output_format == 'parquet':
+        return ParquetTableWriter(output_dir)
+    if output_format == 'arrow':
+        return ArrowTableWriter(output_dir)
+    raise ValueError(f"不支持的输出格式：{output_format}（可选：{', '.join(OUTPUT_FORMATS)}）")
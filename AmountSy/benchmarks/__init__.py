@@ -0,0 +1,11 @@
+"""
+AmountSy 基准测试（asv 约定：time_* 计时、peakmem_* 峰值内存，setup_cache 生成的合成 depot 在同一类的各项间共用）
+- asv run（配置见上级目录 asv.conf.json，使用当前 Python 环境）
+- 或不安装 asv：python -m benchmarks.run，见 benchmarks/run.py
+"""
+
+import sys
+from pathlib import Path
+
+# 引用上级目录的 amountsy 公共模块和统计脚本
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,269 @@
+"""
+各统计流程的基准：目录计数、场景分析、questphase 表格导出、图表生成
+所有数据来自 amountsy.synthetic_depot（固定 seed），与真实 depot 无关，可在任意 Linux CI 上运行
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from amountsy.async_walker import AsyncDirWalker
+from amountsy.bundle import BundleReader, open_bundle
+from amountsy.depot_index import DepotIndex, scan
+from amountsy import plotting
+from amountsy.depot_walker import AnimationLister, DirWalker, ExtensionCounter, SceneCollector, crawl
+from amountsy.prefetch import ReadAhead
+from amountsy.questphase import aggregate_files, export_compact_tables
+from amountsy.quest_paths import QuestTaxonomy, quest_path_category
+from amountsy.scene_stats import SceneStatsCache
+from amountsy.synthetic_depot import generate_depot
+
+# 合成 depot 规模（覆盖 synthetic_depot.DEFAULT_COUNTS）
+DEPOT_COUNTS = {
+    'main_quests': 30,
+    'side_quests': 60,
+    'minor_quests': 60,
+    'scenes_per_quest': 4,
+    'anim_dirs': 200,
+    'exports': 2,
+}
+
+# 模拟网络盘（SMB/NFS）上每次 scandir 的往返延迟（秒）
+MOUNT_LATENCY = 0.002
+
+
+def _generate():
+    """
+    在当前目录下生成合成 depot，返回可 pickle 的路径信息（asv 会把 setup_cache 的结果传给各项）
+    asv 在临时目录中运行 setup_cache，结束后自动清理
+    """
+    root = os.path.abspath('synthetic')
+    info = generate_depot(root, seed=0, **DEPOT_COUNTS)
+    return {
+        'root': root,
+        'depot': str(info['depot']),
+        'quest': str(info['quest']),
+        'animations': str(info['animations']),
+        'scene_files': [str(f) for f in info['scene_files']],
+        'exports': [str(f) for f in info['exports']],
+    }
+
+
+def _quiet():
+    """各流程都会打印进度，计时时丢弃输出"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+@contextlib.contextmanager
+def _mount_latency(delay=MOUNT_LATENCY):
+    """每次 os.scandir 前等待 delay 秒，模拟高延迟挂载"""
+    scandir = os.scandir
+
+    def slow_scandir(path='.'):
+        time.sleep(delay)
+        return scandir(path)
+
+    os.scandir = slow_scandir
+    try:
+        yield
+    finally:
+        os.scandir = scandir
+
+
+class Counting:
+    """QuestAmount / Amountsy2077 / AnimalAmount / ArtDataGraph：按扩展名计数、动画列表与扩展名汇总"""
+
+    timeout = 300
+
+    def setup_cache(self):
+        info = _generate()
+        # 预先建好索引，计时项只测增量刷新（无变化）+ 回放
+        with _quiet():
+            scan(info['quest'], [ExtensionCounter()], os.path.join(info['root'], 'index.sqlite'), info['depot'])
+        return info
+
+    def time_crawl_quest_extensions(self, info):
+        counter = ExtensionCounter(['.questphase', '.scenesolution'])
+        crawl(info['quest'], [counter])
+        counter.count((), '.questphase')
+
+    def time_crawl_all_extensions(self, info):
+        crawl(info['quest'], [ExtensionCounter()])
+
+    def time_crawl_animations(self, info):
+        crawl(info['animations'], [AnimationLister()])
+
+    def time_crawl_all_extensions_latency(self, info):
+        """高延迟挂载上逐个目录串行遍历"""
+        with _mount_latency():
+            crawl(info['quest'], [ExtensionCounter()])
+
+    def time_crawl_all_extensions_latency_async(self, info):
+        """高延迟挂载上用 AsyncDirWalker 并发列目录（Amountsy2077 等的 SCAN_CONCURRENCY = 32）"""
+        with _mount_latency():
+            crawl(info['quest'], [ExtensionCounter()], AsyncDirWalker(concurrency=32))
+
+    def time_index_refresh_replay(self, info):
+        with _quiet():
+            scan(info['quest'], [ExtensionCounter(['.questphase', '.scenesolution'])],
+                 os.path.join(info['root'], 'index.sqlite'), info['depot'])
+
+    def time_index_build_threads(self, info):
+        """从空索引建立整个 depot 的索引（一级子目录由 4 个线程并行扫描）并按扩展名汇总"""
+        index_file = os.path.join(info['root'], 'index_threads.sqlite')
+        if os.path.exists(index_file):
+            os.remove(index_file)
+        with DepotIndex(index_file, info['depot']) as index:
+            index.refresh(workers=4)
+            index.ext_histogram()
+
+
+class SceneAnalysis:
+    """scnSceneJson / SceneJason / AI 分析脚本：场景收集与统计"""
+
+    timeout = 300
+
+    def setup_cache(self):
+        info = _generate()
+        cache_file = os.path.join(info['root'], 'scene_cache.sqlite')
+        import scnSceneJson
+        with _quiet(), SceneStatsCache(cache_file) as cache:
+            scnSceneJson.analyze_scene_files(info['scene_files'], workers=1, cache=cache)
+        info['cache_file'] = cache_file
+        # CI 使用的 depot 快照压缩包（包内路径以 depot/ 开头）
+        info['bundle'] = shutil.make_archive(os.path.join(info['root'], 'depot'), 'zip', info['root'], 'depot')
+        return info
+
+    def time_collect_scenes(self, info):
+        crawl(info['quest'], [SceneCollector(exclude_folder='Versions')])
+
+    def time_walk_scenes_pruned(self, info):
+        """Versions 目录在进入前剪掉（scnSceneJson 的扫描方式）"""
+        walker = DirWalker(exclude_dirs=('*Versions*',), extensions=['.scnlocjson'])
+        for _ in walker.walk(info['quest']):
+            pass
+
+    def time_analyze_serial(self, info):
+        import scnSceneJson
+        with _quiet():
+            scnSceneJson.analyze_scene_files(info['scene_files'], workers=1)
+
+    def time_analyze_read_ahead(self, info):
+        """读取线程预读、当前线程解析（scnSceneJson 默认的预读配置）"""
+        import scnSceneJson
+        read_ahead = ReadAhead(scnSceneJson.READ_AHEAD_WORKERS, scnSceneJson.READ_AHEAD_DEPTH,
+                               scnSceneJson.READ_AHEAD_MEMORY)
+        with _quiet():
+            scnSceneJson.analyze_scene_files(info['scene_files'], workers=1, read_ahead=read_ahead)
+
+    def time_analyze_zip_bundle(self, info):
+        """不解压，直接从 zip 快照中收集并分析场景（scnSceneJson 的 SCENE_BUNDLE 模式）"""
+        import scnSceneJson
+        with _quiet(), open_bundle(info['bundle']) as bundle:
+            scene_files = scnSceneJson.collect_bundle_scenes(bundle)
+            scnSceneJson.analyze_scene_files(scene_files, workers=1, read_ahead=BundleReader(bundle))
+
+    def time_analyze_cached(self, info):
+        import scnSceneJson
+        with _quiet(), SceneStatsCache(info['cache_file']) as cache:
+            scnSceneJson.analyze_scene_files(info['scene_files'], workers=1, cache=cache)
+
+    def time_quest_categories(self, info):
+        for scene_file in info['scene_files']:
+            quest_path_category(scene_file)
+
+    def time_quest_categories_by_dir(self, info):
+        """按父目录缓存的类别解析（scnSceneJson 汇总时的方式）"""
+        taxonomy = QuestTaxonomy()
+        for scene_file in info['scene_files']:
+            taxonomy.resolve(scene_file)
+
+
+class QuestphaseExport:
+    """JsonData / JsonData2 / jsonData3：节点导出文件的聚合与表格写出"""
+
+    timeout = 300
+
+    def setup_cache(self):
+        return _generate()
+
+    def setup(self, info):
+        self.out_dir = os.path.join(info['root'], 'out')
+        os.makedirs(self.out_dir, exist_ok=True)
+
+    def time_aggregate(self, info):
+        aggregate_files(info['exports'])
+
+    def peakmem_aggregate(self, info):
+        aggregate_files(info['exports'])
+
+    def time_export_excel(self, info):
+        with _quiet():
+            export_compact_tables(info['exports'], os.path.join(self.out_dir, 'compact.xlsx'))
+
+    def time_export_excel_stream(self, info):
+        with _quiet():
+            export_compact_tables(info['exports'], os.path.join(self.out_dir, 'compact.xlsx'), 'excel_stream')
+
+    def time_export_described_rollups(self, info):
+        with _quiet():
+            export_compact_tables(info['exports'], os.path.join(self.out_dir, 'compact.xlsx'), 'excel_stream',
+                                  high_freq_layout='quest_types', class_descriptions=True,
+                                  class_rollups=('manager', 'base'))
+
+
+class Charts:
+    """scnSceneJson.generate_charts：按任务类别汇总后的图表渲染（进程池并行 / 串行 / 数据未变化跳过）"""
+
+    timeout = 300
+
+    def setup_cache(self):
+        info = _generate()
+        import scnSceneJson
+        with _quiet():
+            analyzed = scnSceneJson.analyze_scene_files(info['scene_files'], workers=1)
+        results = []
+        for scene_file, result in analyzed:
+            if result:
+                result['quest_category'] = quest_path_category(scene_file)
+                results.append(result)
+        info['results'] = results
+        return info
+
+    def setup(self, info):
+        # matplotlib 导入和字体解析在 amountsy.plotting 中缓存，预先完成，不计入渲染耗时
+        with _quiet():
+            plotting.chinese_font()
+        self.out_dir = Path(info['root']) / 'charts'
+        self.out_dir.mkdir(exist_ok=True)
+        # 与 scnSceneJson.main 相同的按类别汇总
+        self.quest_stats = defaultdict(lambda: {
+            'scenes': 0, 'choice_sections': 0, 'normal_sections': 0,
+            'total_sections': 0, 'total_lines': 0, 'files': []
+        })
+        for result in info['results']:
+            stats = self.quest_stats[result['quest_category']]
+            stats['scenes'] += 1
+            for key in ('choice_sections', 'normal_sections', 'total_sections', 'total_lines'):
+                stats[key] += result[key]
+            stats['files'].append(result['scene_name'])
+
+    def time_generate_charts(self, info):
+        import scnSceneJson
+        with _quiet():
+            scnSceneJson.generate_charts(self.quest_stats, info['results'], self.out_dir, force=True)
+
+    def time_generate_charts_serial(self, info):
+        import scnSceneJson
+        with _quiet():
+            scnSceneJson.generate_charts(self.quest_stats, info['results'], self.out_dir, workers=1, force=True)
+
+    def time_generate_charts_unchanged(self, info):
+        """数据未变化：只计算数据哈希，跳过渲染"""
+        import scnSceneJson
+        with _quiet():
+            scnSceneJson.generate_charts(self.quest_stats, info['results'], self.out_dir)
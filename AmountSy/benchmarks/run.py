@@ -0,0 +1,112 @@
+"""
+不依赖 asv 的基准运行器（CI 用）：python -m benchmarks.run [-k 过滤] [--repeat N] [--json 结果.json]
+                                                       [--compare 基线.json --tolerance 0.25]
+- 按 asv 约定调用 setup_cache / setup / time_* / peakmem_*（setup 抛出 NotImplementedError 时跳过该项），
+  每个类在独立的临时目录中生成合成 depot
+- time_* 取 repeat 次中的最小值；peakmem_* 用 tracemalloc 记录 Python 分配的峰值
+- 给定 --compare 时，比基线慢（或内存高）超过 tolerance 的项视为回归，退出码为 1
+"""
+
+import argparse
+import inspect
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import bench_pipelines
+
+BENCHMARK_MODULES = (bench_pipelines,)
+
+
+def _benchmark_classes():
+    for module in BENCHMARK_MODULES:
+        for name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ == module.__name__:
+                yield f"{module.__name__.rsplit('.', 1)[-1]}.{name}", cls
+
+
+def _measure(bench, method, args, repeat):
+    if method.startswith('peakmem_'):
+        tracemalloc.start()
+        try:
+            getattr(bench, method)(*args)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        getattr(bench, method)(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(pattern=None, repeat=3):
+    """运行所有（名称匹配 pattern 的）基准，返回 {名称: 秒数或字节数}"""
+    results = {}
+    cwd = os.getcwd()
+    for class_name, cls in _benchmark_classes():
+        methods = [m for m in dir(cls) if m.startswith(('time_', 'peakmem_'))
+                   and (pattern is None or re.search(pattern, f"{class_name}.{m}"))]
+        if not methods:
+            continue
+        with tempfile.TemporaryDirectory(prefix='amountsy_bench_') as work_dir:
+            os.chdir(work_dir)
+            try:
+                bench = cls()
+                args = (bench.setup_cache(),) if hasattr(bench, 'setup_cache') else ()
+                for method in methods:
+                    if hasattr(bench, 'setup'):
+                        try:
+                            bench.setup(*args)
+                        except NotImplementedError as e:
+                            print(f"  {class_name}.{method:<40} 跳过（{e}）")
+                            continue
+                    value = results[f"{class_name}.{method}"] = _measure(bench, method, args, repeat)
+                    unit = f"{value / 1024 / 1024:10.2f} MB" if method.startswith('peakmem_') else f"{value * 1000:10.1f} ms"
+                    print(f"  {class_name}.{method:<40} {unit}")
+            finally:
+                os.chdir(cwd)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """返回回归项 [(名称, 基线, 当前)]"""
+    return [(name, baseline[name], value) for name, value in results.items()
+            if name in baseline and value > baseline[name] * (1 + tolerance)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AmountSy 基准测试（合成 depot）")
+    parser.add_argument('-k', dest='pattern', help="只运行名称匹配该正则的基准")
+    parser.add_argument('--repeat', type=int, default=3, help="time_* 重复次数（取最小值）")
+    parser.add_argument('--json', dest='json_out', help="结果写入 JSON 文件")
+    parser.add_argument('--compare', help="与基线 JSON 比较")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="允许的变慢比例（默认 0.25）")
+    args = parser.parse_args(argv)
+
+    print("⏱️  运行基准测试...")
+    results = run(args.pattern, args.repeat)
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"✅ 结果已保存到: {args.json_out}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, old, new in regressions:
+            print(f"❌ 回归：{name} {old:.4g} → {new:.4g}（+{(new / old - 1) * 100:.0f}%）")
+        if regressions:
+            return 1
+        print(f"✅ 与基线相比无回归（容差 {args.tolerance:.0%}）")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,12 +1,18 @@
+import sys
+from pathlib import Path
+
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 
-# 设置中文字体和图表样式
+# 引用上级目录的 amountsy 公共模块
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from amountsy import plotting
 
+# 设置中文字体和图表样式；Agg 后端只保存图片，不弹窗
+plt = plotting.pyplot()
+plt.style.use('default')
 plt.rcParams['font.sans-serif'] = ['Microsoft YaHei']  # 若为Windows系统，取消注释此行
 plt.rcParams['axes.unicode_minus'] = False
-plt.style.use('default')
 
 # 1. 数据预处理（修正后：确保所有列表长度一致，共59条数据）
 data = {
@@ -125,8 +131,6 @@ fig.text(0.02, 0.02, '注：左轴为场景数量（对数刻度），右轴为
 # 调整布局（避免标签被截断）
 plt.tight_layout()
 
-# 保存图片（可选，支持高分辨率）
-# plt.savefig('quest_analysis.png', dpi=300, bbox_inches='tight')
-
-# 显示图表
-plt.show()
\ No newline at end of file
+# 保存图片（不再弹窗显示，图表只输出到文件）
+plt.savefig('quest_analysis.png', dpi=300, bbox_inches='tight')
+plt.close()
\ No newline at end of file
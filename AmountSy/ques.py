@@ -18,19 +18,27 @@ import datetime
 #CSV_FILE = r"D:\Data\PYh\AmountSy\Out\main_quests_prologue_statistics.csv"
 # !/usr/bin/env python3
 import os
-import glob
 import datetime
 
+from amountsy.depot_walker import ExtensionCounter
+from amountsy.depot_index import scan
+
 # 路径设置
 BASE_DIR = r"D:\AppSoft\Sy2077\2077\2077\CDPR2077\r6\depot\base\quest\main_quests\epilogue"
 OUTPUT_FILE = r"D:\Data\PYh\AmountSy\Out\epilogue_quests_statistics.txt"
 CSV_FILE = r"D:\Data\PYh\AmountSy\Out\epilogue_quests_statistics.csv"
-
-
-def count_files(folder_path):
-    """统计指定文件夹及其子文件夹中目标文件的数量"""
-    questphase = len(glob.glob(os.path.join(folder_path, "**", "*.questphase"), recursive=True))
-    scenesolution = len(glob.glob(os.path.join(folder_path, "**", "*.scenesolution"), recursive=True))
+# depot 文件索引（增量刷新，重复统计无需重新遍历整棵目录树；设为 None 则每次直接遍历）
+DEPOT_ROOT = r"D:\AppSoft\Sy2077\2077\2077\CDPR2077\r6\depot"
+INDEX_FILE = r"D:\Data\PYh\AmountSy\Out\depot_index.sqlite"
+# 同时在途的目录请求数：depot 在网络盘（SMB/NFS）上时设为 32 左右，列目录 / stat 的往返延迟重叠进行，
+# 使用索引时作为刷新线程数；0 表示逐个目录串行遍历（本地磁盘）
+SCAN_CONCURRENCY = 0
+
+
+def count_files(counter, folder):
+    """统计指定文件夹及其子文件夹中目标文件的数量（从 BASE_DIR 的单次遍历结果中汇总）"""
+    questphase = counter.count([folder], ".questphase")
+    scenesolution = counter.count([folder], ".scenesolution")
     return questphase, scenesolution
 
 
@@ -54,6 +62,10 @@ def main():
     output_dir = os.path.dirname(OUTPUT_FILE)
     os.makedirs(output_dir, exist_ok=True)
 
+    # BASE_DIR 整棵树只遍历一次（或从索引读取）
+    counter = ExtensionCounter([".questphase", ".scenesolution"])
+    scan(BASE_DIR, [counter], INDEX_FILE, DEPOT_ROOT, SCAN_CONCURRENCY)
+
     # 初始化输出文件
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
         f.write("Side Quests 文件夹统计报告\n")
@@ -80,7 +92,7 @@ def main():
                 continue
 
             # 统计文件
-            qp_count, ss_count = count_files(folder_path)
+            qp_count, ss_count = count_files(counter, folder)
             total_questphase += qp_count
             total_scenesolution += ss_count
 
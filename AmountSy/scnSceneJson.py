@@ -7,207 +7,296 @@
 - 所有结果统一输出到一个表格
 """
 
-import json
 import os
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from collections import defaultdict
 import csv
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib import font_manager
+from concurrent.futures import ProcessPoolExecutor
+
+from amountsy.bundle import BundleReader, BundleWalker, open_bundle
+from amountsy.depot_walker import DirWalker
+from amountsy.instrument import RunReport, report_path
+from amountsy import plotting
+from amountsy.chart_render import ChartReport, Panel, render_reports
+from amountsy.quest_paths import QuestTaxonomy
+from amountsy.prefetch import ReadAhead, map_prefetched
+from amountsy.scene_stats import extract_scene_stats, scene_stats_from_prefetched, PREFETCH_MAX_SIZE, SceneStatsCache
 
 # -------------------------- 图表配置（可按需调整）--------------------------
-# 设置中文字体（解决中文显示乱码问题）
-try:
-    # Windows系统
-    font = font_manager.FontProperties(fname='C:/Windows/Fonts/simhei.ttf')  # 黑体
-except:
-    try:
-        # macOS系统
-        font = font_manager.FontProperties(fname='/System/Library/Fonts/PingFang.ttc')  # 苹方
-    except:
-        # Linux系统
-        font = font_manager.FontProperties(fname='/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf')
-        print("警告：未找到中文字体，将使用英文显示")
+# matplotlib 在生成图表时才导入（Agg 后端，不弹窗），中文字体由 amountsy.plotting 解析并缓存
+# 各子图由 amountsy.chart_render 在进程池中并行渲染后拼接
+CHART_RC = {
+    'figure.figsize': (18, 14),  # 图表总大小（2×2 网格均分，每个子图 9×7 英寸）
+    'figure.constrained_layout.use': True,  # 自动调整子图间距
+}
+GENERATE_CHARTS = True  # False 时只输出 CSV（不导入 matplotlib）
+CHART_WORKERS = os.cpu_count() or 1  # 图表渲染进程数（1 表示串行）
+
+# -------------------------- 并行分析 / 缓存配置 --------------------------
+WORKERS = os.cpu_count() or 1  # 分析进程数（1 表示串行）
+CHUNK_SIZE = 16  # 每个进程一次领取的文件数，减少进程间通信次数
+SCENE_CACHE_FILE = r'D:\Data\PYh\AmountSy\Out\scene_stats_cache.sqlite'  # 场景统计缓存（None 表示不使用缓存）
+SCENE_CACHE_USE_HASH = False  # 时间戳变化但内容未变仍命中缓存（比对内容哈希，重新检出/解包后时间戳被重置时开启）
+# 各阶段耗时报告（JSON，每次运行一个文件；None 表示只打印不保存）
+# 设置环境变量 AMOUNTSY_PROFILE=1 / AMOUNTSY_TRACEMALLOC=1 可额外记录 cProfile 热点 / 内存峰值
+TIMING_REPORT_DIR = r'D:\Data\PYh\AmountSy\Out\timing'
+
+# -------------------------- 预读配置（depot 在慢速/网络存储上时，读取与解析重叠进行）--------------------------
+READ_AHEAD_WORKERS = 4  # 预读线程数（0 表示不预读，由解析进程各自读取文件）
+READ_AHEAD_DEPTH = 64  # 最多预读领先解析的文件数
+READ_AHEAD_MEMORY = 256 * 1024 * 1024  # 已预读、尚未解析的字节数上限
+
+# -------------------------- 压缩包输入（CI 上的 depot 快照，不解压直接读取）--------------------------
+SCENE_BUNDLE = None  # depot 快照压缩包（zip / tar）；设置后从包内读取场景，不再扫描 main() 中的 5 个磁盘路径
+BUNDLE_QUEST_ROOT = 'depot/base/quest'  # 包内的 quest 目录
+# 包内扫描的根目录（相对 BUNDLE_QUEST_ROOT，与磁盘模式的 5 个路径对应）
+BUNDLE_TARGET_DIRS = ('main_quests/epilogue', 'main_quests/part1', 'main_quests/prologue', 'side_quests',
+                      'minor_quests')
+# 要排除的文件夹（目录名通配，不区分大小写）：命中的目录在遍历时直接跳过，不进入其子树
+SCENE_EXCLUDE_DIRS = ('*Versions*',)
+
+
+def scene_stats_to_result(stats, file_path):
+    """把公共场景统计转换为本脚本的结果格式"""
+    return {
+        'scene_name': stats['scene_name'] if stats['scene_name'] is not None else '',
+        'choice_sections': stats['choice_sections'],
+        'normal_sections': stats['total_sections'] - stats['choice_sections'],
+        'total_sections': stats['total_sections'],
+        'total_lines': stats['total_lines'],
+        'file_path': str(file_path)
+    }
 
-# 图表样式配置
-plt.rcParams['figure.figsize'] = (16, 12)  # 图表总大小
-plt.rcParams['font.size'] = 10  # 基础字体大小
-plt.rcParams['axes.unicode_minus'] = False  # 解决负号显示问题
-plt.rcParams['savefig.dpi'] = 300  # 图片分辨率
-plt.rcParams['figure.constrained_layout.use'] = True  # 自动调整子图间距
+
+def parse_scene_stats(file_path):
+    """解析单个场景的公共统计，失败时打印错误并返回 None（供进程池调用）"""
+    try:
+        return extract_scene_stats(file_path)
+    except Exception as e:
+        print(f"Error processing {file_path}: {e}")
+        return None
 
 
-def analyze_scene_file(file_path):
-    """分析单个.scnlocjson文件"""
+def parse_prefetched_scene(file_path, raw, error):
+    """解析预读的场景字节，失败时打印错误并返回 None（供 map_prefetched 调用）"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        scene_name = data.get('SceneName', '')
-        sections = data.get('SectionsInScene', [])
-
-        choice_sections = 0
-        normal_sections = 0
-        total_lines = 0
-
-        for section in sections:
-            if section.get('IsChoiceSection', False):
-                choice_sections += 1
-            else:
-                normal_sections += 1
-
-            # 统计对话行数
-            total_lines += len(section.get('LinesInSection', []))
-
-        return {
-            'scene_name': scene_name,
-            'choice_sections': choice_sections,
-            'normal_sections': normal_sections,
-            'total_sections': choice_sections + normal_sections,
-            'total_lines': total_lines,
-            'file_path': str(file_path)
-        }
+        if error is not None:
+            raise error
+        return scene_stats_from_prefetched(file_path, raw)
     except Exception as e:
         print(f"Error processing {file_path}: {e}")
         return None
 
 
+def analyze_scene_file(file_path):
+    """分析单个.scnlocjson文件"""
+    stats = parse_scene_stats(file_path)
+    return scene_stats_to_result(stats, file_path) if stats is not None else None
+
+
+def analyze_scene_files(scene_files, workers=WORKERS, chunksize=CHUNK_SIZE, cache=None, read_ahead=None):
+    """
+    批量分析场景文件，返回 [(文件路径, 分析结果)]
+    - 传入 cache 时先查缓存，只有变化过的场景才会重新解析
+    - workers > 1 时使用进程池分块并行解析 JSON
+    - 传入 read_ahead（amountsy.prefetch.ReadAhead）时由读取线程预读后面的文件，解析方只处理内存中的字节
+    - 结果顺序始终与 scene_files 一致，汇总结果与串行完全相同
+    """
+    total = len(scene_files)
+    all_stats = [None] * total
+    pending = list(range(total))
+    if cache is not None:
+        pending = []
+        for i, scene_file in enumerate(scene_files):
+            all_stats[i] = cache.get(scene_file)
+            if all_stats[i] is None:
+                pending.append(i)
+        print(f"缓存命中 {total - len(pending)} 个场景，需要重新解析 {len(pending)} 个")
+
+    pending_files = [scene_files[i] for i in pending]
+
+    def collect(parsed):
+        for n, (i, stats) in enumerate(zip(pending, parsed), 1):
+            if n % 50 == 0:
+                print(f"处理进度: {n}/{len(pending)}")
+            all_stats[i] = stats
+            if stats is not None and cache is not None:
+                cache.put(scene_files[i], stats)
+
+    if read_ahead is not None:
+        workers = workers if len(pending_files) >= 2 else 1
+        print(f"使用 {read_ahead.workers} 个线程预读、{workers} 个{'进程' if workers > 1 else '线程'}解析")
+        collect(map_prefetched(parse_prefetched_scene, pending_files, read_ahead, workers, chunksize))
+    elif workers <= 1 or len(pending_files) < 2:
+        collect(map(parse_scene_stats, pending_files))
+    else:
+        print(f"使用 {workers} 个进程并行分析（每批 {chunksize} 个文件）")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            collect(executor.map(parse_scene_stats, pending_files, chunksize=chunksize))
+
+    return [(scene_file, scene_stats_to_result(stats, scene_file) if stats is not None else None)
+            for scene_file, stats in zip(scene_files, all_stats)]
+
+
+def collect_bundle_scenes(bundle, quest_root=BUNDLE_QUEST_ROOT, target_dirs=BUNDLE_TARGET_DIRS):
+    """
+    在压缩包内按磁盘模式相同的层级规则收集场景：根目录 → 任务文件夹 → scenes 文件夹 → 递归所有子目录（排除Versions）
+    返回包内成员路径（PurePosixPath）列表
+    """
+    walker = BundleWalker(bundle, exclude_dirs=SCENE_EXCLUDE_DIRS, extensions=['.scnlocjson'])
+    scene_files = []
+    for target in target_dirs:
+        root = f"{quest_root}/{target}"
+        found = 0
+        for entry, rel_dir in walker.walk(root):
+            # rel_dir 为 (任务文件夹, 'scenes', ...)：只取任务文件夹下 scenes 目录中的文件
+            if rel_dir[1:2] == ('scenes',):
+                scene_files.append(PurePosixPath(entry.path))
+                found += 1
+        print(f"📦 包内目录 {root}：有效文件 {found} 个，跳过 {len(walker.pruned)} 个 Versions 文件夹")
+    return scene_files
+
+
+QUEST_TAXONOMY = QuestTaxonomy()  # get_quest_category 共用的类别缓存
+
+
 def get_quest_category(file_path):
     """
     根据文件路径确定quest类别（修复支线/小任务层级错误）
     - main_quests：向上两层，按 qxxx 级别统计（如 main_quests/part1/q105）
     - side_quests/minor_quests：保持原层级（如 side_quests/sq027，过滤scenes目录）
+    规则实现在 amountsy.quest_paths（结果按父目录缓存，同一目录下的文件只解析一次）
     """
-    path = Path(file_path)
-    path_parts = path.parts
-
-    try:
-        quest_idx = path_parts.index('quest')
-        if quest_idx + 1 >= len(path_parts):
-            return 'unknown'
-
-        level1 = path_parts[quest_idx + 1]  # main_quests/side_quests/minor_quests
-
-        # 主线任务：向上两层，统计到 qxxx 级别（level1/level2/level3）
-        if level1 == 'main_quests':
-            if quest_idx + 3 < len(path_parts):
-                level2 = path_parts[quest_idx + 2]  # part1/prologue/epilogue
-                level3 = path_parts[quest_idx + 3]  # q001/q105等
-                if level3.startswith('q'):
-                    return f"{level1}/{level2}/{level3}"
-            elif quest_idx + 2 < len(path_parts):
-                return f"{level1}/{path_parts[quest_idx + 2]}"
-
-        # 支线/小任务：保持原层级（过滤scenes目录，只保留任务文件夹）
-        else:
-            task_parts = []
-            for part in path_parts[quest_idx + 1:]:
-                # 停止条件：遇到scenes目录或文件（含后缀）
-                if part == 'scenes' or '.' in part or len(task_parts) >= 2:
-                    break
-                task_parts.append(part)
-            return '/'.join(task_parts) if task_parts else level1
-
-    except ValueError:
-        pass
-
-    return 'unknown'
+    return QUEST_TAXONOMY.resolve_name(file_path)
 
 
-def generate_charts(quest_stats, all_results, output_dir):
-    """生成统计图表并保存（适配混合层级显示）"""
-    print("\n开始生成统计图表...")
+MAIN_COLOR = '#2E86AB'  # 主线任务
+OTHER_COLOR = '#F18F01'  # 支线/小任务
 
-    # 1. 处理数据（筛选有效数据，避免空值）
-    # 按对话总量排序，取Top20任务类别
-    sorted_quests = sorted(quest_stats.items(), key=lambda x: x[1]['total_lines'], reverse=True)[:20]
-    # 处理标签显示：换行分隔层级，避免过长
-    quest_names = [q[0].replace('/', '\n') for q, _ in sorted_quests]
-    quest_totals = [s['total_lines'] for _, s in sorted_quests]
-    quest_choice = [s['choice_sections'] for _, s in sorted_quests]
-    quest_normal = [s['normal_sections'] for _, s in sorted_quests]
 
-    # 总体数据
-    total_scenes = len(all_results)
-    total_choice = sum(r['choice_sections'] for r in all_results)
-    total_normal = sum(r['normal_sections'] for r in all_results)
-    total_sections = total_choice + total_normal
+def _quest_type_legend(ax, font, loc):
+    import matplotlib.patches as mpatches
+    main_patch = mpatches.Patch(color=MAIN_COLOR, label='主线任务')
+    other_patch = mpatches.Patch(color=OTHER_COLOR, label='支线/小任务')
+    ax.legend(handles=[main_patch, other_patch], prop=font, fontsize=10, loc=loc)
 
-    # 2. 创建子图（2行2列，共4个图表）
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(18, 14))
 
-    # -------------------------- 图表1：Top20任务对话总量柱状图 --------------------------
-    colors1 = ['#2E86AB' if 'main_quests' in name else '#F18F01' for name, _ in sorted_quests]  # 主线蓝色，其他橙色
-    bars1 = ax1.bar(range(len(quest_names)), quest_totals, color=colors1, alpha=0.8, edgecolor='white', linewidth=1)
-    ax1.set_title('Top20任务对话总量分布（主线按qxxx统计）', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
-    ax1.set_xlabel('任务类别', fontproperties=font, fontsize=12)
-    ax1.set_ylabel('对话总行数', fontproperties=font, fontsize=12)
-    ax1.set_xticks(range(len(quest_names)))
-    ax1.set_xticklabels(quest_names, fontproperties=font, rotation=0, fontsize=8)
-    ax1.grid(axis='y', alpha=0.3, linestyle='--')
+def _draw_top_lines(ax, font, quest_names, quest_totals, is_main):
+    """图表1：Top20任务对话总量柱状图"""
+    colors1 = [MAIN_COLOR if main else OTHER_COLOR for main in is_main]  # 主线蓝色，其他橙色
+    bars1 = ax.bar(range(len(quest_names)), quest_totals, color=colors1, alpha=0.8, edgecolor='white', linewidth=1)
+    ax.set_title('Top20任务对话总量分布（主线按qxxx统计）', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('任务类别', fontproperties=font, fontsize=12)
+    ax.set_ylabel('对话总行数', fontproperties=font, fontsize=12)
+    ax.set_xticks(range(len(quest_names)))
+    ax.set_xticklabels(quest_names, fontproperties=font, rotation=0, fontsize=8)
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
 
     # 添加图例
-    main_patch = mpatches.Patch(color='#2E86AB', label='主线任务')
-    other_patch = mpatches.Patch(color='#F18F01', label='支线/小任务')
-    ax1.legend(handles=[main_patch, other_patch], prop=font, fontsize=10, loc='upper right')
+    _quest_type_legend(ax, font, 'upper right')
 
     # 在柱子上添加数值标签
     for bar, value in zip(bars1, quest_totals):
         height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width() / 2., height + max(quest_totals) * 0.01,
-                 f'{int(value)}', ha='center', va='bottom', fontsize=8, fontweight='bold')
-
-    # -------------------------- 图表2：Top20任务选择段vs普通段堆叠柱状图 --------------------------
-    ax2.bar(range(len(quest_names)), quest_choice, label='选择段', color='#A23B72', alpha=0.8, edgecolor='white',
-            linewidth=1)
-    ax2.bar(range(len(quest_names)), quest_normal, bottom=quest_choice, label='普通段', color='#3F88C5', alpha=0.8,
-            edgecolor='white', linewidth=1)
-    ax2.set_title('Top20任务对话段类型分布', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
-    ax2.set_xlabel('任务类别', fontproperties=font, fontsize=12)
-    ax2.set_ylabel('段数', fontproperties=font, fontsize=12)
-    ax2.set_xticks(range(len(quest_names)))
-    ax2.set_xticklabels(quest_names, fontproperties=font, rotation=0, fontsize=8)
-    ax2.legend(prop=font, fontsize=11, loc='upper right')
-    ax2.grid(axis='y', alpha=0.3, linestyle='--')
-
-    # -------------------------- 图表3：总体对话段类型占比饼图 --------------------------
+        ax.text(bar.get_x() + bar.get_width() / 2., height + max(quest_totals) * 0.01,
+                f'{int(value)}', ha='center', va='bottom', fontsize=8, fontweight='bold')
+
+
+def _draw_section_types(ax, font, quest_names, quest_choice, quest_normal):
+    """图表2：Top20任务选择段vs普通段堆叠柱状图"""
+    ax.bar(range(len(quest_names)), quest_choice, label='选择段', color='#A23B72', alpha=0.8, edgecolor='white',
+           linewidth=1)
+    ax.bar(range(len(quest_names)), quest_normal, bottom=quest_choice, label='普通段', color='#3F88C5', alpha=0.8,
+           edgecolor='white', linewidth=1)
+    ax.set_title('Top20任务对话段类型分布', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('任务类别', fontproperties=font, fontsize=12)
+    ax.set_ylabel('段数', fontproperties=font, fontsize=12)
+    ax.set_xticks(range(len(quest_names)))
+    ax.set_xticklabels(quest_names, fontproperties=font, rotation=0, fontsize=8)
+    ax.legend(prop=font, fontsize=11, loc='upper right')
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
+
+
+def _draw_section_share(ax, font, total_choice, total_normal):
+    """图表3：总体对话段类型占比饼图"""
     labels3 = ['选择段', '普通段']
     sizes3 = [total_choice, total_normal]
     colors3 = ['#A23B72', '#3F88C5']
-    wedges, texts, autotexts = ax3.pie(sizes3, labels=labels3, colors=colors3, autopct='%1.1f%%',
-                                       startangle=90, textprops={'fontproperties': font, 'fontsize': 12})
-    ax3.set_title(f'总体对话段类型占比\n（总计{total_sections}段）', fontproperties=font, fontsize=14, fontweight='bold',
-                  pad=20)
+    wedges, texts, autotexts = ax.pie(sizes3, labels=labels3, colors=colors3, autopct='%1.1f%%',
+                                      startangle=90, textprops={'fontproperties': font, 'fontsize': 12})
+    ax.set_title(f'总体对话段类型占比\n（总计{total_choice + total_normal}段）', fontproperties=font, fontsize=14,
+                 fontweight='bold', pad=20)
 
     # 美化饼图文字
     for autotext in autotexts:
         autotext.set_color('white')
         autotext.set_fontweight('bold')
 
-    # -------------------------- 图表4：任务场景数vs对话数散点图 --------------------------
-    quest_scene_counts = [s['scenes'] for _, s in sorted_quests]
+
+def _draw_scenes_vs_lines(ax, font, quest_scene_counts, quest_totals, is_main):
+    """图表4：任务场景数vs对话数散点图"""
     # 主线和其他任务用不同颜色
-    scatter_colors = ['#2E86AB' if 'main_quests' in name else '#F18F01' for name, _ in sorted_quests]
-    scatter = ax4.scatter(quest_scene_counts, quest_totals, c=scatter_colors,
-                          s=120, alpha=0.7, edgecolors='white', linewidth=1)
-    ax4.set_title('任务场景数 vs 对话总量（颜色区分任务类型）', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
-    ax4.set_xlabel('场景数', fontproperties=font, fontsize=12)
-    ax4.set_ylabel('对话总行数', fontproperties=font, fontsize=12)
-    ax4.grid(alpha=0.3, linestyle='--')
+    scatter_colors = [MAIN_COLOR if main else OTHER_COLOR for main in is_main]
+    ax.scatter(quest_scene_counts, quest_totals, c=scatter_colors,
+               s=120, alpha=0.7, edgecolors='white', linewidth=1)
+    ax.set_title('任务场景数 vs 对话总量（颜色区分任务类型）', fontproperties=font, fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('场景数', fontproperties=font, fontsize=12)
+    ax.set_ylabel('对话总行数', fontproperties=font, fontsize=12)
+    ax.grid(alpha=0.3, linestyle='--')
 
     # 添加图例
-    ax4.legend(handles=[main_patch, other_patch], prop=font, fontsize=10, loc='upper left')
+    _quest_type_legend(ax, font, 'upper left')
+
 
-    # 3. 保存图表
+def generate_charts(quest_stats, all_results, output_dir, workers=CHART_WORKERS, force=False):
+    """
+    生成统计图表并保存（适配混合层级显示）
+    4个子图在进程池中并行渲染后拼成一张图；统计数据与上次出图时相同则跳过（force=True 强制重画）
+    """
+    print("\n开始生成统计图表...")
+
+    # 1. 处理数据（筛选有效数据，避免空值）
+    # 按对话总量排序，取Top20任务类别
+    sorted_quests = sorted(quest_stats.items(), key=lambda x: x[1]['total_lines'], reverse=True)[:20]
+    # 处理标签显示：换行分隔层级，避免过长
+    quest_names = [q[0].replace('/', '\n') for q, _ in sorted_quests]
+    quest_totals = [s['total_lines'] for _, s in sorted_quests]
+    quest_choice = [s['choice_sections'] for _, s in sorted_quests]
+    quest_normal = [s['normal_sections'] for _, s in sorted_quests]
+    quest_scene_counts = [s['scenes'] for _, s in sorted_quests]
+    is_main = ['main_quests' in name for name, _ in sorted_quests]
+
+    # 总体数据
+    total_choice = sum(r['choice_sections'] for r in all_results)
+    total_normal = sum(r['normal_sections'] for r in all_results)
+
+    # 2. 子图（2行2列，共4个图表）
     output_path = output_dir / 'quest_analysis_charts_final.png'
-    plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()
+    report = ChartReport(output_path, [
+        Panel(_draw_top_lines, (quest_names, quest_totals, is_main)),
+        Panel(_draw_section_types, (quest_names, quest_choice, quest_normal)),
+        Panel(_draw_section_share, (total_choice, total_normal)),
+        Panel(_draw_scenes_vs_lines, (quest_scene_counts, quest_totals, is_main)),
+    ], cols=2, rc=CHART_RC)
+
+    # 3. 渲染并保存图表
+    if render_reports([report], workers, force):
+        print(f"最终图表已保存到: {output_path}")
+
 
-    print(f"最终图表已保存到: {output_path}")
+def main(workers=WORKERS, cache_file=SCENE_CACHE_FILE, report_dir=TIMING_REPORT_DIR, charts=GENERATE_CHARTS,
+         read_ahead_workers=READ_AHEAD_WORKERS, bundle_path=SCENE_BUNDLE, cache_use_hash=SCENE_CACHE_USE_HASH):
+    # 耗时报告在 with 块结束时写出，中途出错也会保存（报告的 meta 中记录错误）
+    with RunReport('scnSceneJson', report_path(report_dir, 'scnSceneJson')) as report:
+        run_analysis(report, workers, cache_file, charts, read_ahead_workers, bundle_path, cache_use_hash)
 
 
-def main():
+def run_analysis(report, workers, cache_file, charts, read_ahead_workers, bundle_path, cache_use_hash=False):
+    """main 的完整流程：扫描、分析、汇总、写 CSV、出图，各阶段计入 report"""
+    report.meta.update(workers=workers, cache_file=cache_file, charts=charts, read_ahead_workers=read_ahead_workers,
+                       bundle=bundle_path, cache_use_hash=cache_use_hash)
+    bundle = open_bundle(bundle_path) if bundle_path else None
+
     # -------------------------- 配置指定的5个路径 --------------------------
     base_dir_epilogue = Path(r'D:\AppSoft\Sy2077\2077\2077\CDPR2077\r6\depot\base\quest\main_quests\epilogue')
     base_dir_part1 = Path(r'D:\AppSoft\Sy2077\2077\2077\CDPR2077\r6\depot\base\quest\main_quests\part1')
@@ -226,64 +315,62 @@ def main():
 
     # -------------------------- 查找目标文件（核心修改：开启递归+屏蔽Versions） --------------------------
     scene_files = []
-    excluded_folder = 'Versions'  # 要排除的文件夹名（不区分大小写）
+    scene_walker = DirWalker(exclude_dirs=SCENE_EXCLUDE_DIRS, extensions=['.scnlocjson'])
     print("开始扫描 5 个指定路径下的【任务文件夹/scenes】结构...")
     print("层级规则：根目录 → 任务文件夹（1层）→ scenes 文件夹 → 递归所有子目录（排除Versions）")
     print("=" * 160)
 
-    for root_dir in target_dirs:
-        root_dir_name = root_dir.name  # 根目录名称（如 epilogue、side_quests）
-        if not root_dir.exists():
-            print(f"⚠️  根路径 {root_dir} 不存在，跳过")
-            print("-" * 160)
-            continue
-
-        found_count = 0  # 当前根目录下找到的有效文件数
-        excluded_count = 0  # 当前根目录下被排除的文件数
-        print(f"🔍 正在扫描根目录：{root_dir}")
-
-        # 第一层遍历：根目录下的所有【任务文件夹】（仅1层，不递归）
-        for quest_dir in root_dir.iterdir():
-            # 只处理文件夹（排除文件、符号链接等），即“中间的任务文件夹”
-            if quest_dir.is_dir():
-                # 拼接层级路径：任务文件夹 → scenes 文件夹（核心层级）
-                target_scene_dir = quest_dir / 'scenes'
-
-                # 检查 scenes 文件夹是否存在且是目录
-                if target_scene_dir.exists() and target_scene_dir.is_dir():
-                    # 核心修改1：开启递归扫描（** 表示遍历所有子目录）
-                    all_files = list(target_scene_dir.glob('**/*.scnlocjson'))
-                    filtered_files = []  # 存储过滤后（排除Versions）的有效文件
-
-                    # 核心修改2：过滤Versions文件夹下的文件
-                    for file in all_files:
-                        # 不区分大小写判断：文件路径是否包含 Versions 文件夹
-                        if excluded_folder.lower() not in str(file.parent).lower():
-                            filtered_files.append(file)
+    with report.stage('scan') as stage:
+        if bundle is not None:
+            print(f"📦 从压缩包读取场景（不解压）：{bundle_path}")
+            scene_files = collect_bundle_scenes(bundle)
+            target_dirs = []  # 不再扫描磁盘路径
+
+        for root_dir in target_dirs:
+            root_dir_name = root_dir.name  # 根目录名称（如 epilogue、side_quests）
+            if not root_dir.exists():
+                print(f"⚠️  根路径 {root_dir} 不存在，跳过")
+                print("-" * 160)
+                continue
+
+            found_count = 0  # 当前根目录下找到的有效文件数
+            excluded_count = 0  # 当前根目录下被跳过的 Versions 目录数
+            print(f"🔍 正在扫描根目录：{root_dir}")
+
+            # 第一层遍历：根目录下的所有【任务文件夹】（仅1层，不递归）
+            for quest_dir in root_dir.iterdir():
+                # 只处理文件夹（排除文件、符号链接等），即“中间的任务文件夹”
+                if quest_dir.is_dir():
+                    # 拼接层级路径：任务文件夹 → scenes 文件夹（核心层级）
+                    target_scene_dir = quest_dir / 'scenes'
+
+                    # 检查 scenes 文件夹是否存在且是目录
+                    if target_scene_dir.exists() and target_scene_dir.is_dir():
+                        # 单次 scandir 递归遍历，Versions 文件夹在进入前剪掉，找到的文件直接追加（不另建列表）
+                        before = len(scene_files)
+                        scene_files.extend(Path(entry.path) for entry, _ in scene_walker.walk(target_scene_dir))
+                        quest_found = len(scene_files) - before
+                        excluded_count += len(scene_walker.pruned)
+
+                        # 统计当前任务文件夹的有效文件
+                        if quest_found:
+                            found_count += quest_found
+                            # 打印详细信息（可注释简化输出）
+                            print(f"  ✅ 任务文件夹：{quest_dir.name}")
+                            print(f"      → scenes 路径：{target_scene_dir}")
+                            print(f"      → 递归找到 {quest_found} 个文件，跳过 {len(scene_walker.pruned)} 个 Versions 文件夹（未进入）")
+                            # 可选：打印保留的文件名（注释掉简化输出）
+                            # print(f"      → 保留文件：{[f.name for f in scene_files[before:before + 5]]}{'...' if quest_found>5 else ''}")
                         else:
-                            excluded_count += 1
-                            # 可选：打印被排除的文件路径（注释掉简化输出）
-                            # print(f"  ❌ 排除 Versions 下的文件：{file}")
-
-                    # 统计当前任务文件夹的有效文件
-                    if filtered_files:
-                        scene_files.extend(filtered_files)
-                        found_count += len(filtered_files)
-                        # 打印详细信息（可注释简化输出）
-                        print(f"  ✅ 任务文件夹：{quest_dir.name}")
-                        print(f"      → scenes 路径：{target_scene_dir}")
-                        print(f"      → 递归找到 {len(all_files)} 个文件，排除 {len(all_files)-len(filtered_files)} 个，保留 {len(filtered_files)} 个")
-                        # 可选：打印保留的文件名（注释掉简化输出）
-                        # print(f"      → 保留文件：{[f.name for f in filtered_files[:5]]}{'...' if len(filtered_files)>5 else ''}")
+                            # 可选：打印无有效文件的任务文件夹（注释掉减少输出）
+                            print(f"  ❌ 任务文件夹：{quest_dir.name} → scenes 文件夹无有效 .scnlocjson 文件")
                     else:
-                        # 可选：打印无有效文件的任务文件夹（注释掉减少输出）
-                        print(f"  ❌ 任务文件夹：{quest_dir.name} → scenes 文件夹无有效 .scnlocjson 文件")
-                else:
-                    # 可选：打印无 scenes 文件夹的任务文件夹（注释掉减少输出）
-                    print(f"  ⚠️  任务文件夹：{quest_dir.name} → 无 scenes 文件夹，跳过")
+                        # 可选：打印无 scenes 文件夹的任务文件夹（注释掉减少输出）
+                        print(f"  ⚠️  任务文件夹：{quest_dir.name} → 无 scenes 文件夹，跳过")
 
-        print(f"📊 该根目录总计：找到 {found_count + excluded_count} 个文件，排除 {excluded_count} 个，有效文件 {found_count} 个")
-        print("-" * 160)
+            print(f"📊 该根目录总计：有效文件 {found_count} 个，跳过 {excluded_count} 个 Versions 文件夹")
+            print("-" * 160)
+        stage.add(files=len(scene_files))
 
     # 最终统计
     print(f"\n🎉 所有路径扫描完成！")
@@ -301,80 +388,105 @@ def main():
         'files': []
     })
 
-    for i, scene_file in enumerate(scene_files, 1):
-        if i % 50 == 0:
-            print(f"处理进度: {i}/{len(scene_files)}")
-
-        result = analyze_scene_file(scene_file)
-        if result:
-            all_results.append(result)
-
-            # 按自定义分类逻辑统计
-            quest = get_quest_category(scene_file)
-            quest_stats[quest]['scenes'] += 1
-            quest_stats[quest]['choice_sections'] += result['choice_sections']
-            quest_stats[quest]['normal_sections'] += result['normal_sections']
-            quest_stats[quest]['total_sections'] += result['total_sections']
-            quest_stats[quest]['total_lines'] += result['total_lines']
-            quest_stats[quest]['files'].append(result['scene_name'])
+    with report.stage('analyze') as stage:
+        # 缓存以磁盘路径 + mtime 为键，压缩包输入不使用
+        cache = SceneStatsCache(cache_file, cache_use_hash) if cache_file and bundle is None else None
+        read_ahead = None
+        if bundle is not None:
+            # 包内成员由预读线程从压缩包中读出，解析方只处理内存中的字节
+            read_ahead = BundleReader(bundle, max(1, read_ahead_workers), READ_AHEAD_DEPTH, READ_AHEAD_MEMORY)
+        elif read_ahead_workers > 0:
+            read_ahead = ReadAhead(read_ahead_workers, READ_AHEAD_DEPTH, READ_AHEAD_MEMORY, PREFETCH_MAX_SIZE)
+        try:
+            analyzed = analyze_scene_files(scene_files, workers, cache=cache, read_ahead=read_ahead)
+        finally:
+            if cache is not None:
+                cache.close()
+            if bundle is not None:
+                bundle.close()
+        stage.add(files=len(scene_files))
+        if read_ahead is not None:
+            # 解析方等待读取的时间：明显大于 0 时说明读取跟不上，可调大预读线程数
+            report.meta.update(read_ahead_stall_seconds=round(read_ahead.stall_seconds, 3),
+                               read_ahead_peak_bytes=read_ahead.peak_bytes)
+
+    with report.stage('aggregate') as stage:
+        # 类别按父目录缓存：同一 scenes 目录下的场景只在第一个文件时切分路径
+        taxonomy = QuestTaxonomy()
+        for scene_file, result in analyzed:
+            if result:
+                all_results.append(result)
+
+                # 按自定义分类逻辑统计
+                quest = taxonomy.category(taxonomy.resolve(scene_file))
+                result['quest_category'] = quest
+                quest_stats[quest]['scenes'] += 1
+                quest_stats[quest]['choice_sections'] += result['choice_sections']
+                quest_stats[quest]['normal_sections'] += result['normal_sections']
+                quest_stats[quest]['total_sections'] += result['total_sections']
+                quest_stats[quest]['total_lines'] += result['total_lines']
+                quest_stats[quest]['files'].append(result['scene_name'])
+        stage.add(scenes=len(all_results), lines=sum(r['total_lines'] for r in all_results))
+        report.meta.update(quest_categories=len(taxonomy))
 
     # 定义输出目录（自动创建，避免权限错误）
     output_dir = Path(r'D:\Data\PYh\AmountSy\scnScene')
     output_dir.mkdir(exist_ok=True)  # 确保目录存在
 
-    # 输出详细结果到CSV
-    output_csv = output_dir / 'scene_analysis_detailedDDD_final.csv'
-    with open(output_csv, 'w', newline='', encoding='utf-8-sig') as f:
-        fieldnames = ['scene_name', 'quest_category', 'choice_sections', 'normal_sections',
-                      'total_sections', 'total_lines', 'file_path']
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for result in all_results:
-            row = result.copy()
-            row['quest_category'] = get_quest_category(result['file_path'])
-            writer.writerow(row)
-
-    print(f"\n详细结果已保存到: {output_csv}")
-
-    # 输出Quest级别统计（混合层级）
-    output_quest_csv = output_dir / 'quest_analysis_summaryYYYY_final.csv'
-    with open(output_quest_csv, 'w', newline='', encoding='utf-8-sig') as f:
-        fieldnames = ['quest_category', 'task_type', 'scene_count', 'choice_sections', 'normal_sections',
-                      'total_sections', 'total_lines', 'avg_sections_per_scene', 'avg_lines_per_scene',
-                      'choice_ratio']
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-
-        # 按总对话数排序
-        sorted_quests = sorted(quest_stats.items(),
-                               key=lambda x: x[1]['total_lines'],
-                               reverse=True)
-
-        for quest, stats in sorted_quests:
-            avg_sections = stats['total_sections'] / stats['scenes'] if stats['scenes'] > 0 else 0
-            avg_lines = stats['total_lines'] / stats['scenes'] if stats['scenes'] > 0 else 0
-            choice_ratio = stats['choice_sections'] / stats['total_sections'] if stats['total_sections'] > 0 else 0
-            # 标记任务类型
-            task_type = '主线任务' if 'main_quests' in quest else '支线/小任务'
-
-            writer.writerow({
-                'quest_category': quest,
-                'task_type': task_type,
-                'scene_count': stats['scenes'],
-                'choice_sections': stats['choice_sections'],
-                'normal_sections': stats['normal_sections'],
-                'total_sections': stats['total_sections'],
-                'total_lines': stats['total_lines'],
-                'avg_sections_per_scene': f"{avg_sections:.2f}",
-                'avg_lines_per_scene': f"{avg_lines:.2f}",
-                'choice_ratio': f"{choice_ratio:.2%}"
-            })
-
-    print(f"最终Quest统计已保存到: {output_quest_csv}")
-
-    # 生成最终统计图表
-    generate_charts(quest_stats, all_results, output_dir)
+    with report.stage('csv'):
+        # 输出详细结果到CSV
+        output_csv = output_dir / 'scene_analysis_detailedDDD_final.csv'
+        with open(output_csv, 'w', newline='', encoding='utf-8-sig') as f:
+            fieldnames = ['scene_name', 'quest_category', 'choice_sections', 'normal_sections',
+                          'total_sections', 'total_lines', 'file_path']
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+
+            for result in all_results:
+                writer.writerow(result)
+
+        print(f"\n详细结果已保存到: {output_csv}")
+
+        # 输出Quest级别统计（混合层级）
+        output_quest_csv = output_dir / 'quest_analysis_summaryYYYY_final.csv'
+        with open(output_quest_csv, 'w', newline='', encoding='utf-8-sig') as f:
+            fieldnames = ['quest_category', 'task_type', 'scene_count', 'choice_sections', 'normal_sections',
+                          'total_sections', 'total_lines', 'avg_sections_per_scene', 'avg_lines_per_scene',
+                          'choice_ratio']
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+
+            # 按总对话数排序
+            sorted_quests = sorted(quest_stats.items(),
+                                   key=lambda x: x[1]['total_lines'],
+                                   reverse=True)
+
+            for quest, stats in sorted_quests:
+                avg_sections = stats['total_sections'] / stats['scenes'] if stats['scenes'] > 0 else 0
+                avg_lines = stats['total_lines'] / stats['scenes'] if stats['scenes'] > 0 else 0
+                choice_ratio = stats['choice_sections'] / stats['total_sections'] if stats['total_sections'] > 0 else 0
+                # 标记任务类型
+                task_type = '主线任务' if 'main_quests' in quest else '支线/小任务'
+
+                writer.writerow({
+                    'quest_category': quest,
+                    'task_type': task_type,
+                    'scene_count': stats['scenes'],
+                    'choice_sections': stats['choice_sections'],
+                    'normal_sections': stats['normal_sections'],
+                    'total_sections': stats['total_sections'],
+                    'total_lines': stats['total_lines'],
+                    'avg_sections_per_scene': f"{avg_sections:.2f}",
+                    'avg_lines_per_scene': f"{avg_lines:.2f}",
+                    'choice_ratio': f"{choice_ratio:.2%}"
+                })
+
+        print(f"最终Quest统计已保存到: {output_quest_csv}")
+
+    # 生成最终统计图表（只输出 CSV 时跳过，不导入 matplotlib）
+    if charts:
+        with report.stage('charts'):
+            generate_charts(quest_stats, all_results, output_dir)
 
     # 控制台输出Top 30 Quest（按对话总量排序）
     print("\n" + "=" * 100)
@@ -441,12 +553,12 @@ def main():
     print(f"  总对话数: {total_lines}")
     print(f"  平均每场景对话数: {total_lines/total_scenes:.2f}")
 
+    report.count(scenes=total_scenes, lines=total_lines)
+
 
 if __name__ == '__main__':
     # 安装依赖提示（首次运行时）
-    try:
-        import matplotlib.pyplot as plt
-    except ImportError:
+    if GENERATE_CHARTS and not plotting.matplotlib_installed():
         print("检测到未安装matplotlib，正在自动安装...")
         import subprocess
         import sys
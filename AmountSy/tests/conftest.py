@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 引用上级目录的 amountsy 公共模块
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,54 @@
+"""AsyncDirWalker：各种剪枝 / 并发 / 背压配置下产出的 (文件, rel_dir) 序列和剪掉的目录都与 DirWalker 完全相同"""
+
+import threading
+
+import pytest
+
+from amountsy.async_walker import AsyncDirWalker
+from amountsy.depot_walker import AnimationLister, DirWalker, ExtensionCounter, SceneCollector, crawl
+from amountsy.synthetic_depot import generate_depot
+
+
+@pytest.fixture(scope='module')
+def depot(tmp_path_factory):
+    return generate_depot(tmp_path_factory.mktemp('synthetic'), main_quests=3, side_quests=3, minor_quests=2,
+                          anim_dirs=6)['depot']
+
+
+def _walk(walker, root):
+    return [(entry.path, rel_dir) for entry, rel_dir in walker.walk(root)]
+
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'exclude_dirs': ('*Versions*',), 'extensions': ['.scnlocjson']},
+    {'max_depth': 5},
+    {'exclude_dirs': ('anim*', 'phases'), 'extensions': ['.questphase', '.anims', '.SCNLOCJSON']},
+])
+@pytest.mark.parametrize('concurrency, max_buffered_dirs', [(1, 1), (4, 2), (32, 4096)])
+def test_walk_matches_dir_walker(depot, options, concurrency, max_buffered_dirs):
+    expected_walker = DirWalker(**options)
+    expected = _walk(expected_walker, depot)
+    walker = AsyncDirWalker(concurrency=concurrency, max_buffered_dirs=max_buffered_dirs, **options)
+    assert _walk(walker, depot) == expected
+    assert walker.pruned == expected_walker.pruned
+    assert expected
+
+
+def test_consumers_match_crawl(depot):
+    def consumers():
+        return [ExtensionCounter(), AnimationLister(), SceneCollector(exclude_folder='Versions')]
+
+    expected = crawl(depot, consumers())
+    got = crawl(depot, consumers(), AsyncDirWalker(concurrency=8, stat_files=True))
+    assert got[0].by_dir == expected[0].by_dir
+    assert got[1].files == expected[1].files
+    assert got[2].files == expected[2].files and got[2].excluded_count == expected[2].excluded_count
+
+
+def test_early_exit_stops_listing(depot):
+    before = threading.active_count()
+    items = AsyncDirWalker(concurrency=8, max_buffered_dirs=2).walk(depot)
+    next(items)
+    items.close()
+    assert threading.active_count() == before
@@ -0,0 +1,93 @@
+"""BundleWalker：zip / tar 包内遍历的顺序、rel_dir 和成员内容与解压后用 DirWalker 遍历完全一致"""
+
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from amountsy.bundle import BundleWalker, open_bundle
+from amountsy.depot_walker import DirWalker
+from amountsy.synthetic_depot import generate_depot
+
+WALK_OPTIONS = [
+    {},
+    {'exclude_dirs': ('*Versions*',), 'extensions': ['.scnlocjson']},
+    {'max_depth': 5, 'extensions': ['.questphase', '.scenesolution']},
+]
+
+
+@pytest.fixture(scope='module')
+def depot_root(tmp_path_factory):
+    info = generate_depot(tmp_path_factory.mktemp('synthetic'), main_quests=3, side_quests=2, minor_quests=2,
+                          anim_dirs=4)
+    return os.path.dirname(info['depot'])
+
+
+def _members(root):
+    for dir_path, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(dir_path, name)
+            yield path, os.path.relpath(path, root).replace(os.sep, '/')
+
+
+def _make_zip(root, archive):
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for path, arcname in _members(root):
+            zf.write(path, arcname)
+
+
+def _make_tar(root, archive, mode, prefix=''):
+    with tarfile.open(archive, mode) as tf:
+        for path, arcname in _members(root):
+            tf.add(path, prefix + arcname)
+
+
+ARCHIVES = {
+    'zip': lambda root, out: _make_zip(root, out / 'depot.zip'),
+    'tar': lambda root, out: _make_tar(root, out / 'depot.tar', 'w', prefix='./'),
+    'tar.gz': lambda root, out: _make_tar(root, out / 'depot.tar.gz', 'w:gz'),
+}
+
+
+@pytest.fixture(scope='module', params=list(ARCHIVES))
+def archive(request, depot_root, tmp_path_factory):
+    out = tmp_path_factory.mktemp(request.param.replace('.', '_'))
+    ARCHIVES[request.param](depot_root, out)
+    archive_path = next(out.iterdir())
+    extracted = out / 'extracted'
+    # 与 BundleWalker 比较的是解压后的目录树，而不是打包前的原目录
+    if request.param == 'zip':
+        with zipfile.ZipFile(archive_path) as zf:
+            zf.extractall(extracted)
+    else:
+        with tarfile.open(archive_path) as tf:
+            tf.extractall(extracted)
+    return archive_path, extracted
+
+
+@pytest.mark.parametrize('options', WALK_OPTIONS)
+@pytest.mark.parametrize('root', ['', 'depot/base/quest', 'depot/base/quest/side_quests'])
+def test_bundle_walk_matches_extracted_tree(archive, options, root):
+    archive_path, extracted = archive
+    disk_root = os.path.join(extracted, *root.split('/')) if root else str(extracted)
+    walker = DirWalker(**options)
+    expected = [(os.path.relpath(entry.path, disk_root).replace(os.sep, '/'), rel_dir, entry.path)
+                for entry, rel_dir in walker.walk(disk_root)]
+    assert expected
+
+    with open_bundle(archive_path) as bundle:
+        bundle_walker = BundleWalker(bundle, **options)
+        got = [(entry.path, rel_dir, entry) for entry, rel_dir in bundle_walker.walk(root)]
+        prefix = root + '/' if root else ''
+        assert [(path, rel_dir) for path, rel_dir, _ in got] == [(prefix + rel, rel_dir)
+                                                              for rel, rel_dir, _ in expected]
+        for (member, _, entry), (_, _, disk_path) in zip(got, expected):
+            with open(disk_path, 'rb') as f:
+                raw = f.read()
+            assert bundle.read_bytes(member) == raw
+            assert entry.stat().st_size == len(raw)
+        # 包内不记录空目录：剪掉的目录是 DirWalker 剪掉的目录中含有文件的那部分
+        disk_pruned = {prefix + os.path.relpath(p, disk_root).replace(os.sep, '/') for p in walker.pruned}
+        assert set(bundle_walker.pruned) <= disk_pruned
+        assert bool(bundle_walker.pruned) == bool(walker.pruned)
@@ -0,0 +1,65 @@
+"""图表渲染：数据哈希随间接依赖变化；面板按 rc 的 figure.figsize 均分；进程池渲染与串行逐像素一致；报告样式不泄漏"""
+
+import pytest
+
+from amountsy import plotting
+from amountsy.chart_render import ChartReport, Panel, render_reports
+
+PALETTE = {'main': '#FF6B6B'}
+
+
+def _legend(ax):
+    ax.legend([PALETTE['main']])
+
+
+def _draw(ax, font, values):
+    ax.bar(range(len(values)), values)
+    _legend(ax)
+
+
+def _digest(tmp_path):
+    return ChartReport(tmp_path / 'chart.png', [Panel(_draw, ([1, 2, 3],))]).data_hash()
+
+
+def test_hash_follows_helper_globals(tmp_path, monkeypatch):
+    before = _digest(tmp_path)
+    assert _digest(tmp_path) == before
+    monkeypatch.setitem(PALETTE, 'main', '#4ECDC4')
+    assert _digest(tmp_path) != before
+
+
+def test_hash_follows_plotting_style(tmp_path, monkeypatch):
+    before = _digest(tmp_path)
+    monkeypatch.setitem(plotting.BASE_RC, 'font.size', 12)
+    assert _digest(tmp_path) != before
+
+
+def test_panel_size_follows_rc_figsize(tmp_path):
+    panels = [Panel(_draw, ([1],))] * 5
+    report = ChartReport(tmp_path / 'chart.png', panels, cols=2, title='t', title_height=1,
+                         rc={'figure.figsize': (18, 16)}, dpi=10)
+    assert report.panel_size == (9, 5)
+    assert report.canvas_shape == (160, 180, 3)
+
+
+def test_parallel_render_matches_serial(tmp_path):
+    pytest.importorskip('matplotlib')
+    from matplotlib import image as mpimg
+    images = []
+    for workers in (1, 2):
+        report = ChartReport(tmp_path / f'chart_{workers}.png', [Panel(_draw, ([1, 2, 3],)), Panel(_draw, ([3, 1],))],
+                             cols=2, title='report', rc={'figure.figsize': (6, 3)}, dpi=50)
+        assert render_reports([report], workers=workers) == [report]
+        images.append(mpimg.imread(report.output_path))
+    assert images[0].shape == (150, 300, 4)
+    assert (images[0] == images[1]).all()
+
+
+def test_report_rc_does_not_leak(tmp_path):
+    pytest.importorskip('matplotlib')
+    import matplotlib
+    before = matplotlib.rcParams['font.size']
+    report = ChartReport(tmp_path / 'chart.png', [Panel(_draw, ([1],))], cols=1,
+                         rc={'figure.figsize': (2, 2), 'font.size': before + 7}, dpi=20)
+    render_reports([report], workers=1)
+    assert matplotlib.rcParams['font.size'] == before
@@ -0,0 +1,99 @@
+"""DepotIndex 增量刷新：增删改文件后与重新建立的索引逐行一致"""
+
+import os
+
+import pytest
+
+from amountsy.depot_index import DepotIndex, scan
+from amountsy.depot_walker import AnimationLister, crawl
+from amountsy.quest_paths import quest_path_category
+from amountsy.synthetic_depot import generate_depot
+
+
+@pytest.fixture
+def depot(tmp_path):
+    info = generate_depot(tmp_path / 'synthetic', main_quests=3, side_quests=2, minor_quests=2, anim_dirs=3)
+    with DepotIndex(tmp_path / 'index.sqlite', info['depot']) as index:
+        index.refresh()
+        yield info, index
+
+
+def _rows(index):
+    return list(index.conn.execute("SELECT * FROM files ORDER BY rel_dir, name"))
+
+
+def _fresh_rows(info, tmp_path):
+    with DepotIndex(tmp_path / 'fresh.sqlite', info['depot']) as fresh:
+        fresh.refresh()
+        return _rows(fresh)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_refresh_after_adding_file(depot, tmp_path, workers):
+    info, index = depot
+    scene_dir = os.path.dirname(info['scene_files'][0])
+    with open(os.path.join(scene_dir, 'added_scene.scnlocjson'), 'w', encoding='utf-8') as f:
+        f.write('{}')
+    index.refresh(workers=workers)
+    assert _rows(index) == _fresh_rows(info, tmp_path)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_refresh_after_removing_file(depot, tmp_path, workers):
+    info, index = depot
+    os.remove(info['scene_files'][-1])
+    index.refresh(workers=workers)
+    assert _rows(index) == _fresh_rows(info, tmp_path)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_full_refresh_after_editing_file_in_place(depot, tmp_path, workers):
+    info, index = depot
+    scene_file = info['scene_files'][0]
+    dir_stat = os.stat(os.path.dirname(scene_file))
+    with open(scene_file, 'a', encoding='utf-8') as f:
+        f.write(' ' * 100)
+    # 原地修改不改变目录 mtime：保持不变，确保只能靠逐个 stat 发现
+    os.utime(os.path.dirname(scene_file), ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+    index.refresh(workers=workers, full=True)
+    assert _rows(index) == _fresh_rows(info, tmp_path)
+
+
+def test_categories_use_shared_quest_rules(depot, tmp_path):
+    info, index = depot
+    extra = os.path.join(info['quest'], 'main_quests', 'part1', 'stray.scnlocjson')
+    with open(extra, 'w', encoding='utf-8') as f:
+        f.write('{}')
+    index.refresh()
+    rows = index.conn.execute("SELECT rel_dir, name, category FROM files").fetchall()
+    assert rows
+    for rel_dir, name, category in rows:
+        assert category == quest_path_category(f"{rel_dir}/{name}")
+    assert index.category_counts()['unknown']['.scnlocjson'] >= 1
+
+
+def test_replay_order_matches_fresh_scan(depot, tmp_path):
+    info, index = depot
+    # a-c 与 a/b 同前缀：按原始字符串排序时 a-c 会排在 a/b 之前
+    for rel in ('a/z.anims', 'a/b/x.anims', 'a-c/y.anims', 'a/B.anims'):
+        path = os.path.join(info['animations'], *rel.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{}')
+    walked = crawl(info['animations'], [AnimationLister()])[0].files
+    replayed = scan(info['animations'], [AnimationLister()],
+                    index_file=tmp_path / 'index.sqlite', depot_root=info['depot'])[0].files
+    assert walked == replayed
+    assert len(walked) > 4
+
+
+def test_last_full_refresh_recorded_only_for_full_root_refresh(depot, tmp_path):
+    info, index = depot
+    assert index.last_full_refresh is None
+    index.refresh(info['quest'], full=True)
+    assert index.last_full_refresh is None
+    index.refresh(full=True)
+    recorded = index.last_full_refresh
+    assert recorded is not None
+    index.refresh()
+    assert index.last_full_refresh == recorded
@@ -0,0 +1,58 @@
+"""DirWalker：*Versions* 目录在进入前剪掉，找到的场景与原先 glob + 路径过滤的结果一致"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from amountsy.depot_walker import DirWalker
+from amountsy.synthetic_depot import generate_depot
+
+SCENE_EXCLUDE_DIRS = ('*Versions*',)
+
+
+@pytest.fixture(scope='module')
+def scene_dirs(tmp_path_factory):
+    info = generate_depot(tmp_path_factory.mktemp('synthetic'), main_quests=3, side_quests=2, minor_quests=2)
+    scene_dirs = sorted({Path(f).parent for f in info['scene_files']})
+    # 额外的目录名：大小写不同、名称中间含 versions、Versions 下还有子目录
+    extra = scene_dirs[0]
+    for rel in ('versions/a.scnlocjson', 'OldVersions2/b.scnlocjson', 'sub/Versions/deep/c.scnlocjson',
+                'sub/kept/d.scnlocjson', 'sub/e.scnlocjson', 'sub/notes.txt'):
+        path = extra.joinpath(*rel.split('/'))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('{}', encoding='utf-8')
+    return scene_dirs
+
+
+def _legacy_scene_files(scene_dir):
+    """原先的做法：递归 glob 全部场景，再去掉父目录路径中含 versions（不区分大小写）的文件"""
+    return sorted(f for f in scene_dir.glob('**/*.scnlocjson')
+                  if 'versions' not in str(f.parent.relative_to(scene_dir)).lower())
+
+
+def test_walker_matches_legacy_filter(scene_dirs):
+    walker = DirWalker(exclude_dirs=SCENE_EXCLUDE_DIRS, extensions=['.scnlocjson'])
+    total = 0
+    for scene_dir in scene_dirs:
+        found = sorted(Path(entry.path) for entry, _ in walker.walk(scene_dir))
+        assert found == _legacy_scene_files(scene_dir)
+        total += len(found)
+    assert total > len(scene_dirs)
+
+
+def test_excluded_dirs_are_never_listed(scene_dirs, monkeypatch):
+    listed = []
+    scandir = os.scandir
+
+    def record(path):
+        listed.append(os.path.basename(path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, 'scandir', record)
+    walker = DirWalker(exclude_dirs=SCENE_EXCLUDE_DIRS, extensions=['.scnlocjson'])
+    list(walker.walk(scene_dirs[0]))
+    pruned = sorted(os.path.relpath(p, scene_dirs[0]) for p in walker.pruned)
+    assert pruned == sorted(['Versions', 'versions', 'OldVersions2', os.path.join('sub', 'Versions')])
+    assert not any('versions' in name.lower() for name in listed)
+    assert 'kept' in listed
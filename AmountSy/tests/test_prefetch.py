@@ -0,0 +1,95 @@
+"""ReadAhead / map_prefetched：按输入顺序产出，缓冲字节数受 memory_budget 约束，读取失败和提前结束都不影响其余文件"""
+
+import threading
+import time
+
+import pytest
+
+from amountsy.prefetch import ReadAhead, map_prefetched
+
+FILE_SIZE = 1000
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for i in range(12):
+        path = tmp_path / f'f{i:02d}.bin'
+        path.write_bytes(bytes([i]) * FILE_SIZE)
+        paths.append(str(path))
+    return paths
+
+
+def _describe(path, raw, error):
+    """map_prefetched 的解析函数（模块级，可交给进程池）"""
+    if error is not None:
+        return path, type(error).__name__
+    return path, None if raw is None else (raw[0], len(raw))
+
+
+def test_reads_in_input_order(files):
+    reader = ReadAhead(workers=4, depth=4)
+    got = [(path, raw) for path, raw, error in reader.read(files) if error is None]
+    assert got == [(path, bytes([i]) * FILE_SIZE) for i, path in enumerate(files)]
+    assert reader.buffered_bytes == 0
+
+
+def test_buffer_stays_within_budget(files):
+    workers, budget = 3, 2500
+    reader = ReadAhead(workers=workers, depth=len(files), memory_budget=budget)
+    for _ in reader.read(files):
+        time.sleep(0.01)  # 消费方慢：读取线程应在预算处停下等待
+        # 每个读取线程最多在检查预算后再读入一个文件
+        assert reader.buffered_bytes <= budget + workers * FILE_SIZE
+    assert 0 < reader.peak_bytes <= budget + workers * FILE_SIZE
+    assert reader.buffered_bytes == 0
+
+
+def test_hold_keeps_bytes_until_released(files):
+    reader = ReadAhead(workers=2, depth=len(files), memory_budget=3 * FILE_SIZE)
+    items = reader.read(files, hold=True)
+    held = [next(items) for _ in range(3)]
+    time.sleep(0.05)
+    # 已产出但未归还的 3 个文件占满预算：读取线程停在消费方下一个要取的文件附近，不会把其余文件全部读入
+    assert 3 * FILE_SIZE <= reader.buffered_bytes < len(files) * FILE_SIZE
+    for _, raw, _ in held:
+        reader.release(len(raw))
+    rest = list(items)
+    assert len(held) + len(rest) == len(files)
+    for _, raw, _ in rest:
+        reader.release(len(raw))
+    assert reader.buffered_bytes == 0
+
+
+def test_missing_and_oversized_files(files, tmp_path):
+    big = tmp_path / 'big.bin'
+    big.write_bytes(b'x' * (FILE_SIZE + 1))
+    paths = [files[0], str(tmp_path / 'missing.bin'), str(big), files[1]]
+    reader = ReadAhead(workers=2, max_file_size=FILE_SIZE)
+    results = list(reader.read(paths))
+    assert [path for path, _, _ in results] == paths
+    assert results[0][1] == bytes([0]) * FILE_SIZE and results[0][2] is None
+    assert results[1][1] is None and isinstance(results[1][2], OSError)
+    assert results[2][1:] == (None, None)  # 超过 max_file_size：不预读，由解析方自行读取
+    assert results[3][1] == bytes([1]) * FILE_SIZE
+    assert reader.buffered_bytes == 0
+
+
+def test_early_exit_stops_reader_threads(files):
+    before = threading.active_count()
+    reader = ReadAhead(workers=4, depth=2)
+    items = reader.read(files)
+    next(items)
+    items.close()
+    assert threading.active_count() == before
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_map_prefetched_in_order_and_releases_budget(files, tmp_path, workers):
+    paths = files[:5] + [str(tmp_path / 'missing.bin')] + files[5:]
+    reader = ReadAhead(workers=2, depth=4, memory_budget=3 * FILE_SIZE)
+    results = list(map_prefetched(_describe, paths, reader, workers=workers, chunksize=2))
+    expected = [(path, (i, FILE_SIZE)) for i, path in enumerate(files)]
+    expected.insert(5, (paths[5], 'FileNotFoundError'))
+    assert results == expected
+    assert reader.buffered_bytes == 0
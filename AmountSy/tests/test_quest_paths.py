@@ -0,0 +1,89 @@
+"""任务类别：quest_path_category / QuestTaxonomy 与原 scnSceneJson.get_quest_category 的按路径分段逻辑一致"""
+
+from pathlib import Path
+
+import pytest
+
+from amountsy.quest_paths import QuestTaxonomy, quest_path_category
+from amountsy.synthetic_depot import generate_depot
+
+EDGE_PATHS = [
+    'quest',
+    'quest/main_quests',
+    'quest/main_quests/part1',
+    'quest/main_quests/part1/q105',
+    'quest/main_quests/part1/q105/scenes/q105_01.scnlocjson',
+    'quest/main_quests/part1/x.scnlocjson',
+    'quest/main_quests/part1/open/scenes/a.scnlocjson',
+    'quest/main_quests/q.scnlocjson',
+    'depot/base/quest/side_quests/sq027/scenes/sq027_01.scnlocjson',
+    'depot/base/quest/side_quests/a.scnlocjson',
+    'depot/base/quest/side_quests/scenes/a.scnlocjson',
+    'depot/base/quest/minor_quests/mq012/sub/scenes/a.scnlocjson',
+    'depot/base/quest/open_world/area/scenes/a.scnlocjson',
+    'depot/base/quests/sq027/a.scnlocjson',
+    'depot/base/scenes/a.scnlocjson',
+    'quest/side_quests/quest/main_quests/part1/q001/a.scnlocjson',
+]
+
+
+def legacy_quest_category(file_path):
+    """原 scnSceneJson.get_quest_category（Path 分段 + index('quest')）"""
+    path_parts = Path(file_path).parts
+    try:
+        quest_idx = path_parts.index('quest')
+        if quest_idx + 1 >= len(path_parts):
+            return 'unknown'
+        level1 = path_parts[quest_idx + 1]
+        if level1 == 'main_quests':
+            if quest_idx + 3 < len(path_parts):
+                level2 = path_parts[quest_idx + 2]
+                level3 = path_parts[quest_idx + 3]
+                if level3.startswith('q'):
+                    return f"{level1}/{level2}/{level3}"
+            elif quest_idx + 2 < len(path_parts):
+                return f"{level1}/{path_parts[quest_idx + 2]}"
+        else:
+            task_parts = []
+            for part in path_parts[quest_idx + 1:]:
+                if part == 'scenes' or '.' in part or len(task_parts) >= 2:
+                    break
+                task_parts.append(part)
+            return '/'.join(task_parts) if task_parts else level1
+    except ValueError:
+        pass
+    return 'unknown'
+
+
+@pytest.mark.parametrize('file_path', EDGE_PATHS)
+def test_matches_legacy_rules(file_path):
+    assert quest_path_category(file_path) == legacy_quest_category(file_path)
+
+
+def test_matches_legacy_rules_on_synthetic_depot(tmp_path):
+    info = generate_depot(tmp_path, anim_dirs=1)
+    for scene_file in info['scene_files']:
+        assert quest_path_category(scene_file) == legacy_quest_category(scene_file)
+
+
+def test_taxonomy_matches_legacy_rules(tmp_path):
+    info = generate_depot(tmp_path, anim_dirs=1)
+    taxonomy = QuestTaxonomy()
+    for file_path in EDGE_PATHS + info['scene_files'] + EDGE_PATHS:
+        assert taxonomy.resolve_name(file_path) == legacy_quest_category(file_path)
+
+
+def test_backslash_paths_resolve_per_directory():
+    paths = [
+        r'D:\depot\base\quest\side_quests\sq027\scenes\a.scnlocjson',
+        r'D:\depot\base\quest\side_quests\sq030\scenes\b.scnlocjson',
+        r'D:\depot\base\quest\main_quests\part1\q105\scenes\c.scnlocjson',
+        r'D:\depot\base\quest\side_quests\d.scnlocjson',
+        r'D:\depot\base\open_world\e.scnlocjson',
+    ]
+    expected = ['side_quests/sq027', 'side_quests/sq030', 'main_quests/part1/q105', 'side_quests', 'unknown']
+    taxonomy = QuestTaxonomy()
+    assert [quest_path_category(p) for p in paths] == expected
+    assert [taxonomy.resolve_name(p) for p in paths + paths] == expected + expected
+    # 同一路径的两种分隔符结果相同
+    assert [quest_path_category(p.replace('\\', '/')) for p in paths] == expected
@@ -0,0 +1,48 @@
+"""questphase 导出：多进程统计合并后写出的工作表与串行完全一致；统计出错时输出表仍被关闭"""
+
+import pandas as pd
+import pytest
+
+from amountsy import questphase
+from amountsy.questphase import export_compact_tables
+from amountsy.synthetic_depot import generate_depot
+
+
+@pytest.fixture(scope='module')
+def exports(tmp_path_factory):
+    root = tmp_path_factory.mktemp('synthetic')
+    return generate_depot(root, main_quests=3, side_quests=4, minor_quests=4, anim_dirs=1, exports=3,
+                          open_world_phases=10)['exports']
+
+
+@pytest.mark.parametrize('layout', ['phases', 'quest_types'])
+def test_parallel_export_matches_serial(exports, tmp_path, layout):
+    sheets = {}
+    for workers in (1, 2):
+        output = tmp_path / f'compact_{workers}.xlsx'
+        export_compact_tables(exports, output, 'excel_stream', workers, high_freq_layout=layout,
+                              class_descriptions=True, class_rollups=('manager', 'base'))
+        sheets[workers] = pd.read_excel(output, sheet_name=None)
+    assert list(sheets[1]) == list(sheets[2])
+    for name, df in sheets[1].items():
+        pd.testing.assert_frame_equal(df, sheets[2][name], obj=name)
+
+
+def test_writer_closed_when_aggregation_fails(exports, tmp_path, monkeypatch):
+    closed = []
+    open_table_writer = questphase.open_table_writer
+
+    def open_and_track(*args):
+        writer = open_table_writer(*args)
+        close = writer.close
+        writer.close = lambda: (closed.append(writer.location), close())
+        return writer
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("aggregate failed")
+
+    monkeypatch.setattr(questphase, 'open_table_writer', open_and_track)
+    monkeypatch.setattr(questphase, 'aggregate_files', fail)
+    with pytest.raises(RuntimeError):
+        export_compact_tables(exports, tmp_path / 'compact.xlsx', 'excel_stream')
+    assert closed == [tmp_path / 'compact.xlsx']
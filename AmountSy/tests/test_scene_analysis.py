@@ -0,0 +1,40 @@
+"""scnSceneJson 场景分析：进程池并行（含预读）写出的明细 CSV 与串行完全一致"""
+
+import csv
+import io
+
+import pytest
+
+import scnSceneJson
+from amountsy.prefetch import ReadAhead
+from amountsy.synthetic_depot import generate_depot
+
+FIELDNAMES = ['scene_name', 'choice_sections', 'normal_sections', 'total_sections', 'total_lines', 'file_path']
+
+
+@pytest.fixture(scope='module')
+def scene_files(tmp_path_factory):
+    root = tmp_path_factory.mktemp('synthetic')
+    return generate_depot(root, main_quests=3, side_quests=3, minor_quests=2)['scene_files']
+
+
+def _detailed_csv(analyzed):
+    """与 scnSceneJson 明细表相同的写法（不含依赖目录结构的任务类别列）"""
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=FIELDNAMES)
+    writer.writeheader()
+    for _, result in analyzed:
+        if result:
+            writer.writerow(result)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize('read_ahead_workers', [0, 2])
+def test_process_pool_matches_serial(scene_files, read_ahead_workers):
+    serial = _detailed_csv(scnSceneJson.analyze_scene_files(scene_files, workers=1))
+    read_ahead = ReadAhead(read_ahead_workers, 8, 1 << 20) if read_ahead_workers else None
+    parallel = _detailed_csv(scnSceneJson.analyze_scene_files(scene_files, workers=2, chunksize=3,
+                                                              read_ahead=read_ahead))
+    assert len(scene_files) > 6
+    assert serial.count('\n') == len(scene_files) + 1
+    assert parallel == serial
@@ -0,0 +1,140 @@
+"""场景统计：只取统计字段的解析结果与按完整对象树统计一致，字段类型异常时不报错；缓存按 mtime / 大小 / 内容哈希和统计逻辑版本失效"""
+
+import json
+import os
+
+import pytest
+
+from amountsy import scene_stats
+from amountsy.scene_stats import SceneStatsCache, load_scene_stats, scene_stats_from_bytes
+from amountsy.synthetic_depot import generate_depot
+
+
+def _full_tree_stats(raw):
+    """按完整对象树统计的参照实现"""
+    data = json.loads(raw)
+    sections = data.get('SectionsInScene', [])
+    speakers = {line['Speaker'] for section in sections for line in section.get('LinesInSection', [])
+                if isinstance(line.get('Speaker'), str) and line['Speaker'].strip()}
+    return {
+        'scene_name': data.get('SceneName'),
+        'total_sections': len(sections),
+        'choice_sections': sum(1 for section in sections if section.get('IsChoiceSection')),
+        'total_lines': sum(len(section.get('LinesInSection', [])) for section in sections),
+        'speakers': sorted(speakers)
+    }
+
+
+def test_matches_full_tree_stats(tmp_path):
+    info = generate_depot(tmp_path, main_quests=2, side_quests=1, minor_quests=1)
+    assert info['scene_files']
+    for scene_file in info['scene_files']:
+        with open(scene_file, 'rb') as f:
+            raw = f.read()
+        assert scene_stats_from_bytes(raw) == _full_tree_stats(raw)
+
+
+def test_non_string_speaker_is_ignored():
+    raw = json.dumps({
+        'SceneName': 'odd',
+        'SectionsInScene': [
+            {'IsChoiceSection': True, 'LinesInSection': [
+                {'Speaker': {'Name': 'V'}}, {'Speaker': 42}, {'Speaker': ' '}, {'Speaker': 'Judy'}, 'text']},
+            {'LinesInSection': None},
+            'broken',
+        ]
+    }).encode('utf-8')
+    assert scene_stats_from_bytes(raw) == {
+        'scene_name': 'odd',
+        'total_sections': 3,
+        'choice_sections': 1,
+        'total_lines': 5,
+        'speakers': ['Judy']
+    }
+
+
+def test_cache_dropped_when_extractor_version_changes(tmp_path, monkeypatch):
+    scene_file = generate_depot(tmp_path / 'synthetic', main_quests=1, side_quests=0, minor_quests=0)['scene_files'][0]
+    db_path = tmp_path / 'cache.sqlite'
+    with SceneStatsCache(db_path) as cache:
+        load_scene_stats(scene_file, cache)
+    with SceneStatsCache(db_path) as cache:
+        assert cache.get(scene_file) is not None
+
+    monkeypatch.setattr(scene_stats, 'EXTRACTOR_VERSION', scene_stats.EXTRACTOR_VERSION + 1)
+    with SceneStatsCache(db_path) as cache:
+        assert cache.get(scene_file) is None
+        load_scene_stats(scene_file, cache)
+    with SceneStatsCache(db_path) as cache:
+        assert cache.get(scene_file) is not None
+
+
+@pytest.fixture
+def cached_scene(tmp_path):
+    """写入缓存后的 (场景文件, 缓存库路径, 统计结果)"""
+    scene_file = generate_depot(tmp_path / 'synthetic', main_quests=1, side_quests=0, minor_quests=0)['scene_files'][0]
+    db_path = tmp_path / 'cache.sqlite'
+    with SceneStatsCache(db_path, use_hash=True) as cache:
+        stats = load_scene_stats(scene_file, cache)
+    return scene_file, db_path, stats
+
+
+def _touch(path, delta_ns=10 ** 9):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + delta_ns))
+
+
+def test_cache_hit_when_unchanged(cached_scene):
+    scene_file, db_path, stats = cached_scene
+    with SceneStatsCache(db_path) as cache:
+        assert cache.get(scene_file) == stats
+        assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_cache_miss_when_mtime_changes(cached_scene):
+    scene_file, db_path, _ = cached_scene
+    _touch(scene_file)
+    with SceneStatsCache(db_path) as cache:
+        assert cache.get(scene_file) is None
+
+
+def test_cache_miss_when_size_changes(cached_scene):
+    scene_file, db_path, _ = cached_scene
+    st = os.stat(scene_file)
+    with open(scene_file, 'ab') as f:
+        f.write(b' ')
+    os.utime(scene_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+    with SceneStatsCache(db_path) as cache:
+        assert cache.get(scene_file) is None
+
+
+def test_cache_miss_when_file_removed(cached_scene):
+    scene_file, db_path, _ = cached_scene
+    os.remove(scene_file)
+    with SceneStatsCache(db_path) as cache:
+        assert cache.get(scene_file) is None
+
+
+def test_hash_keeps_hit_when_only_mtime_changes(cached_scene, monkeypatch):
+    scene_file, db_path, stats = cached_scene
+    _touch(scene_file)
+    with SceneStatsCache(db_path, use_hash=True) as cache:
+        assert cache.get(scene_file) == stats
+    # 命中后时间戳已更新：下次不再计算哈希
+    monkeypatch.setattr(scene_stats, 'file_digest', lambda path: pytest.fail("不应重新计算哈希"))
+    with SceneStatsCache(db_path, use_hash=True) as cache:
+        assert cache.get(scene_file) == stats
+
+
+def test_hash_misses_when_content_changes(cached_scene):
+    scene_file, db_path, _ = cached_scene
+    with open(scene_file, 'rb') as f:
+        raw = f.read()
+    # 大小不变、内容改变（场景名中的一个字母换成大写）
+    changed = raw.replace(b'_scene"', b'_scenE"', 1)
+    assert changed != raw and len(changed) == len(raw)
+    with open(scene_file, 'wb') as f:
+        f.write(changed)
+    _touch(scene_file)
+    with SceneStatsCache(db_path, use_hash=True) as cache:
+        assert cache.get(scene_file) is None
@@ -0,0 +1,21 @@
+"""稀疏计数矩阵：重复覆盖同一行后结果以最后一次为准，旧数据被压缩掉"""
+
+from amountsy.sparse_counts import SparseCountMatrix
+
+
+def test_overwritten_rows_are_compacted():
+    matrix = SparseCountMatrix()
+    for i in range(5):
+        matrix.set_row(f'phase{i}', {'a': 1, 'b': i + 1})
+    for n in range(1, 200):
+        matrix.set_row('phase2', {'a': n, 'c': 2 * n, 'd': 0})
+
+    assert len(matrix) == 5
+    assert matrix.nnz == 10
+    assert len(matrix._indices) <= 2 * matrix.nnz
+    assert matrix.row('phase2') == {'a': 199, 'c': 398}
+    assert matrix.row('phase4') == {'a': 1, 'b': 5}
+    assert matrix.row_keys() == [f'phase{i}' for i in range(5)]
+    indptr, indices, data = matrix.to_csr()
+    assert indptr.tolist() == [0, 2, 4, 6, 8, 10]
+    assert data.tolist() == [1, 1, 1, 2, 199, 398, 1, 4, 1, 5]
@@ -0,0 +1,26 @@
+"""excel_stream 输出：单表超过 EXCEL_MAX_ROWS 时续写到 表名_2、表名_3 …，每张续表重写表头，行不丢不重"""
+
+import pandas as pd
+
+from amountsy import table_export
+from amountsy.table_export import open_table_writer
+
+
+def test_stream_sheet_splits_at_max_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(table_export, 'EXCEL_MAX_ROWS', 5)  # 含表头：每张表 4 行数据
+    long_name = 'x' * table_export.EXCEL_MAX_SHEET_NAME
+    output = tmp_path / 'split.xlsx'
+    with open_table_writer('excel_stream', output) as writer:
+        stream = writer.open_stream(long_name, chunk_rows=3)
+        for i in range(10):
+            stream.append({'phase': f'p{i}', 'count': i})
+        writer.write_table('after', pd.DataFrame({'a': [1]}))
+
+    sheets = pd.read_excel(output, sheet_name=None)
+    assert list(sheets) == [long_name, 'x' * 29 + '_2', 'x' * 29 + '_3', 'after']
+    parts = list(sheets.values())[:3]
+    assert [len(df) for df in parts] == [4, 4, 2]
+    assert all(list(df.columns) == ['phase', 'count'] for df in parts)
+    combined = pd.concat(parts, ignore_index=True)
+    assert combined['phase'].tolist() == [f'p{i}' for i in range(10)]
+    assert combined['count'].tolist() == list(range(10))